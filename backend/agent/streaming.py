@@ -0,0 +1,187 @@
+"""
+Response Streaming
+Lets a chat turn be delivered incrementally (Server-Sent Events) without
+changing the intent handlers: while a StreamSink is bound, LLM calls stream
+their completion and report text deltas and each finished JSON item to it.
+
+Events:
+    card  - {"response": {...}}               data card and text ready before the LLM is called;
+                                              later deltas continue its content as a new paragraph
+    delta - {"text": ...}                     prose as it is generated
+    item  - {"kind": "hotels", "item": {...}}  one complete object of a JSON list
+    reset - {}                                 a retry started; discard text and items so far
+    done  - {"response": {...}}                the final /api/chat response (authoritative)
+    error - {"message": ...}
+"""
+import contextvars
+import json
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_current_sink: contextvars.ContextVar[Optional["StreamSink"]] = contextvars.ContextVar("stream_sink", default=None)
+
+# Section markers the prompts ask for; never shown to the user
+_MARKERS = ("【文字介绍】", "【Text Introduction】", "【JSON数据】", "【JSON Data】")
+_JSON_FENCE = "```json"
+
+_END = object()
+
+
+def current_sink() -> Optional["StreamSink"]:
+    """The sink of the streaming request being processed, if any"""
+    return _current_sink.get()
+
+
+class StreamSink:
+    """Thread-safe event queue between the worker producing a response and the HTTP generator"""
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self.cancelled = False
+
+    def emit(self, event: str, data: Dict[str, Any]):
+        if not self.cancelled:
+            self._queue.put((event, data))
+
+    def parser(self) -> "CompletionStreamParser":
+        """Parser that turns raw completion deltas into delta/item events on this sink"""
+        return CompletionStreamParser(self.emit)
+
+
+def stream_call(fn: Callable[..., Dict], *args) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Run fn(*args) on a worker thread with a StreamSink bound; yield its events
+
+    The final event is "done" with fn's return value, or "error". Closing the
+    generator early (client disconnected) cancels the sink so streaming LLM
+    calls stop reading.
+    """
+    sink = StreamSink()
+    context = contextvars.copy_context()  # Request id, trace and metric labels follow the worker
+
+    def run():
+        _current_sink.set(sink)
+        try:
+            sink.emit("done", {"response": fn(*args)})
+        except Exception as e:
+            sink.emit("error", {"message": str(e)})
+        finally:
+            sink._queue.put(_END)
+
+    threading.Thread(target=context.run, args=(run,), name="chat-stream", daemon=True).start()
+    try:
+        while True:
+            event = sink._queue.get()
+            if event is _END:
+                return
+            yield event
+    finally:
+        sink.cancelled = True
+
+
+class CompletionStreamParser:
+    """
+    Incremental splitter for the handlers' "prose, then ```json block" answers
+
+    Prose before the JSON fence is forwarded as delta events (section markers
+    removed). Inside the block every object that closes directly within a
+    top-level list, e.g. {"hotels": [{...}, {...}]}, is emitted as an item as
+    soon as its closing brace arrives.
+    """
+
+    def __init__(self, emit: Callable[[str, Dict[str, Any]], None]):
+        self.emit = emit
+        self._text = ""          # Prose not yet forwarded
+        self._in_json = False
+        self._done = False
+        self._json = []          # Characters of the JSON block
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = ""
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str):
+        if self._done or not chunk:
+            return
+        if not self._in_json:
+            self._text += chunk
+            fence = self._text.find(_JSON_FENCE)
+            if fence < 0:
+                self._flush_text(final=False)
+                return
+            rest = self._text[fence + len(_JSON_FENCE):]
+            self._text = self._text[:fence]
+            self._flush_text(final=True)
+            self._in_json = True
+            chunk = rest
+        self._feed_json(chunk)
+
+    def close(self):
+        """End of completion: forward any held-back prose"""
+        if not self._in_json:
+            self._flush_text(final=True)
+
+    def _flush_text(self, final: bool):
+        text = self._text
+        safe = len(text)
+        if not final:
+            # Hold back a marker or fence that may still be completed by the next chunk
+            open_marker = text.rfind("【")
+            if open_marker >= 0 and "】" not in text[open_marker:]:
+                safe = open_marker
+            for size in range(min(len(_JSON_FENCE) - 1, safe), 0, -1):
+                if _JSON_FENCE.startswith(text[safe - size:safe]):
+                    safe -= size
+                    break
+        out, self._text = text[:safe], text[safe:]
+        for marker in _MARKERS:
+            out = out.replace(marker, "")
+        if out:
+            self.emit("delta", {"text": out})
+
+    def _feed_json(self, chunk: str):
+        for char in chunk:
+            position = len(self._json)
+            self._json.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = "".join(self._json[self._string_start + 1:position])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char in "{[":
+                if char == "{" and self._stack == ["{", "["]:
+                    self._item_start = position
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._stack == ["{", "["] and self._item_start is not None:
+                    self._emit_item("".join(self._json[self._item_start:position + 1]))
+                    self._item_start = None
+                if not self._stack:
+                    self._done = True  # Root object closed; anything after is ignored
+                    return
+            elif char == "`" and not self._stack:
+                self._done = True  # Fence closed without a root object
+                return
+
+    def _emit_item(self, raw: str):
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            return
+        if isinstance(item, dict):
+            self.emit("item", {"kind": self._last_key, "item": item})
@@ -12,53 +12,80 @@ import json
 import time
 import random
 import re
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import requests
 from config.config import Config
+from backend.utils import SingleFlight, TTLCache, memory, metrics
+from backend.utils.http_client import build_session
+from backend.utils.log import get_logger
+from backend.models import Flight, ForecastDay, Hotel, Offer, Weather, serialize
+from backend.utils.candidates import CandidateTable
+from backend.utils.result_sets import RESULT_SETS
+from backend.maps.weather_api import WeatherAPI
+from . import streaming
+
+logger = get_logger("backend.agent.travel_agent")
+
+# Weather advice for a card answered without waiting is generated here
+_ADVICE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-advice")
+
 
 class TravelAgent:
     """Intelligent Travel Assistant Agent"""
 
     def __init__(self):
         """Initialize Agent"""
-        print("🚀 Initializing TripPilot Agent...")
+        logger.info("Initializing TripPilot Agent")
 
         self.config = Config()
         self.api_key = Config.DEEPSEEK_API_KEY
         self.base_url = Config.DEEPSEEK_BASE_URL
         self.model = Config.DEEPSEEK_MODEL
+        self.session = build_session("deepseek")
 
         self.init_tools()
         self.conversation_history = []
         self.current_language = 'en'  # 默认语言
 
-        print("✅ Agent Initialization Complete!\n")
+        # Identical concurrent requests share one in-flight handler call
+        self._inflight = SingleFlight()
 
-    def init_tools(self):
-        """Initialize Tools"""
-        tools_status = []
+        # Real weather data comes from Amap; the LLM only writes advice, cached per city
+        self.weather_api = WeatherAPI()
+        self._weather_advice_cache = TTLCache(maxsize=256, ttl=Config.WEATHER_LIVE_TTL)
 
-        if Config.GAODE_API_KEY:
-            tools_status.append("  Gaode API: ✅ Configured")
-        else:
-            tools_status.append("  Gaode API: ❌ Not Configured")
+        memory.register_container("agent.conversation_history", lambda: len(self.conversation_history))
+        memory.register_container("agent.weather_advice_cache", self._weather_advice_cache)
 
-        if self.api_key:
-            tools_status.append("  DeepSeek: ✅ Configured")
-        else:
-            tools_status.append("  DeepSeek: ❌ Not Configured")
+        logger.info("Agent initialization complete")
 
-        for status in tools_status:
-            print(status)
+    def set_conversation_history(self, history: List[Dict[str, Any]]):
+        """
+        Replace the conversation history with a bounded copy
 
-        print("✅ Tools Initialization Complete")
+        Only the last Config.MAX_HISTORY_MESSAGES messages are kept, reduced to
+        role and content (card payloads are never needed by the agent), with
+        contents truncated to Config.MAX_HISTORY_MESSAGE_CHARS.
+        """
+        limit = Config.MAX_HISTORY_MESSAGE_CHARS
+        self.conversation_history = [
+            {"role": message.get("role", ""), "content": str(message.get("content") or "")[:limit]}
+            for message in history[-Config.MAX_HISTORY_MESSAGES:]
+            if isinstance(message, dict)
+        ]
 
-        if self.api_key:
-            print(f"✅ DeepSeek API Configured")
-            print(f"   Key Prefix: {self.api_key[:12]}...")
+    def init_tools(self):
+        """Initialize Tools"""
+        logger.info("Tools initialized", extra={
+            "gaode_configured": bool(Config.GAODE_API_KEY),
+            "deepseek_configured": bool(self.api_key),
+            "deepseek_key_prefix": self.api_key[:12] if self.api_key else None,
+        })
 
     # ✅ NEW: Detect user language
+    @metrics.timed("language_detection")
     def _detect_language(self, text: str) -> str:
         """
         Detect text language
@@ -75,6 +102,7 @@ class TravelAgent:
         return 'en'
 
     # ✅ Calculate Reasonable Budget Allocation
+    @metrics.timed("budget_allocation")
     def _calculate_budget_allocation(self, total_budget: float, remaining_budget: float, days: int) -> Dict[str, float]:
         """
         Calculate reasonable budget allocation
@@ -104,21 +132,45 @@ class TravelAgent:
 
     def process_message(self, message: str, preferences: Dict = None) -> Dict:
         """Process user message"""
-        print("=" * 60)
-        print(f"📥 Received user message: {message}")
+        logger.debug("Received user message", extra={"user_message": message[:200]})
 
-        # ✅ NEW: Detect user language
-        self.current_language = self._detect_language(message)
-        print(f"🌍 Detected Language: {self.current_language}")
+        # Intent comes first so every later stage is recorded against it
+        intent = self._identify_intent(message)
 
-        if preferences:
-            context = self._build_context(message, preferences)
-        else:
-            context = message
+        with metrics.bind(intent=intent), metrics.span("total"):
+            # ✅ NEW: Detect user language
+            self.current_language = self._detect_language(message)
+            logger.info("Processing message", extra={"intent": intent, "language": self.current_language})
 
-        intent = self._identify_intent(message)
-        print(f"🎯 Identified Intent: {intent}")
+            if preferences:
+                context = self._build_context(message, preferences)
+            else:
+                context = message
 
+            # A streaming caller needs its own LLM stream, so it never joins another caller's flight
+            if not Config.ENABLE_REQUEST_COALESCING or streaming.current_sink() is not None:
+                return self._dispatch_intent(intent, context, preferences)
+
+            key = self._coalesce_key(intent, message, context, preferences)
+            response, shared = self._inflight.do_shared(key, self._dispatch_intent, intent, context, preferences)
+            if shared:
+                logger.info("Shared in-flight result", extra={"intent": intent})
+                # Callers get their own top-level dict so one can't mutate another's response
+                return dict(response)
+            return response
+
+    def process_message_stream(self, message: str, preferences: Dict = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Process user message, yielding (event, data) pairs as the answer is generated
+
+        See backend/agent/streaming.py for the events; the last one is "done"
+        with the same response process_message would return.
+        """
+        return streaming.stream_call(self.process_message, message, preferences)
+
+    @metrics.timed("handler")
+    def _dispatch_intent(self, intent: str, context: str, preferences: Dict) -> Dict:
+        """Route the request to the handler for its intent"""
         if intent == "full_planning":
             return self._handle_full_planning(context, preferences)
         elif intent == "search_hotels":
@@ -132,6 +184,44 @@ class TravelAgent:
         else:
             return self._handle_general_query(context, preferences)
 
+    def _coalesce_key(self, intent: str, message: str, context: str, preferences: Dict) -> tuple:
+        """
+        Build the single-flight key for a request
+
+        The key holds what the handler reads. A weather question Amap can answer
+        depends only on the resolved city and the language; every other handler
+        sees the message, so its normalized text is keyed together with the
+        destination, dates and budget bucket.
+        """
+        # From the message itself: self.current_language belongs to whichever request set it last
+        language = self._detect_language(message)
+
+        if intent == "weather":
+            city = Config.get_amap_city(self._resolve_weather_city(context, preferences))
+            if city:
+                return (intent, language, city)
+
+        prefs = preferences or {}
+
+        budget = prefs.get("remaining_budget", prefs.get("budget"))
+        try:
+            budget_bucket = int(float(budget)) // Config.COALESCE_BUDGET_BUCKET
+        except (TypeError, ValueError):
+            budget_bucket = None
+
+        return (
+            intent,
+            language,
+            str(prefs.get("destination") or "").strip().lower(),
+            str(prefs.get("origin") or "").strip().lower(),
+            prefs.get("start_date"),
+            prefs.get("end_date"),
+            prefs.get("days"),
+            budget_bucket,
+            re.sub(r'\s+', ' ', message.strip().lower()).rstrip('?？!！.。')
+        )
+
+    @metrics.timed("context_build")
     def _build_context(self, message: str, preferences: Dict) -> str:
         """Build context information"""
         context_parts = [message]
@@ -149,6 +239,7 @@ class TravelAgent:
 
         return " | ".join(context_parts)
 
+    @metrics.timed("intent_detection")
     def _identify_intent(self, message: str) -> str:
         """Identify user intent"""
         message_lower = message.lower()
@@ -310,20 +401,26 @@ Requirements:
             content = ai_response.get("content", "")
 
             # Extract JSON data
-            hotels_data = self._extract_json_from_response(content, "hotels")
+            hotels_data = serialize([
+                Hotel.from_record(record, index)
+                for index, record in enumerate(self._extract_json_from_response(content, "hotels"))
+                if isinstance(record, dict)
+            ])
 
             if hotels_data:
-                # Filter overpriced hotels
-                filtered_hotels = [
-                    hotel for hotel in hotels_data
-                    if 100 <= hotel.get('price', 0) <= max_hotel_price * 1.2  # Allow 20% buffer
-                ]
+                with metrics.span("price_filter"):
+                    # Filter overpriced hotels (Allow 20% buffer)
+                    candidates = CandidateTable(hotels_data)
+                    filtered_hotels = candidates.rows(
+                        candidates.where(price__ge=100, price__le=max_hotel_price * 1.2)
+                    )
 
-                # If no hotels left after filtering, use original data but reduce price
-                if not filtered_hotels:
-                    filtered_hotels = self._adjust_hotel_prices(hotels_data, max_hotel_price)
+                    # If no hotels left after filtering, use original data but reduce price
+                    if not filtered_hotels:
+                        hotels_data = filtered_hotels = self._adjust_hotel_prices(hotels_data, max_hotel_price)
+                        candidates = CandidateTable(hotels_data)
 
-                print(f"✅ Successfully extracted {len(filtered_hotels)} hotel data entries (prices filtered)")
+                logger.debug("Extracted hotel data (prices filtered)", extra={"count": len(filtered_hotels)})
 
                 # Extract text part (content before JSON)
                 text_part = content.split("```json")[0].strip()
@@ -337,6 +434,8 @@ Requirements:
                     "action": "search_hotels",
                     "content": text_part + budget_tip,
                     "data": filtered_hotels,
+                    # All candidates (incl. over-budget ones) for /api/results refinements
+                    "result_set": self._store_result_set("hotels", candidates),
                     "suggestions": [
                         "查看更多酒店" if self.current_language == 'zh' else "View more hotels",
                         "调整价格范围" if self.current_language == 'zh' else "Adjust price range",
@@ -345,13 +444,15 @@ Requirements:
                 }
             else:
                 # If extraction fails, return text but give warning
-                print("⚠️ Failed to extract JSON data, using fallback")
+                logger.warning("Failed to extract JSON data, using fallback")
                 warning = "\n\n⚠️ 未能获取结构化数据，请尝试重新搜索。" if self.current_language == 'zh' else "\n\n⚠️ Failed to get structured data, please try searching again."
+                mock_hotels = self._generate_smart_mock_hotels(preferences, max_hotel_price)
 
                 return {
                     "action": "search_hotels",
                     "content": content + warning,
-                    "data": self._generate_smart_mock_hotels(preferences, max_hotel_price),
+                    "data": mock_hotels,
+                    "result_set": self._store_result_set("hotels", mock_hotels),
                     "suggestions": ["重新搜索" if self.current_language == 'zh' else "Search again",
                                    "更改条件" if self.current_language == 'zh' else "Change criteria"]
                 }
@@ -480,19 +581,25 @@ Requirements:
             content = ai_response.get("content", "")
 
             # Extract JSON data
-            flights_data = self._extract_json_from_response(content, "flights")
+            flights_data = serialize([
+                Flight.from_record(record, index)
+                for index, record in enumerate(self._extract_json_from_response(content, "flights"))
+                if isinstance(record, dict)
+            ])
 
             if flights_data:
-                # Filter overpriced flights
-                filtered_flights = [
-                    flight for flight in flights_data
-                    if 200 <= flight.get('price', 0) <= max_flight_price * 1.2
-                ]
+                with metrics.span("price_filter"):
+                    # Filter overpriced flights
+                    candidates = CandidateTable(flights_data)
+                    filtered_flights = candidates.rows(
+                        candidates.where(price__ge=200, price__le=max_flight_price * 1.2)
+                    )
 
-                if not filtered_flights:
-                    filtered_flights = self._adjust_flight_prices(flights_data, max_flight_price)
+                    if not filtered_flights:
+                        flights_data = filtered_flights = self._adjust_flight_prices(flights_data, max_flight_price)
+                        candidates = CandidateTable(flights_data)
 
-                print(f"✅ Successfully extracted {len(filtered_flights)} flight data entries (prices filtered)")
+                logger.debug("Extracted flight data (prices filtered)", extra={"count": len(filtered_flights)})
 
                 text_part = content.split("```json")[0].strip()
                 text_part = text_part.replace("【JSON数据】", "").replace("【文字介绍】", "").strip()
@@ -504,6 +611,8 @@ Requirements:
                     "action": "search_flights",
                     "content": text_part + budget_tip,
                     "data": filtered_flights,
+                    # All candidates (incl. over-budget ones) for /api/results refinements
+                    "result_set": self._store_result_set("flights", candidates),
                     "suggestions": [
                         "查看返程航班" if self.current_language == 'zh' else "Check return flights",
                         "查看行李政策" if self.current_language == 'zh' else "Check baggage policy",
@@ -511,18 +620,24 @@ Requirements:
                     ]
                 }
             else:
-                print("⚠️ Failed to extract JSON data, using fallback")
+                logger.warning("Failed to extract JSON data, using fallback")
                 warning = "\n\n⚠️ 未能获取结构化数据" if self.current_language == 'zh' else "\n\n⚠️ Failed to get structured data"
+                mock_flights = self._generate_smart_mock_flights(preferences, max_flight_price)
 
                 return {
                     "action": "search_flights",
                     "content": content + warning,
-                    "data": self._generate_smart_mock_flights(preferences, max_flight_price),
+                    "data": mock_flights,
+                    "result_set": self._store_result_set("flights", mock_flights),
                     "suggestions": ["重新搜索" if self.current_language == 'zh' else "Search again"]
                 }
         else:
             return self._generate_fallback_response("flight", context, preferences)
 
+    def _store_result_set(self, kind: str, items: Union[List[Dict], CandidateTable]) -> Dict:
+        """Keep a search's candidates for GET /api/results/<id>; returns the reference sent to the client"""
+        return {"id": RESULT_SETS.put(kind, items), "kind": kind, "size": len(items)}
+
     # Adjust hotel prices to reasonable range
     def _adjust_hotel_prices(self, hotels: List[Dict], max_price: int) -> List[Dict]:
         """Adjust hotel prices to reasonable range"""
@@ -560,9 +675,10 @@ Requirements:
         return adjusted
 
     # Improved Smart Mock Data Generation
+    @metrics.timed("fallback")
     def _generate_smart_mock_hotels(self, preferences: Dict, max_price: int) -> List[Dict]:
         """Generate smart-priced mock hotel data"""
-        print(f"⚠️ Generating smart fallback hotel data (Max Price: ¥{max_price})")
+        logger.warning("Generating fallback hotel data", extra={"max_price": max_price})
 
         destination = preferences.get("destination", "目的地" if self.current_language == 'zh' else "Destination") if preferences else ("目的地" if self.current_language == 'zh' else "Destination")
 
@@ -601,24 +717,25 @@ Requirements:
             location_text = f"距地铁站{0.3+idx*0.2:.1f}公里" if self.current_language == 'zh' else f"Located {0.3+idx*0.2:.1f} km from Subway Station"
             desc_text = f"{template['type']}，高性价比" if self.current_language == 'zh' else f"{template['type']}, high value-for-money"
 
-            hotels.append({
-                "id": f"hotel_{idx+1:03d}",
-                "name": template["name"],
-                "location": f"{destination}市中心" if self.current_language == 'zh' else f"{destination} Downtown",
-                "address": f"{destination}市XX路{100+idx*50}号" if self.current_language == 'zh' else f"{destination} City XX Road No.{100+idx*50}",
-                "tel": f"400-{1000+idx:04d}-{5000+idx:04d}",
-                "price": price,
-                "rating": template["rating"],
-                "amenities": amenities_list[idx],
-                "landmark": location_text,
-                "description": desc_text
-            })
-
-        return hotels
-
+            hotels.append(Hotel(
+                id=f"hotel_{idx+1:03d}",
+                name=template["name"],
+                location=f"{destination}市中心" if self.current_language == 'zh' else f"{destination} Downtown",
+                address=f"{destination}市XX路{100+idx*50}号" if self.current_language == 'zh' else f"{destination} City XX Road No.{100+idx*50}",
+                tel=f"400-{1000+idx:04d}-{5000+idx:04d}",
+                rating=template["rating"],
+                amenities=tuple(amenities_list[idx]),
+                landmark=location_text,
+                description=desc_text,
+                offer=Offer(price=price)
+            ))
+
+        return serialize(hotels)
+
+    @metrics.timed("fallback")
     def _generate_smart_mock_flights(self, preferences: Dict, max_price: int) -> List[Dict]:
         """Generate smart-priced mock flight data"""
-        print(f"⚠️ Generating smart fallback flight data (Max Price: ¥{max_price})")
+        logger.warning("Generating fallback flight data", extra={"max_price": max_price})
 
         origin = preferences.get("origin", "北京" if self.current_language == 'zh' else "Beijing") if preferences else ("北京" if self.current_language == 'zh' else "Beijing")
         destination = preferences.get("destination", "上海" if self.current_language == 'zh' else "Shanghai") if preferences else ("上海" if self.current_language == 'zh' else "Shanghai")
@@ -648,25 +765,25 @@ Requirements:
             duration_text = "2小时30分钟" if self.current_language == 'zh' else "2 hours 30 minutes"
             cabin_text = "经济舱" if self.current_language == 'zh' else "Economy Class"
 
-            flights.append({
-                "id": f"flight_{idx+1:03d}",
-                "carrier_code": airline["code"],
-                "carrier_name": airline["name"],
-                "flight_number": f"{airline['code']}{1234+idx}",
-                "origin": origin,
-                "destination": destination,
-                "departure_time": dep_time,
-                "arrival_time": f"{arr_hour:02d}:{arr_min:02d}",
-                "departure_date": str((datetime.now() + timedelta(days=1)).date()),
-                "duration": duration_text,
-                "price": price,
-                "cabin_class": cabin_text,
-                "stops": 0,
-                "aircraft": "Boeing 737" if idx == 0 else "Airbus A320" if idx == 1 else "Boeing 787",
-                "available_seats": 20 + idx * 5
-            })
-
-        return flights
+            flights.append(Flight(
+                id=f"flight_{idx+1:03d}",
+                carrier_code=airline["code"],
+                carrier_name=airline["name"],
+                flight_number=f"{airline['code']}{1234+idx}",
+                origin=origin,
+                destination=destination,
+                departure_time=dep_time,
+                arrival_time=f"{arr_hour:02d}:{arr_min:02d}",
+                departure_date=str((datetime.now() + timedelta(days=1)).date()),
+                duration=duration_text,
+                cabin_class=cabin_text,
+                stops=0,
+                aircraft="Boeing 737" if idx == 0 else "Airbus A320" if idx == 1 else "Boeing 787",
+                available_seats=20 + idx * 5,
+                offer=Offer(price=price)
+            ))
+
+        return serialize(flights)
 
     # Continue with other original methods...
     def _handle_full_planning(self, context: str, preferences: Dict) -> Dict:
@@ -727,7 +844,176 @@ Please use clear, friendly language, and return in markdown format.
             }
 
     def _handle_weather_query(self, context: str, preferences: Dict) -> Dict:
-        """Handle weather query"""
+        """
+        Handle weather query - real Amap data first, LLM only for advice
+
+        The card never waits on the LLM: a streaming caller gets it as a "card"
+        event and the advice streams in behind it; otherwise only cached advice
+        is added (a cache miss is filled in the background for the next ask).
+        """
+        weather_data = self._fetch_weather_card(self._resolve_weather_city(context, preferences))
+
+        if not weather_data:
+            # City outside Amap coverage or provider unavailable
+            return self._handle_weather_query_llm(context, preferences)
+
+        suggestions = [
+            "查看穿衣建议" if self.current_language == 'zh' else "Check clothing suggestions",
+            "查看当地景点" if self.current_language == 'zh' else "View local attractions",
+            "查看酒店推荐" if self.current_language == 'zh' else "View hotel recommendations"
+        ]
+
+        response = {
+            "action": "weather",
+            "content": self._format_weather_summary(weather_data),
+            "data": weather_data,
+            "suggestions": suggestions
+        }
+
+        sink = streaming.current_sink()
+        if sink is not None:
+            sink.emit("card", {"response": dict(response)})
+        advice = self._get_weather_advice(weather_data, wait=sink is not None)
+        if advice:
+            response["content"] += "\n\n" + advice
+
+        return response
+
+    def _resolve_weather_city(self, context: str, preferences: Dict) -> Optional[str]:
+        """Find the city to query: a known city named in the message, else the preferred destination"""
+        known_cities = list(Config.AMAP_CITY_NAMES.keys()) + list(Config.AMAP_CITY_NAMES.values())
+        for city in known_cities:
+            if city.lower() in context.lower():
+                return city
+        if preferences and preferences.get("destination"):
+            return preferences["destination"]
+        return None
+
+    @metrics.timed("weather_fetch")
+    def _fetch_weather_card(self, city: Optional[str]) -> Optional[Dict]:
+        """
+        Build the weather card from Amap live + forecast data (both cached per city)
+
+        Returns:
+            Weather dict in the shape the frontend weather widget expects, or None
+        """
+        amap_city = Config.get_amap_city(city)
+        if not amap_city:
+            return None
+
+        try:
+            fused = self.weather_api.get_weather(amap_city, days=4)
+            live, forecast = fused["live"], fused["forecast"]
+        except Exception as e:
+            logger.warning("Amap weather unavailable", extra={"city": city, "error": str(e)})
+            return None
+
+        if self.current_language == 'zh':
+            wind_speed = f"{live['wind_speed']:.0f}级"
+        else:
+            wind_speed = f"Level {live['wind_speed']:.0f}"
+
+        return Weather(
+            city=live.get("city") or city,
+            temperature=live["temperature"],
+            feels_like=live["temperature"],  # Amap has no feels-like temperature
+            weather=live["description"],
+            humidity=live["humidity"],
+            wind_speed=wind_speed,
+            wind_direction=live.get("wind_direction", ""),
+            update_time=live.get("report_time", ""),
+            forecast=tuple(
+                ForecastDay(
+                    date=day["date"],
+                    temp_high=day["max_temp"],
+                    temp_low=day["min_temp"],
+                    weather=day["day_weather"],
+                    description=f"{day['day_weather']} / {day['night_weather']}"
+                )
+                for day in forecast
+            ),
+            source="amap"
+        ).to_dict()
+
+    def _format_weather_summary(self, weather: Dict) -> str:
+        """Render the weather card as a short text summary (no LLM call)"""
+        # Humidity is missing when live weather was derived from the forecast
+        humidity = weather.get("humidity")
+        if self.current_language == 'zh':
+            lines = [
+                f"📍 **{weather['city']}** 当前{weather['weather']}，气温 {weather['temperature']:.0f}°C，"
+                + (f"湿度 {humidity:.0f}%，" if humidity is not None else "")
+                + f"{weather['wind_direction']}风 {weather['wind_speed']}。"
+            ]
+            for day in weather["forecast"]:
+                lines.append(f"• {day['date']}：{day['description']}，{day['temp_low']}~{day['temp_high']}°C")
+        else:
+            lines = [
+                f"📍 **{weather['city']}** is currently {weather['weather']}, {weather['temperature']:.0f}°C, "
+                + (f"humidity {humidity:.0f}%, " if humidity is not None else "")
+                + f"wind {weather['wind_direction']} {weather['wind_speed']}."
+            ]
+            for day in weather["forecast"]:
+                lines.append(f"• {day['date']}: {day['description']}, {day['temp_low']}~{day['temp_high']}°C")
+        return "\n".join(lines)
+
+    def _build_weather_advice_prompt(self, weather: Dict) -> str:
+        """Prompt for the short advice paragraph that accompanies the weather card"""
+        summary = self._format_weather_summary(weather)
+        if self.current_language == 'zh':
+            return f"""
+以下是真实天气数据：
+{summary}
+
+请根据以上数据，用一段不超过80字的话给出穿衣和出行建议。不要重复天气数据，不要使用标题或列表。
+"""
+        return f"""
+Here is the real weather data:
+{summary}
+
+Based on this data, give one short paragraph (under 60 words) of clothing and travel advice. Do not repeat the data, and do not use headings or lists.
+"""
+
+    def _get_weather_advice(self, weather: Dict, wait: bool = True) -> str:
+        """
+        Short LLM advice for a weather card, cached per city and language like the live data
+
+        Args:
+            weather: Weather card
+            wait: Generate the advice on a cache miss; False returns "" at once and
+                generates it in the background
+
+        With a stream sink bound the advice also reaches the client as delta
+        events, whether generated or cached.
+        """
+        key = (weather["city"], weather.get("update_time"), self.current_language)
+        advice = self._weather_advice_cache.get(key)
+        if advice is not None:
+            sink = streaming.current_sink()
+            if sink is not None and advice:
+                sink.emit("delta", {"text": advice})
+            return advice
+
+        prompt = self._build_weather_advice_prompt(weather)
+        if not wait:
+            # Concurrent misses for one card share a single background call
+            _ADVICE_EXECUTOR.submit(self._inflight.do, ("weather_advice",) + key,
+                                    self._generate_weather_advice, key, prompt)
+            return ""
+        return self._generate_weather_advice(key, prompt)
+
+    def _generate_weather_advice(self, key: tuple, prompt: str) -> str:
+        """Call the LLM for weather advice and cache it (streamed when a sink is bound)"""
+        ai_response = self._call_deepseek_api(prompt, max_retries=1, max_tokens=300)
+        if not ai_response or "error" in ai_response:
+            return ""
+
+        advice = ai_response.get("content", "").strip()
+        self._weather_advice_cache.set(key, advice)
+        return advice
+
+    def _handle_weather_query_llm(self, context: str, preferences: Dict) -> Dict:
+        """Handle weather query entirely through the LLM (cities Amap does not cover)"""
 
         if self.current_language == 'zh':
             prompt = f"""
@@ -801,6 +1087,8 @@ Please provide weather information and return in the following JSON format:
         if ai_response and "error" not in ai_response:
             content = ai_response.get("content", "")
             weather_data = self._extract_json_from_response(content, "city", is_dict=True)
+            if isinstance(weather_data, dict):
+                weather_data = Weather.from_record(weather_data).to_dict()
 
             if weather_data:
                 text_part = content.split("```json")[0].strip()
@@ -924,6 +1212,7 @@ Please answer the user's question with concise, friendly language.
                 "suggestions": suggestions
             }
 
+    @metrics.timed("json_extract")
     def _extract_json_from_response(self, content: str, key: str, is_dict: bool = False) -> Any:
         """Extract JSON data from AI response"""
         try:
@@ -950,15 +1239,15 @@ Please answer the user's question with concise, friendly language.
                     return data.get(key, [])
 
         except json.JSONDecodeError as e:
-            print(f"❌ JSON parsing failed: {e}")
+            logger.warning("JSON parsing failed", extra={"error": str(e)})
         except Exception as e:
-            print(f"❌ Failed to extract JSON: {e}")
+            logger.warning("Failed to extract JSON", extra={"error": str(e)})
 
         return None if is_dict else []
 
-    def _call_deepseek_api(self, prompt: str, max_retries: int = 3) -> Dict:
+    @metrics.timed("llm_call")
+    def _call_deepseek_api(self, prompt: str, max_retries: int = 3, max_tokens: int = 3000) -> Dict:
         """Call DeepSeek API with language awareness"""
-        print("🚀 Calling DeepSeek API...")
 
         # ✅ Add language instruction prefix
         language_instructions = {
@@ -986,60 +1275,105 @@ Please answer the user's question with concise, friendly language.
                 {"role": "user", "content": final_prompt}
             ],
             "temperature": 0.7,
-            "max_tokens": 3000
+            "max_tokens": max_tokens
         }
 
+        # Streaming request: forward the completion to the client as it is generated
+        sink = streaming.current_sink()
+        if sink is not None:
+            data["stream"] = True
+            data["stream_options"] = {"include_usage": True}
+
         for attempt in range(max_retries):
             try:
-                print(f"📡 Attempt {attempt + 1}/{max_retries}...")
+                logger.debug("Calling DeepSeek API", extra={"attempt": attempt + 1, "max_retries": max_retries})
+                if sink is not None and attempt > 0:
+                    sink.emit("reset", {})
 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.base_url}/v1/chat/completions",
                     headers=headers,
                     json=data,
-                    timeout=60
+                    timeout=60,
+                    stream=sink is not None
                 )
 
                 if response.status_code == 200:
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    print(f"✅ API response success, length: {len(content)} chars")
+                    if sink is not None:
+                        content, usage = self._read_completion_stream(response, sink)
+                        if content is None:
+                            return {"error": "Client disconnected"}
+                    else:
+                        result = response.json()
+                        content = result['choices'][0]['message']['content']
+                        usage = result.get('usage')
+                    metrics.record_llm_usage(usage)
+                    logger.debug("DeepSeek API response", extra={"chars": len(content)})
                     return {"content": content}
                 elif response.status_code == 429:
-                    print(f"⚠️ API rate limit exceeded, waiting to retry...")
+                    logger.warning("DeepSeek rate limit exceeded, retrying", extra={"attempt": attempt + 1})
                     wait_time = 5 * (attempt + 1)
                     time.sleep(wait_time)
                 elif response.status_code == 401:
-                    print(f"❌ Invalid API key")
+                    logger.error("DeepSeek rejected the API key")
                     return {"error": "Invalid API key"}
                 else:
-                    print(f"❌ API error: {response.status_code} - {response.text[:200]}")
+                    logger.warning("DeepSeek API error", extra={
+                        "status": response.status_code, "body": response.text[:200], "attempt": attempt + 1})
                     if attempt < max_retries - 1:
-                        print("Waiting to retry...")
                         time.sleep(3)
 
             except requests.exceptions.Timeout:
-                print(f"⚠️ Request timeout (Attempt {attempt + 1}/{max_retries})")
+                logger.warning("DeepSeek request timeout", extra={"attempt": attempt + 1})
                 if attempt < max_retries - 1:
-                    print("Waiting to retry...")
                     time.sleep(3)
 
             except requests.exceptions.ConnectionError as e:
-                print(f"⚠️ Connection error: {e}")
+                logger.warning("DeepSeek connection error", extra={"error": str(e), "attempt": attempt + 1})
                 if attempt < max_retries - 1:
-                    print("Waiting to retry...")
                     time.sleep(3)
 
             except Exception as e:
-                print(f"❌ Failed to call DeepSeek API: {e}")
+                logger.exception("Failed to call DeepSeek API")
                 break
 
-        print("❌ All retries failed")
+        logger.error("DeepSeek API call failed after all retries", extra={"max_retries": max_retries})
+        metrics.record_llm_usage(None, outcome="failed")
         error_msg = "API调用失败，请检查网络连接或稍后重试" if self.current_language == 'zh' else "API call failed, please check network connection or try again later"
         return {"error": error_msg}
 
+    def _read_completion_stream(self, response, sink: streaming.StreamSink) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Read a streamed (SSE) chat completion, forwarding it to the sink as it arrives
+
+        Returns:
+            (full content, usage), or (None, None) if the client went away mid-stream
+        """
+        parser = sink.parser()
+        parts, usage = [], None
+        response.encoding = "utf-8"  # text/event-stream has no charset; requests would assume latin-1
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if sink.cancelled:
+                    return None, None
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                chunk = json.loads(payload)
+                usage = chunk.get("usage") or usage
+                for choice in chunk.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        parts.append(text)
+                        parser.feed(text)
+        parser.close()
+        return "".join(parts), usage
+
     # ==================== Fallback Generation Functions ====================
 
+    @metrics.timed("fallback")
     def _generate_fallback_planning(self, context: str, preferences: Dict) -> str:
         """Generate backup itinerary planning"""
         destination = preferences.get("destination", "目的地" if self.current_language == 'zh' else "Destination") if preferences else ("目的地" if self.current_language == 'zh' else "Destination")
@@ -1115,6 +1449,7 @@ Although the AI service is temporarily unavailable, I have prepared a reference
 🔄 You can click "Regenerate" to get a more detailed AI-customized itinerary.
 """
 
+    @metrics.timed("fallback")
     def _generate_fallback_response(self, type: str, context: str, preferences: Dict) -> Dict:
         """Generate fallback response"""
 
@@ -1144,6 +1479,7 @@ Although the AI service is temporarily unavailable, I have prepared a reference
             "suggestions": suggestions
         }
 
+    @metrics.timed("json_extract")
     def _extract_planning_data(self, content: str) -> Dict:
         """Extract structured data from AI-generated content"""
         data = {
@@ -1193,41 +1529,38 @@ Although the AI service is temporarily unavailable, I have prepared a reference
 
         return suggestions[:3]
 
+    @metrics.timed("fallback")
     def _generate_mock_weather(self, preferences: Dict) -> Dict:
         """Generate mock weather data"""
-        print("⚠️ Using fallback weather data")
+        logger.warning("Using fallback weather data")
         destination = preferences.get("destination", "示例城市" if self.current_language == 'zh' else "Example City") if preferences else ("示例城市" if self.current_language == 'zh' else "Example City")
 
         if self.current_language == 'zh':
-            return {
-                "city": destination,
-                "location": destination,
-                "temperature": 20,
-                "feels_like": 18,
-                "weather": "晴天",
-                "description": "晴朗",
-                "humidity": 60,
-                "wind_speed": "3.0米/秒",
-                "forecast": [
-                    {"date": "明天", "temp_high": 22, "temp_low": 16, "weather": "晴", "description": "晴朗"},
-                    {"date": "后天", "temp_high": 23, "temp_low": 17, "weather": "多云", "description": "多云"}
-                ]
-            }
+            return Weather(
+                city=destination,
+                temperature=20,
+                feels_like=18,
+                weather="晴天",
+                humidity=60,
+                wind_speed="3.0米/秒",
+                forecast=(
+                    ForecastDay(date="明天", temp_high=22, temp_low=16, weather="晴", description="晴朗"),
+                    ForecastDay(date="后天", temp_high=23, temp_low=17, weather="多云", description="多云")
+                )
+            ).to_dict()
         else:
-            return {
-                "city": destination,
-                "location": destination,
-                "temperature": 20,
-                "feels_like": 18,
-                "weather": "Sunny",
-                "description": "Sunny",
-                "humidity": 60,
-                "wind_speed": "3.0 m/s",
-                "forecast": [
-                    {"date": "Tomorrow", "temp_high": 22, "temp_low": 16, "weather": "Sunny", "description": "Sunny"},
-                    {"date": "Day after tomorrow", "temp_high": 23, "temp_low": 17, "weather": "Cloudy", "description": "Cloudy"}
-                ]
-            }
+            return Weather(
+                city=destination,
+                temperature=20,
+                feels_like=18,
+                weather="Sunny",
+                humidity=60,
+                wind_speed="3.0 m/s",
+                forecast=(
+                    ForecastDay(date="Tomorrow", temp_high=22, temp_low=16, weather="Sunny", description="Sunny"),
+                    ForecastDay(date="Day after tomorrow", temp_high=23, temp_low=17, weather="Cloudy", description="Cloudy")
+                )
+            ).to_dict()
 
 
 # Export Agent class
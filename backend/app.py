@@ -224,34 +224,254 @@ TripPilot Flask Backend Service - Improved Version
 Provides API endpoints for frontend calls.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+import hmac
 import sys
 import os
+import threading
+import time
+import uuid
+from functools import wraps
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import TravelAgent
 from agent.travel_agent import TravelAgent
+from backend.maps.amap_service import AmapService, get_amap_service
+from backend.utils.http_cache import cached_json_response, compress_response
+from backend.utils import memory, metrics, profiling, projection, serialization, tracing
+from backend.utils.validation import validate_json
+from backend import schemas
+from backend.utils.warmup import WARMUP, load_cache_snapshot, warm_session
+from backend.utils.result_sets import RESULT_SETS, ResultSetNotFound
+from backend.booking import get_amadeus_service
+from config.config import Config
+from backend.utils.log import get_logger, set_request_id, reset_request_id
+
+logger = get_logger("backend.app")
 
 # Initialize Flask Application
 app = Flask(__name__)
+app.json = serialization.FastJSONProvider(app)  # orjson when installed, for request.json and jsonify
 CORS(app)  # Allow Cross-Origin Requests
 
-# Initialize Agent (Global Instance)
-agent = TravelAgent()
+# Continue the caller's trace (traceparent header) or start a sampled one
+tracing.configure("trippilot-backend", Config.TRACE_SAMPLE_RATE, Config.TRACE_EXPORT_FILE, Config.TRACE_COLLECTOR_URL)
+
+if Config.ENABLE_TRACEMALLOC:
+    memory.start(Config.TRACEMALLOC_FRAMES)
+
+
+@app.after_request
+def compress(response):
+    """Brotli/gzip large responses the client accepts (never event streams); registered first, so it runs last"""
+    if Config.RESPONSE_COMPRESSION:
+        return compress_response(response)
+    return response
+
+
+@app.before_request
+def start_request_span():
+    """Bind a request id for log correlation and open a server span for the request"""
+    g.request_id = request.headers.get('X-Request-Id') or uuid.uuid4().hex[:16]
+    g.request_id_token = set_request_id(g.request_id)
+
+    scope = tracing.start_span(f"{request.method} {request.path}", kind="server",
+                               parent=tracing.extract(request.headers))
+    scope.__enter__()
+    g.trace_scope = scope
+
+
+@app.after_request
+def add_trace_header(response):
+    """Expose the request and trace ids so a slow response can be looked up"""
+    if 'request_id' in g:
+        response.headers['X-Request-Id'] = g.request_id
+    trace_id = tracing.current_trace_id()
+    if trace_id:
+        response.headers['X-Trace-Id'] = trace_id
+        g.trace_scope.set_attribute('http.status', response.status_code)
+    return response
+
+
+@app.teardown_request
+def end_request_span(exc):
+    """Close the server span opened in start_request_span"""
+    scope = g.pop('trace_scope', None)
+    if scope is not None:
+        scope.__exit__(type(exc) if exc else None, exc, None)
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        reset_request_id(token)
+
+
+@app.before_request
+def start_request_profile():
+    """Profile this request when an admin asks to (X-Profile header) or picked by PROFILE_SAMPLE_RATE"""
+    mode = profiling.choose_mode(request.headers.get('X-Profile') if is_admin_request() else None)
+    if mode is None:
+        return
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{uuid.uuid4().hex[:8]}"
+    profile = profiling.RequestProfile(mode, name)
+    if profile.start():
+        g.profile = profile
+
+
+@app.after_request
+def add_profile_header(response):
+    if 'profile' in g:
+        response.headers['X-Profile-Id'] = g.profile.name
+    return response
+
+
+@app.teardown_request
+def finish_request_profile(exc):
+    """Stop the profiler and write its output files"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        try:
+            files = profile.finish()
+            logger.info("Request profile written", extra={"profile_files": files})
+        except Exception:
+            logger.exception("Failed to write request profile")
+
+
+def is_admin_request() -> bool:
+    """Whether the X-Admin-Token header matches Config.ADMIN_TOKEN (always False when no token is set)"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(Config.ADMIN_TOKEN) and hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode())
+
+def require_admin(view):
+    """Admin-only view: 403 unless the request carries the configured admin token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            return jsonify({"error": "Forbidden"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+# Agent (global instance) is created on first use so importing the app stays fast
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent() -> TravelAgent:
+    """Process-wide TravelAgent, built on first call"""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = TravelAgent()
+    return _agent
+
+
+def _warm_deepseek():
+    agent = get_agent()
+    return {"connections": warm_session(agent.session, Config.DEEPSEEK_BASE_URL,
+                                        Config.WARMUP_CONNECTIONS, timeout=5)}
+
+
+def _warm_gaode():
+    amap = get_amap_service()
+    sessions = [amap.maps.session, amap.weather.session, get_agent().weather_api.session]
+    return {"connections": sum(warm_session(session, Config.GAODE_BASE_URL, Config.WARMUP_CONNECTIONS, timeout=5)
+                               for session in sessions)}
+
+
+def _load_caches():
+    get_amap_service()  # Registers its caches
+    return {"entries": load_cache_snapshot()}
+
+
+def start_warmup():
+    """Warm provider connections, the Amadeus token and caches in the background (see /health)"""
+    steps = [("caches", _load_caches)]
+    if Config.DEEPSEEK_API_KEY:
+        steps.append(("deepseek", _warm_deepseek))
+    if Config.GAODE_API_KEY:
+        steps.append(("gaode", _warm_gaode))
+    if Config.AMADEUS_CLIENT_ID:
+        steps.append(("amadeus", lambda: get_amadeus_service().warm_up()))
+    WARMUP.start(steps)
+
+
+if Config.WARMUP_ON_START:
+    start_warmup()
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health Check Endpoint"""
+    """Health Check Endpoint (readiness: 503 until the startup warm-up has finished)"""
+    ready = WARMUP.ready
     return jsonify({
-        "status": "healthy",
+        "status": "healthy" if ready else "warming",
         "service": "TripPilot Backend",
-        "version": "2.0"
-    }), 200
+        "version": "2.0",
+        "warmup": WARMUP.status()
+    }), 200 if ready else 503
+
+@app.route('/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness: the process is up, warmed or not"""
+    return jsonify({"status": "alive"}), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics: pipeline stage timings, provider latencies, LLM token usage"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/profiles', methods=['GET'])
+@require_admin
+def list_profiles():
+    """Request profiles on disk, newest first"""
+    return jsonify({"profiles": profiling.list_profiles()}), 200
+
+@app.route('/api/admin/profiles/<path:filename>', methods=['GET'])
+@require_admin
+def download_profile(filename):
+    """Download one profile file (.collapsed / .speedscope.json / .prof / .txt)"""
+    return send_from_directory(Config.PROFILE_DIR, filename, as_attachment=True)
+
+@app.route('/api/admin/memory', methods=['GET'])
+@require_admin
+def memory_status():
+    """RSS, traced memory and the size of every bounded in-process container"""
+    return jsonify(memory.status()), 200
+
+@app.route('/api/admin/memory/tracemalloc', methods=['POST'])
+@require_admin
+def memory_tracing():
+    """Start or stop allocation tracing: {"action": "start" | "stop", "frames": 1}"""
+    data = request.get_json(silent=True) or {}
+    action = data.get('action', 'start')
+    if action == 'start':
+        memory.start(int(data.get('frames', Config.TRACEMALLOC_FRAMES)))
+    elif action == 'stop':
+        memory.stop()
+    else:
+        return jsonify({"error": "action must be 'start' or 'stop'"}), 400
+    return jsonify(memory.status()), 200
+
+@app.route('/api/admin/memory/diff', methods=['GET'])
+@require_admin
+def memory_diff():
+    """
+    Allocation growth since the previous call, grouped by module (or by line)
+
+    Query: limit (default 25), group_by ("module" | "line"), reset ("0" keeps the baseline)
+    """
+    if not memory.status()["tracing"]:
+        return jsonify({"error": "tracemalloc is not running; POST /api/admin/memory/tracemalloc first"}), 409
+    result = memory.diff(
+        limit=request.args.get('limit', 25, type=int),
+        group_by=request.args.get('group_by', 'module'),
+        reset=request.args.get('reset', '1') != '0',
+    )
+    return jsonify(result), 200
 
 @app.route('/api/chat', methods=['POST'])
+@validate_json(schemas.CHAT)
 def chat():
     """
     Chat API Endpoint
@@ -265,39 +485,47 @@ def chat():
             "start_date": "2024-01-01",
             "end_date": "2024-01-03"
         },
-        "conversation_history": []  # Optional
+        "conversation_history": [],  # Optional
+        "view": "card",              # Optional: "card" (list-card fields) or "detail" (default)
+        "conversation_id": "abc123", # Optional: enables delta encoding of hotel/flight lists
+        "delta_base": 3              # Optional: "revision" of the last list delta applied
     }
+
+    The body is checked against schemas.CHAT first; invalid input gets a 400.
+    Hotel/flight lists are shaped by projection.shape_response: in the card
+    view the remaining fields come from GET /api/results/<id>/items/<item_id>.
     """
     try:
-        data = request.json
+        data = g.body
 
         # Get request data
         user_prompt = data.get('prompt', '')
         preferences = data.get('preferences', {})
         history = data.get('conversation_history', [])
 
-        print("=" * 60)
-        print("📥 Request Received:")
-        print(f"   User Input: {user_prompt}")
-        print(f"   Preferences: {preferences}")
-        print("=" * 60)
+        logger.info("Chat request received", extra={
+            "prompt_chars": len(user_prompt),
+            "destination": preferences.get("destination"),
+            "history_len": len(history),
+        })
+        logger.debug("Chat request preferences", extra={"preferences": preferences})
 
         # Update Agent's conversation history
         if history:
-            agent.conversation_history = history
+            get_agent().set_conversation_history(history)
 
         # Process message
-        response = agent.process_message(user_prompt, preferences)
+        response = get_agent().process_message(user_prompt, preferences)
 
-        print("\n📤 Sending Response:")
-        print(f"   Action: {response.get('action')}")
-        print(f"   Content: {response.get('content', '')[:100]}...")
-        print("=" * 60 + "\n")
+        logger.info("Chat response sent", extra={
+            "action": response.get('action'),
+            "content_chars": len(response.get('content') or ''),
+        })
 
-        return jsonify(response), 200
+        return jsonify(_shape_chat_response(response, data)), 200
 
     except Exception as e:
-        print(f"❌ Error processing request: {e}")
+        logger.exception("Error processing chat request")
         return jsonify({
             "action": "error",
             "content": f"Error processing request: {str(e)}",
@@ -305,11 +533,87 @@ def chat():
             "suggestions": ["Retry", "Check input", "Contact support"]
         }), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+@validate_json(schemas.CHAT)
+def chat_stream():
+    """
+    Chat Endpoint, streamed as Server-Sent Events
+
+    Same request body as /api/chat. Events (see backend/agent/streaming.py):
+    card (data shown before the LLM text, e.g. weather), delta (text), item
+    (one complete hotel/flight), reset, then done carrying the /api/chat
+    response (shaped the same way), or error.
+    """
+    data = g.body
+    user_prompt = data.get('prompt', '')
+    preferences = data.get('preferences', {})
+    history = data.get('conversation_history', [])
+
+    logger.info("Streaming chat request received", extra={
+        "prompt_chars": len(user_prompt),
+        "destination": preferences.get("destination"),
+        "history_len": len(history),
+    })
+
+    agent = get_agent()
+    if history:
+        agent.set_conversation_history(history)
+
+    def generate():
+        for event, payload in agent.process_message_stream(user_prompt, preferences):
+            if event == "done":
+                payload = {"response": _shape_chat_response(payload["response"], data)}
+            yield f"event: {event}\ndata: {serialization.dumps_str(payload)}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _shape_chat_response(response: dict, data: dict) -> dict:
+    """Apply the request's view and delta encoding to an agent response"""
+    return projection.shape_response(response, data["view"], data.get("conversation_id"), data.get("delta_base"))
+
+@app.route('/api/results/<result_set_id>', methods=['GET'])
+def query_result_set(result_set_id):
+    """
+    Refine a hotel/flight search without another model call
+
+    result_set_id comes from the "result_set" of a search_hotels/search_flights
+    chat response. Query parameters:
+        min_price, max_price, min_rating, amenity (repeatable),
+        max_stops, stops, depart_after, depart_before (HH:MM), carrier,
+        sort (price, rating, departure_time, stops; "-" prefix = descending),
+        limit, cursor (next_cursor of the previous page),
+        view (card = list-card fields only)
+    """
+    try:
+        page = RESULT_SETS.query(result_set_id, request.args)
+    except ResultSetNotFound:
+        return jsonify({"error": "Result set not found or expired"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page), 200
+
+@app.route('/api/results/<result_set_id>/items/<item_id>', methods=['GET'])
+def get_result_item(result_set_id, item_id):
+    """
+    All fields of one hotel/flight of a result set
+
+    Card-view responses leave out details (address, phone, description,
+    aircraft, terminals, ...); the client loads them here when an item is opened.
+    """
+    try:
+        item = RESULT_SETS.item(result_set_id, item_id)
+    except ResultSetNotFound:
+        return cached_json_response({"error": "Item not found or result set expired"}, status=404)
+    # A stored item never changes: let the client (and its HTTP cache) keep it for a while
+    return cached_json_response({"result_set_id": result_set_id, "item": item}, max_age=300)
+
 @app.route('/api/search/hotels', methods=['POST'])
+@validate_json(schemas.SEARCH_HOTELS)
 def search_hotels():
     """Search Hotels API"""
     try:
-        data = request.json
+        data = g.body
         destination = data.get('destination', '')
         checkin = data.get('checkin_date')
         checkout = data.get('checkout_date')
@@ -324,22 +628,23 @@ def search_hotels():
             "end_date": checkout
         }
 
-        response = agent.process_message(message, preferences)
+        response = get_agent().process_message(message, preferences)
 
         return jsonify(response), 200
 
     except Exception as e:
-        print(f"❌ Failed to search hotels: {e}")
+        logger.exception("Failed to search hotels")
         return jsonify({
             "error": str(e),
             "data": []
         }), 500
 
 @app.route('/api/search/flights', methods=['POST'])
+@validate_json(schemas.SEARCH_FLIGHTS)
 def search_flights():
     """Search Flights API"""
     try:
-        data = request.json
+        data = g.body
         origin = data.get('origin', '')
         destination = data.get('destination', '')
         departure_date = data.get('departure_date')
@@ -357,44 +662,46 @@ def search_flights():
             "end_date": return_date
         }
 
-        response = agent.process_message(message, preferences)
+        response = get_agent().process_message(message, preferences)
 
         return jsonify(response), 200
 
     except Exception as e:
-        print(f"❌ Failed to search flights: {e}")
+        logger.exception("Failed to search flights")
         return jsonify({
             "error": str(e),
             "data": []
         }), 500
 
 @app.route('/api/weather', methods=['POST'])
+@validate_json(schemas.WEATHER)
 def get_weather():
     """Get Weather Information API"""
     try:
-        data = request.json
+        data = g.body
         city = data.get('city', '')
 
         # Call Agent to handle weather query
         message = f"What is the weather like in {city}?"
         preferences = {"destination": city}
 
-        response = agent.process_message(message, preferences)
+        response = get_agent().process_message(message, preferences)
 
         return jsonify(response), 200
 
     except Exception as e:
-        print(f"❌ Failed to get weather: {e}")
+        logger.exception("Failed to get weather")
         return jsonify({
             "error": str(e),
             "data": None
         }), 500
 
 @app.route('/api/plan/trip', methods=['POST'])
+@validate_json(schemas.PLAN_TRIP)
 def plan_trip():
     """Plan Complete Itinerary API"""
     try:
-        data = request.json
+        data = g.body
         destination = data.get('destination', '')
         days = data.get('days', 3)
         budget = data.get('budget', 5000)
@@ -412,29 +719,90 @@ def plan_trip():
             "interests": interests
         }
 
-        response = agent.process_message(message, preferences)
+        response = get_agent().process_message(message, preferences)
 
         return jsonify(response), 200
 
     except Exception as e:
-        print(f"❌ Itinerary planning failed: {e}")
+        logger.exception("Itinerary planning failed")
         return jsonify({
             "error": str(e),
             "data": None
         }), 500
 
+# ==================== Map & Weather Endpoints ====================
+# Used by MapTool and WeatherTool. Responses carry ETag / Cache-Control and are gzipped.
+
+def _envelope_response(result: dict, max_age: int):
+    """Send an AmapService envelope; provider errors are not cached"""
+    status = 200 if result.get("code") == 0 else 502
+    return cached_json_response(result, max_age=max_age, status=status)
+
+@app.route('/api/map/search', methods=['GET'])
+def map_search():
+    """Place Search API"""
+    result = get_amap_service().search_place(
+        request.args.get('city', ''),
+        request.args.get('keyword', '')
+    )
+    return _envelope_response(result, AmapService.SEARCH_TTL)
+
+@app.route('/api/map/route', methods=['GET'])
+def map_route():
+    """Route Planning API"""
+    result = get_amap_service().plan_route(
+        request.args.get('origin', ''),
+        request.args.get('destination', ''),
+        request.args.get('mode', 'driving')
+    )
+    return _envelope_response(result, AmapService.ROUTE_TTL)
+
+@app.route('/api/map/distance', methods=['GET'])
+def map_distance():
+    """Distance Calculation API"""
+    result = get_amap_service().calculate_distance(
+        request.args.get('origins', ''),
+        request.args.get('destination', ''),
+        request.args.get('mode')
+    )
+    return _envelope_response(result, AmapService.ROUTE_TTL)
+
+@app.route('/api/weather/current', methods=['GET'])
+def weather_current():
+    """Real-time Weather API"""
+    result = get_amap_service().current_weather(request.args.get('city', ''))
+    return _envelope_response(result, AmapService.WEATHER_CURRENT_TTL)
+
+@app.route('/api/weather/forecast', methods=['GET'])
+def weather_forecast():
+    """Weather Forecast API"""
+    days = request.args.get('days', 4, type=int)
+    result = get_amap_service().forecast(request.args.get('city', ''), days)
+    return _envelope_response(result, AmapService.WEATHER_FORECAST_TTL)
+
+@app.route('/api/weather/batch', methods=['GET'])
+def weather_batch():
+    """Multi-city Weather API (?cities=北京,上海)"""
+    cities = [c.strip() for c in request.args.get('cities', '').split(',') if c.strip()]
+    days = request.args.get('days', 4, type=int)
+    result = get_amap_service().weather_batch(cities, days)
+    return _envelope_response(result, AmapService.WEATHER_CURRENT_TTL)
+
 if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5000))
+    debug = os.getenv('FLASK_DEBUG', '1').lower() in ('1', 'true', 'yes')
+
     print("\n" + "=" * 60)
     print("🚀 TripPilot Backend Service Starting...")
     print("=" * 60)
-    print("📍 Address: http://localhost:5000")
-    print("💡 Health Check: http://localhost:5000/health")
-    print("💡 Chat API: http://localhost:5000/api/chat")
+    print(f"📍 Address: http://localhost:{port}")
+    print(f"💡 Health Check: http://localhost:{port}/health")
+    print(f"💡 Chat API: http://localhost:{port}/api/chat")
     print("=" * 60 + "\n")
 
     # Start Flask service
     app.run(
         host='0.0.0.0',
-        port=5000,
-        debug=True
+        port=port,
+        debug=debug
     )
\ No newline at end of file
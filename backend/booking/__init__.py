@@ -3,7 +3,7 @@ Booking模块 - 预订服务层
 处理航班和酒店的搜索、查询等预订相关功能
 
 """
-from .amadeus_service import AmadeusService
+from .amadeus_service import AmadeusService, get_amadeus_service
 
-__all__ = ['AmadeusService']
+__all__ = ['AmadeusService', 'get_amadeus_service']
 __version__ = '1.0.0'
\ No newline at end of file
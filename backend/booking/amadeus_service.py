@@ -4,11 +4,20 @@ Handles flight and hotel searches, includes AI enhancement to fill missing data.
 """
 import requests
 from datetime import datetime, timedelta
+from dataclasses import replace
 from typing import Dict, Any, List, Optional
 import json
 import re
+import threading
 
 from config.config import Config
+from backend.models import Flight, Offer, format_duration, integer, number, split_datetime, text
+from backend.utils import SingleFlight
+from backend.utils.http_client import build_session
+from backend.utils.warmup import warm_session
+from backend.utils.log import get_logger
+
+logger = get_logger("backend.booking.amadeus_service")
 
 
 class AmadeusService:
@@ -22,7 +31,8 @@ class AmadeusService:
         # API Configuration
         self.client_id = Config.AMADEUS_CLIENT_ID
         self.client_secret = Config.AMADEUS_CLIENT_SECRET
-        self.base_url = "https://test.api.amadeus.com"
+        self.base_url = Config.AMADEUS_BASE_URL
+        self.session = build_session("amadeus")
 
         # Token Management
         self.access_token = None
@@ -31,7 +41,10 @@ class AmadeusService:
         # AI Enhancement
         self.deepseek_client = deepseek_client
 
-        print("✅ Amadeus Service Initialized (AI Enhanced)")
+        # Identical concurrent API calls share one HTTP request
+        self._inflight = SingleFlight()
+
+        logger.info("Amadeus service initialized")
 
     # ==================== Flight Search (AI Enhanced) ====================
 
@@ -39,13 +52,16 @@ class AmadeusService:
         """
         Search Flights (AI Enhanced)
         Automatically fills missing flight information.
+
+        Returns:
+            {'success', 'data': [Flight, ...], 'count', 'ai_enhanced_count', 'message'}
         """
         try:
             origin = params['origin']
             destination = params['destination']
             date = params['departure_date']
 
-            print(f"\n✈️  Searching Flights: {origin} → {destination} ({date})")
+            logger.info("Searching flights", extra={"origin": origin, "destination": destination, "date": date})
 
             # Call Real API
             endpoint = f"{self.base_url}/v2/shopping/flight-offers"
@@ -78,13 +94,14 @@ class AmadeusService:
 
             for flight in flights:
                 enhanced_flight, is_ai_enhanced = self._enhance_flight_data(flight)
+                if enhanced_flight is None:
+                    continue
                 enhanced_flights.append(enhanced_flight)
                 if is_ai_enhanced:
                     ai_enhanced_count += 1
 
-            print(f"✅ Found {len(enhanced_flights)} flights")
-            if ai_enhanced_count > 0:
-                print(f"   💡 AI enhanced data for {ai_enhanced_count} flights")
+            logger.info("Flight search complete",
+                        extra={"count": len(enhanced_flights), "ai_enhanced": ai_enhanced_count})
 
             return {
                 'success': True,
@@ -102,7 +119,7 @@ class AmadeusService:
                 'message': f"Missing required parameters: {e}"
             }
         except Exception as e:
-            print(f"❌ Flight search error: {e}")
+            logger.exception("Flight search error")
             return {
                 'success': False,
                 'data': [],
@@ -112,100 +129,95 @@ class AmadeusService:
 
     def _enhance_flight_data(self, flight: Dict) -> tuple:
         """
-        Enhance flight data, fill missing fields.
+        Map a flight offer into a Flight, fill missing fields.
 
         Returns:
-            (enhanced_flight, is_ai_enhanced)
+            (flight, is_ai_enhanced); flight is None for offers without segments
         """
         try:
             itinerary = flight.get('itineraries', [{}])[0]
             segments = itinerary.get('segments', [])
 
             if not segments:
-                return flight, False
+                return None, False
 
             first_segment = segments[0]
             last_segment = segments[-1]
+            departure_date, departure_time = split_datetime(first_segment.get('departure', {}).get('at'))
+            _, arrival_time = split_datetime(last_segment.get('arrival', {}).get('at'))
 
             # Get cabin and baggage info
             traveler_pricing = flight.get('travelerPricings', [{}])[0]
             fare_details = traveler_pricing.get('fareDetailsBySegment', [{}])[0]
-            cabin_class = fare_details.get('cabin', 'ECONOMY')
+            price = flight.get('price', {})
 
             # Basic Data
-            enhanced = {
-                'id': flight.get('id'),
-                'source': flight.get('source', 'GDS'),
-                'price': {
-                    'total': flight.get('price', {}).get('total'),
-                    'base': flight.get('price', {}).get('base'),
-                    'currency': flight.get('price', {}).get('currency', 'USD'),
-                    'grandTotal': flight.get('price', {}).get('grandTotal')
-                },
-                'departure': {
-                    'iataCode': first_segment.get('departure', {}).get('iataCode'),
-                    'terminal': first_segment.get('departure', {}).get('terminal'),
-                    'at': first_segment.get('departure', {}).get('at')
-                },
-                'arrival': {
-                    'iataCode': last_segment.get('arrival', {}).get('iataCode'),
-                    'terminal': last_segment.get('arrival', {}).get('terminal'),
-                    'at': last_segment.get('arrival', {}).get('at')
-                },
-                'carrierCode': first_segment.get('carrierCode'),
-                'number': first_segment.get('number'),
-                'aircraft': first_segment.get('aircraft', {}).get('code'),
-                'duration': itinerary.get('duration'),
-                'numberOfStops': len(segments) - 1,
-                'cabinClass': cabin_class  # Obtained from API response
-            }
+            enhanced = Flight(
+                id=str(flight.get('id')),
+                carrier_code=first_segment.get('carrierCode'),
+                flight_number=text(first_segment.get('number')),
+                origin=first_segment.get('departure', {}).get('iataCode'),
+                destination=last_segment.get('arrival', {}).get('iataCode'),
+                departure_date=departure_date,
+                departure_time=departure_time,
+                arrival_time=arrival_time,
+                duration=format_duration(itinerary.get('duration')),
+                stops=len(segments) - 1,
+                cabin_class=fare_details.get('cabin', 'ECONOMY'),  # Obtained from API response
+                aircraft=first_segment.get('aircraft', {}).get('code'),
+                departure_terminal=first_segment.get('departure', {}).get('terminal'),
+                arrival_terminal=last_segment.get('arrival', {}).get('terminal'),
+                checked_bags=fare_details.get('includedCheckedBags', {}).get('quantity'),
+                offer=Offer(
+                    price=number(price.get('grandTotal') or price.get('total')),
+                    currency=price.get('currency', 'USD'),
+                    base_price=number(price.get('base'))
+                )
+            )
 
             # Check for missing fields and use AI to fill
-            is_ai_enhanced = False
-            missing_fields = []
-
-            # Check critical fields
-            if not enhanced.get('aircraft'):
-                missing_fields.append('aircraft')
-            if not enhanced['departure'].get('terminal'):
-                missing_fields.append('departure_terminal')
-            if not enhanced['arrival'].get('terminal'):
-                missing_fields.append('arrival_terminal')
-
-            # Get baggage allowance
-            enhanced['includedCheckedBags'] = fare_details.get('includedCheckedBags', {}).get('quantity')
-            enhanced['cabin'] = cabin_class
-
-            if not enhanced.get('includedCheckedBags'):
-                missing_fields.append('baggage')
+            missing_fields = [
+                name for name, value in (
+                    ('aircraft', enhanced.aircraft),
+                    ('departure_terminal', enhanced.departure_terminal),
+                    ('arrival_terminal', enhanced.arrival_terminal),
+                    ('baggage', enhanced.checked_bags),
+                ) if not value
+            ]
 
             # If fields are missing and AI client exists, use AI to enhance
             if missing_fields and self.deepseek_client:
                 ai_data = self._ai_enhance_flight(enhanced, missing_fields)
                 if ai_data:
-                    enhanced.update(ai_data)
-                    enhanced['_ai_enhanced'] = True
-                    enhanced['_ai_fields'] = missing_fields
-                    is_ai_enhanced = True
-
-            return enhanced, is_ai_enhanced
+                    enhanced = replace(
+                        enhanced,
+                        aircraft=enhanced.aircraft or text(ai_data.get('aircraft')),
+                        departure_terminal=enhanced.departure_terminal or text(ai_data.get('departure_terminal')),
+                        arrival_terminal=enhanced.arrival_terminal or text(ai_data.get('arrival_terminal')),
+                        checked_bags=enhanced.checked_bags or integer(ai_data.get('includedCheckedBags')),
+                        amenities=tuple(ai_data.get('amenities') or ()),
+                        ai_fields=tuple(missing_fields)
+                    )
+                    return enhanced, True
+
+            return enhanced, False
 
         except Exception as e:
-            print(f"⚠️  Flight data enhancement failed: {e}")
-            return flight, False
+            logger.warning("Flight data enhancement failed", extra={"error": str(e)})
+            return None, False
 
-    def _ai_enhance_flight(self, flight_data: Dict, missing_fields: List[str]) -> Optional[Dict]:
+    def _ai_enhance_flight(self, flight: Flight, missing_fields: List[str]) -> Optional[Dict]:
         """Use AI to fill missing flight information"""
         if not self.deepseek_client:
             return None
 
         try:
-            carrier = flight_data.get('carrierCode', '')
-            aircraft_code = flight_data.get('aircraft', '')
-            cabin_class = flight_data.get('cabinClass', 'ECONOMY')
+            carrier = flight.carrier_code or ''
+            aircraft_code = flight.aircraft or ''
+            cabin_class = flight.cabin_class or 'ECONOMY'
 
             prompt = f"""Supply missing information for the flight.
-Flight: {carrier}{flight_data.get('number', '')}
+Flight: {carrier}{flight.flight_number or ''}
 Aircraft: {aircraft_code if aircraft_code else 'Unknown'}
 Cabin: {cabin_class}
 
@@ -241,13 +253,13 @@ Return only JSON, no other content."""
 
             if json_match:
                 ai_data = json.loads(json_match.group())
-                print(f"   💡 AI filled fields: {', '.join(missing_fields)}")
+                logger.debug("AI filled flight fields", extra={"fields": missing_fields})
                 return ai_data
 
             return None
 
         except Exception as e:
-            print(f"⚠️  AI enhancement failed: {e}")
+            logger.warning("AI enhancement failed", extra={"error": str(e)})
             return None
 
     # ==================== Hotel Search (AI Enhanced) ====================
@@ -263,8 +275,8 @@ Return only JSON, no other content."""
             check_in = params['check_in_date']
             check_out = params['check_out_date']
 
-            print(f"\n🏨 Searching Hotels: ({lat}, {lon})")
-            print(f"   Dates: {check_in} → {check_out}")
+            logger.info("Searching hotels", extra={
+                "latitude": lat, "longitude": lon, "check_in": check_in, "check_out": check_out})
 
             # Step 1: Search basic hotel info
             hotels = self._search_hotels_basic(params)
@@ -280,15 +292,14 @@ Return only JSON, no other content."""
                     'message': 'No hotels found'
                 }
 
-            print(f"✅ Found {len(hotels)} hotels")
-
             # Step 2: Get room offers (Real API + AI Supplement)
             offers, ai_offer_count = self._get_hotel_offers(hotels, params)
-            print(f"   💰 Retrieved {len(offers)} offers (AI Generated: {ai_offer_count})")
 
             # Step 3: Get hotel reviews (Real API + AI Supplement)
             reviews, ai_review_count = self._get_hotel_reviews(hotels)
-            print(f"   ⭐ Retrieved {len(reviews)} reviews (AI Generated: {ai_review_count})")
+            logger.info("Hotel search complete", extra={
+                "count": len(hotels), "offers": len(offers), "ai_offers": ai_offer_count,
+                "reviews": len(reviews), "ai_reviews": ai_review_count})
 
             ai_enhanced = ai_offer_count > 0 or ai_review_count > 0
 
@@ -303,7 +314,7 @@ Return only JSON, no other content."""
             }
 
         except Exception as e:
-            print(f"❌ Hotel search error: {e}")
+            logger.exception("Hotel search error")
             return {
                 'success': False,
                 'hotels': [],
@@ -441,7 +452,7 @@ Return only JSON."""
             return None
 
         except Exception as e:
-            print(f"⚠️  AI offer generation failed: {e}")
+            logger.warning("AI offer generation failed", extra={"error": str(e)})
             return None
 
     def _generate_hotel_review(self, hotel: Dict) -> Optional[Dict]:
@@ -494,18 +505,24 @@ Return only JSON."""
             return None
 
         except Exception as e:
-            print(f"⚠️  AI review generation failed: {e}")
+            logger.warning("AI review generation failed", extra={"error": str(e)})
             return None
 
     # ==================== Token Management ====================
 
+    def warm_up(self) -> Dict[str, Any]:
+        """Fetch the OAuth token and open pooled connections before the first search"""
+        connections = warm_session(self.session, self.base_url, Config.WARMUP_CONNECTIONS, timeout=5)
+        self._get_amadeus_token()
+        return {"connections": connections, "token_expires_at": self.token_expires_at.isoformat(timespec="seconds")}
+
     def _get_amadeus_token(self) -> str:
         """Get Amadeus Access Token"""
         if self.access_token and self.token_expires_at:
             if datetime.now() < self.token_expires_at:
                 return self.access_token
 
-        print("🔑 Getting Amadeus Token...")
+        logger.debug("Requesting Amadeus token")
 
         url = f"{self.base_url}/v1/security/oauth2/token"
         data = {
@@ -515,7 +532,7 @@ Return only JSON."""
         }
 
         try:
-            response = requests.post(url, data=data, timeout=10)
+            response = self.session.post(url, data=data, timeout=10)
             response.raise_for_status()
 
             token_data = response.json()
@@ -524,7 +541,7 @@ Return only JSON."""
             expires_in = token_data.get('expires_in', 1799)
             self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 300)
 
-            print("✅ Token acquired successfully")
+            logger.info("Amadeus token acquired", extra={"expires_in": expires_in})
             return self.access_token
 
         except Exception as e:
@@ -539,20 +556,41 @@ Return only JSON."""
         }
 
     def _call_api(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Generic API Call"""
+        """Generic API Call (identical concurrent calls are coalesced)"""
+        if not Config.ENABLE_REQUEST_COALESCING:
+            return self._do_call_api(endpoint, params)
+
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        return self._inflight.do(key, self._do_call_api, endpoint, params)
+
+    def _do_call_api(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Perform the HTTP request for _call_api"""
         try:
             headers = self._get_headers()
-            response = requests.get(endpoint, headers=headers, params=params, timeout=30)
+            response = self.session.get(endpoint, headers=headers, params=params, timeout=30)
 
             if response.status_code == 401:
-                print("🔄 Token expired, refreshing...")
+                logger.info("Amadeus token expired, refreshing")
                 self.access_token = None
                 headers = self._get_headers()
-                response = requests.get(endpoint, headers=headers, params=params, timeout=30)
+                response = self.session.get(endpoint, headers=headers, params=params, timeout=30)
 
             response.raise_for_status()
             return response.json()
 
         except requests.exceptions.RequestException as e:
-            print(f"❌ API Request Error: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            logger.warning("Amadeus request error", extra={"endpoint": endpoint, "error": str(e)})
+            return {"error": str(e)}
+
+_service: Optional[AmadeusService] = None
+_service_lock = threading.Lock()
+
+
+def get_amadeus_service() -> AmadeusService:
+    """Process-wide AmadeusService, so its OAuth token and connections are shared (and pre-warmed)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AmadeusService(Config.get_deepseek_client())
+    return _service
@@ -0,0 +1,9 @@
+"""
+Maps模块 - Amap (Gaode) provider clients
+Place search, routing and weather backed by the Amap v3 REST API
+"""
+from .gaode_maps import GaodeMapAPI
+from .weather_api import WeatherAPI
+from .amap_service import AmapService, get_amap_service
+
+__all__ = ['GaodeMapAPI', 'WeatherAPI', 'AmapService', 'get_amap_service']
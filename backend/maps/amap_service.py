@@ -0,0 +1,130 @@
+"""
+Amap Service - Map and weather endpoints backed by GaodeMapAPI / WeatherAPI
+Returns the {"code", "msg", "data"} envelope MapTool and WeatherTool expect,
+with provider results cached in-process.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+from config.config import Config
+from backend.utils import TTLCache, memory
+from backend.utils.warmup import register_cache
+from .gaode_maps import GaodeMapAPI
+from .weather_api import WeatherAPI
+
+
+class AmapService:
+    """
+    Amap Service
+    Place search, routing, distance and weather lookups for the /api/map/*
+    and /api/weather/* endpoints.
+    """
+
+    # Cache lifetimes (seconds), also used as Cache-Control max-age by the routes
+    SEARCH_TTL = 3600
+    ROUTE_TTL = 600
+    WEATHER_CURRENT_TTL = Config.WEATHER_LIVE_TTL
+    WEATHER_FORECAST_TTL = Config.WEATHER_FORECAST_TTL
+
+    def __init__(self):
+        """Initialize Amap Service"""
+        self.maps = GaodeMapAPI()
+        self.weather = WeatherAPI()
+
+        # Weather is cached inside WeatherAPI; map lookups are cached here
+        self._search_cache = TTLCache(maxsize=1024, ttl=self.SEARCH_TTL)
+        self._route_cache = TTLCache(maxsize=1024, ttl=self.ROUTE_TTL)
+        memory.register_container("amap.search_cache", self._search_cache)
+        memory.register_container("amap.route_cache", self._route_cache)
+        register_cache("amap.search", self._search_cache)
+        register_cache("amap.route", self._route_cache)
+
+    # ==================== Map ====================
+
+    def search_place(self, city: str, keyword: str) -> Dict[str, Any]:
+        """Keyword POI search; data is the raw Amap response (with "pois")"""
+        if not keyword:
+            return self._error("keyword is required")
+        return self._call(
+            self._search_cache, ("search", city, keyword),
+            lambda: self.maps.search_place(city, keyword)
+        )
+
+    def plan_route(self, origin: str, destination: str, mode: str = "driving") -> Dict[str, Any]:
+        """Route planning between "lon,lat" points; data is the raw Amap response (with "route")"""
+        if not origin or not destination:
+            return self._error("origin and destination are required")
+        return self._call(
+            self._route_cache, ("route", origin, destination, mode),
+            lambda: self.maps.plan_route(origin, destination, mode)["raw"]
+        )
+
+    def calculate_distance(self, origins: str, destination: str, mode: Optional[str] = None) -> Dict[str, Any]:
+        """Distance from each origin ("|"-separated) to destination; straight-line when mode is empty"""
+        if not origins or not destination:
+            return self._error("origins and destination are required")
+
+        def load():
+            distances = self.maps.calculate_distance(origins, destination, mode=mode or None, batch=True)
+            return {"results": [{"distance": d} for d in distances]}
+
+        return self._call(self._route_cache, ("distance", origins, destination, mode), load)
+
+    # ==================== Weather ====================
+
+    def current_weather(self, city: str) -> Dict[str, Any]:
+        """Real-time weather"""
+        if not city:
+            return self._error("city is required")
+        return self._call(None, None, lambda: self.weather.get_current_weather(self._amap_city(city)))
+
+    def forecast(self, city: str, days: int = 4) -> Dict[str, Any]:
+        """Up to 4-day forecast"""
+        if not city:
+            return self._error("city is required")
+        return self._call(None, None, lambda: self.weather.get_forecast(self._amap_city(city), days))
+
+    def weather_batch(self, cities: list, days: int = 4) -> Dict[str, Any]:
+        """Live weather + forecast for several cities in one call"""
+        if not cities:
+            return self._error("cities is required")
+        amap_names = {city: self._amap_city(city) for city in cities}
+        fused = self.weather.get_weather_batch(list(amap_names.values()), days)
+        return {"code": 0, "msg": "ok", "data": {city: fused[name] for city, name in amap_names.items()}}
+
+    # ==================== Helper Methods ====================
+
+    @staticmethod
+    def _amap_city(city: str) -> str:
+        """Translate known English city names; pass anything else (e.g. adcodes) through"""
+        return Config.get_amap_city(city) or city
+
+    @staticmethod
+    def _call(cache: Optional[TTLCache], key, loader) -> Dict[str, Any]:
+        """Run a provider lookup (through the cache if given) and wrap it in the envelope"""
+        try:
+            data = cache.get_or_set(key, loader) if cache is not None else loader()
+            return {"code": 0, "msg": "ok", "data": data}
+        except (requests.RequestException, RuntimeError, ValueError, KeyError, IndexError) as e:
+            return AmapService._error(str(e))
+
+    @staticmethod
+    def _error(msg: str) -> Dict[str, Any]:
+        """Error envelope"""
+        return {"code": 1, "msg": msg, "data": None}
+
+
+_service: Optional[AmapService] = None
+_service_lock = threading.Lock()
+
+
+def get_amap_service() -> AmapService:
+    """Process-wide AmapService shared by the HTTP routes and in-process tool calls"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = AmapService()
+    return _service
@@ -99,6 +99,8 @@
 
 import requests
 from config.config import Config
+from backend.utils import SingleFlight
+from backend.utils.http_client import build_session
 """   
    - Route Planning (Driving, Transit, Walking)
    - Calculate Distance and Time between locations
@@ -109,12 +111,20 @@ from config.config import Config
 class GaodeMapAPI:
     def __init__(self):
         self.api_key = Config.GAODE_API_KEY
-        self.base_url = "https://restapi.amap.com/v3"
-        self.session = requests.Session()
+        self.base_url = f"{Config.GAODE_BASE_URL}/v3"
+        self.session = build_session("gaode")
+        self._inflight = SingleFlight()  # Coalesces identical concurrent GETs
 
     # -------------------- General Internal Methods --------------------
     def _get(self, url, params):
         """Unified GET wrapper: includes exception handling, status code check, returns JSON"""
+        if not Config.ENABLE_REQUEST_COALESCING:
+            return self._fetch(url, params)
+        key = (url, tuple(sorted((k, str(v)) for k, v in params.items() if k != "key")))
+        return self._inflight.do(key, self._fetch, url, params)
+
+    def _fetch(self, url, params):
+        """Perform the GET for _get"""
         try:
             resp = self.session.get(url, params=params, timeout=5)
             resp.raise_for_status()
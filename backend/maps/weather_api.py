@@ -1,33 +1,136 @@
+import contextvars
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from config.config import Config
+from backend.utils import TTLCache, memory
+from backend.utils.http_client import build_session
+from backend.utils.warmup import register_cache
 import re
 
 """- Query current weather
    - 5-day weather forecast
    - Recommend activities based on weather"""
 
+# City-keyed caches shared by every WeatherAPI instance
+_LIVE_CACHE = TTLCache(maxsize=512, ttl=Config.WEATHER_LIVE_TTL)
+_FORECAST_CACHE = TTLCache(maxsize=512, ttl=Config.WEATHER_FORECAST_TTL)
+memory.register_container("weather.live_cache", _LIVE_CACHE)
+memory.register_container("weather.forecast_cache", _FORECAST_CACHE)
+register_cache("weather.live", _LIVE_CACHE)
+register_cache("weather.forecast", _FORECAST_CACHE)
+
+# Live and forecast calls (and batch cities) run side by side on this pool
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="weather")
+
+
 class WeatherAPI:
     """
     Amap weather API encapsulation
     - Real-time weather /api/weather/current?city=Shanghai
     - 4-day forecast /api/weather/forecast?city=Shanghai
+    Live data is cached per city for ~10 min, forecasts for ~1 h.
     """
     def __init__(self):
         self.api_key = Config.GAODE_API_KEY  # Shares the same key with the map module
-        self.base_url = "https://restapi.amap.com/v3/weather"
+        self.base_url = f"{Config.GAODE_BASE_URL}/v3/weather"
+        self.session = build_session("gaode")
+        self.timeout = Config.WEATHER_HTTP_TIMEOUT
 
     # --------- Public methods ---------
     def get_current_weather(self, city: str):
         """Real-time weather"""
-        payload = {"key": self.api_key, "city": city, "extensions": "base"}
-        rsp = requests.get(f"{self.base_url}/weatherInfo", params=payload)
-        return self._fmt_live(rsp.json())
+        return _LIVE_CACHE.get_or_set(city.strip(), lambda: self._fetch_live(city))
 
     def get_forecast(self, city: str, days: int = 4):
         """4-day forecast (Amap only supports 4 days)"""
+        casts = _FORECAST_CACHE.get_or_set(city.strip(), lambda: self._fetch_forecast(city))
+        return casts[:days]
+
+    def get_weather(self, city: str, days: int = 4):
+        """
+        Live weather and forecast in one fused fetch
+
+        Both Amap calls run concurrently. If the live call fails, live data is
+        derived from today's entry of the forecast (the extensions=all response)
+        and marked with "derived": True.
+
+        Returns:
+            {"city": ..., "live": {...}, "forecast": [...]}
+        """
+        futures = self._submit_fused(city, days)
+        wait(futures, timeout=Config.WEATHER_FETCH_TIMEOUT)
+        return self._assemble(city, *futures)
+
+    def get_weather_batch(self, cities, days: int = 4):
+        """
+        Fused weather for several cities, all Amap calls issued concurrently
+
+        Returns:
+            {city: {"city", "live", "forecast"} or {"error": "..."}}
+        """
+        pending = {city: self._submit_fused(city, days) for city in dict.fromkeys(cities)}
+        wait([f for futures in pending.values() for f in futures], timeout=Config.WEATHER_FETCH_TIMEOUT)
+
+        results = {}
+        for city, futures in pending.items():
+            try:
+                results[city] = self._assemble(city, *futures)
+            except RuntimeError as e:
+                results[city] = {"error": str(e)}
+        return results
+
+    def _submit_fused(self, city: str, days: int):
+        """Start the live and forecast lookups for a city (each in a copy of the caller's context, for tracing)"""
+        return (
+            _EXECUTOR.submit(contextvars.copy_context().run, self.get_current_weather, city),
+            _EXECUTOR.submit(contextvars.copy_context().run, self.get_forecast, city, days),
+        )
+
+    def _assemble(self, city: str, live_future, forecast_future):
+        """Combine finished live/forecast lookups; calls still running count as failed"""
+        forecast = self._future_result(forecast_future)
+        live = self._future_result(live_future)
+
+        if live is None and forecast:
+            live = self._live_from_forecast(forecast[0], city)
+        if live is None:
+            raise RuntimeError(f"Amap weather unavailable for {city}")
+
+        return {"city": live.get("city") or city, "live": live, "forecast": forecast or []}
+
+    # --------- Provider calls ---------
+    def _fetch_live(self, city: str):
+        """Fetch real-time weather from Amap"""
+        payload = {"key": self.api_key, "city": city, "extensions": "base"}
+        rsp = self.session.get(f"{self.base_url}/weatherInfo", params=payload, timeout=self.timeout)
+        return self._fmt_live(rsp.json())
+
+    def _fetch_forecast(self, city: str):
+        """Fetch the full forecast from Amap (sliced per call by get_forecast)"""
         payload = {"key": self.api_key, "city": city, "extensions": "all"}
-        rsp = requests.get(f"{self.base_url}/weatherInfo", params=payload)
-        return self._fmt_forecast(rsp.json(), days)
+        rsp = self.session.get(f"{self.base_url}/weatherInfo", params=payload, timeout=self.timeout)
+        return self._fmt_forecast(rsp.json(), 4)
+
+    @staticmethod
+    def _future_result(future):
+        """Result of a finished future, or None if it failed or is still running"""
+        if not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    @staticmethod
+    def _live_from_forecast(day: dict, city: str):
+        """Approximate live weather from today's forecast entry"""
+        return {
+            "temperature": float(day["max_temp"]),
+            "description": day["day_weather"],
+            "humidity": None,  # Not part of the forecast response
+            "wind_speed": 0.0,
+            "wind_direction": "",
+            "city": city,
+            "report_time": day["date"],
+            "derived": True,
+        }
 
     # --------- Internal formatting ---------
     def _fmt_live(self, js: dict):
@@ -48,6 +151,9 @@ class WeatherAPI:
             "description": live["weather"],
             "humidity": float(live["humidity"]),
             "wind_speed": wind_level,
+            "wind_direction": live.get("winddirection", ""),
+            "city": live.get("city", ""),
+            "report_time": live.get("reporttime", ""),
         }
 
     def _fmt_forecast(self, js: dict, days: int):
@@ -64,4 +170,4 @@ class WeatherAPI:
                 "min_temp": int(c["nighttemp"]),  # Convert directly to int without unpacking
                 "max_temp": int(c["daytemp"]),
             })
-        return out
\ No newline at end of file
+        return out
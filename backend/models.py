@@ -0,0 +1,315 @@
+"""
+Domain Models
+Typed, slotted and immutable records for the results the backend hands to the
+frontend: Flight, Hotel (each with a priced Offer; hotels also list their
+RoomTypes) and Weather (with its ForecastDay entries).
+
+Every provider adapter (Amadeus, the LLM JSON, mock generators, Amap
+hotels and weather) maps its payload into these models exactly once; the single wire
+shape then comes from to_dict(), which follows a per-class field plan built
+on first use. None values and empty sequences are left out of the output.
+
+    flight = Flight.from_record(llm_json)
+    response["data"] = [flight.to_dict()]
+"""
+import re
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+# How a field is written by to_dict (dataclass field metadata)
+_FLATTEN = "flatten"   # Nested model whose keys are merged into the parent
+_MODELS = "models"     # Sequence of models
+
+
+# ==================== Value Parsing ====================
+
+def number(value: Any) -> Optional[float]:
+    """A numeric field from loosely typed input ("¥1,280", "4.5", 800); ints stay ints, None if not a number"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        parsed = float(str(value).replace(",", "").strip().lstrip("¥$€").strip())
+    except ValueError:
+        return None
+    return int(parsed) if parsed.is_integer() else parsed
+
+
+def integer(value: Any) -> Optional[int]:
+    parsed = number(value)
+    return None if parsed is None else int(parsed)
+
+
+def text(value: Any) -> Optional[str]:
+    """A string field; None for missing or empty values"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def format_duration(duration: Any) -> Optional[str]:
+    """Amadeus ISO durations ("PT4H30M") as "4h 30m"; other values are kept as written"""
+    duration = text(duration)
+    if not duration or not duration.upper().startswith("PT"):
+        return duration
+    hours = re.search(r"(\d+)H", duration.upper())
+    minutes = re.search(r"(\d+)M", duration.upper())
+    parts = ([f"{hours.group(1)}h"] if hours else []) + ([f"{minutes.group(1)}m"] if minutes else [])
+    return " ".join(parts) or None
+
+
+def split_datetime(value: Any) -> Tuple[Optional[str], Optional[str]]:
+    """ "2025-11-20T09:00:00" -> ("2025-11-20", "09:00"); "09:00" -> (None, "09:00") """
+    value = text(value)
+    if not value:
+        return None, None
+    date, _, clock = value.rpartition("T") if "T" in value else ("", "", value)
+    return date or None, clock[:5]
+
+
+# ==================== Serialization ====================
+
+_PLANS: Dict[type, Tuple[Tuple[str, str, Optional[str]], ...]] = {}
+
+
+def _plan(cls: type) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+    """(attribute, wire key, kind) per field, built once per model class"""
+    plan = _PLANS.get(cls)
+    if plan is None:
+        plan = _PLANS[cls] = tuple(
+            (f.name, f.metadata.get("key", f.name), f.metadata.get("kind")) for f in fields(cls)
+        )
+    return plan
+
+
+def to_dict(model: "Model") -> Dict[str, Any]:
+    """Wire representation of a model (JSON-ready)"""
+    out: Dict[str, Any] = {}
+    for name, key, kind in _plan(type(model)):
+        value = getattr(model, name)
+        if value is None or value == ():
+            continue
+        if kind == _FLATTEN:
+            out.update(to_dict(value))
+        elif kind == _MODELS:
+            out[key] = [to_dict(item) for item in value]
+        elif isinstance(value, tuple):
+            out[key] = list(value)
+        else:
+            out[key] = value
+    return out
+
+
+class Model:
+    """Base of the domain models"""
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return to_dict(self)
+
+
+# ==================== Models ====================
+
+@dataclass(frozen=True, slots=True)
+class Offer(Model):
+    """A bookable price (per flight, or per night for hotels)"""
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    base_price: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Flight(Model):
+    id: str
+    carrier_code: Optional[str] = None
+    carrier_name: Optional[str] = None
+    flight_number: Optional[str] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    departure_date: Optional[str] = None   # YYYY-MM-DD
+    departure_time: Optional[str] = None   # HH:MM
+    arrival_time: Optional[str] = None     # HH:MM
+    duration: Optional[str] = None
+    stops: Optional[int] = None
+    cabin_class: Optional[str] = None
+    aircraft: Optional[str] = None
+    available_seats: Optional[int] = None
+    departure_terminal: Optional[str] = None
+    arrival_terminal: Optional[str] = None
+    checked_bags: Optional[int] = None
+    amenities: Tuple[Any, ...] = ()
+    offer: Offer = field(default_factory=Offer, metadata={"kind": _FLATTEN})
+    ai_fields: Tuple[str, ...] = field(default=(), metadata={"key": "_ai_fields"})
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], index: int = 0) -> "Flight":
+        """Map a loosely structured flight dict (LLM JSON, legacy tool output)"""
+        date, departure = split_datetime(record.get("departure_time") or record.get("departure"))
+        _, arrival = split_datetime(record.get("arrival_time") or record.get("arrival"))
+        return cls(
+            id=text(record.get("id")) or f"flight_{index + 1:03d}",
+            carrier_code=text(record.get("carrier_code")),
+            carrier_name=text(record.get("carrier_name") or record.get("operating_carrier")),
+            flight_number=text(record.get("flight_number")),
+            origin=text(record.get("origin") or record.get("departure_iata")),
+            destination=text(record.get("destination") or record.get("arrival_iata")),
+            departure_date=text(record.get("departure_date")) or date,
+            departure_time=departure,
+            arrival_time=arrival,
+            duration=format_duration(record.get("duration")),
+            stops=integer(record.get("stops")),
+            cabin_class=text(record.get("cabin_class")),
+            aircraft=text(record.get("aircraft") or record.get("aircraft_code")),
+            available_seats=integer(record.get("available_seats", record.get("number_of_bookable_seats"))),
+            offer=Offer(
+                price=number(record.get("price", record.get("total_price"))),
+                currency=text(record.get("currency")),
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RoomType(Model):
+    name: str
+    price: Optional[float] = None          # Per night
+    beds: Optional[str] = None
+    size: Optional[str] = None
+    max_occupancy: Optional[int] = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "RoomType":
+        return cls(
+            name=text(record.get("name")) or "Room",
+            price=number(record.get("price")),
+            beds=text(record.get("beds")),
+            size=text(record.get("size")),
+            max_occupancy=integer(record.get("max_occupancy")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Hotel(Model):
+    id: str
+    name: str
+    location: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    category: Optional[str] = field(default=None, metadata={"key": "type"})
+    tel: Optional[str] = None
+    rating: Optional[float] = None
+    amenities: Tuple[str, ...] = ()
+    landmark: Optional[str] = None
+    description: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    offer: Offer = field(default_factory=Offer, metadata={"kind": _FLATTEN})
+    # The stay the offer was priced for
+    checkin_date: Optional[str] = None     # YYYY-MM-DD
+    checkout_date: Optional[str] = None    # YYYY-MM-DD
+    nights: Optional[int] = None
+    total_price: Optional[float] = None
+    room_types: Tuple[RoomType, ...] = field(default=(), metadata={"kind": _MODELS})
+    policies: Optional[Dict[str, str]] = None
+    ai_enhanced: Optional[bool] = field(default=None, metadata={"key": "_ai_enhanced"})
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], index: int = 0) -> "Hotel":
+        """Map a loosely structured hotel dict (LLM JSON, Amap POIs, legacy tool output)"""
+        amenities = record.get("amenities") or ()
+        policies = record.get("policies")
+        return cls(
+            id=text(record.get("id")) or f"hotel_{index + 1:03d}",
+            name=text(record.get("name")) or "Hotel",
+            location=text(record.get("location")),
+            address=text(record.get("address")),
+            city=text(record.get("city")),
+            category=text(record.get("type")),
+            tel=text(record.get("tel")),
+            rating=number(record.get("rating")),
+            amenities=tuple(str(a) for a in amenities) if isinstance(amenities, (list, tuple)) else (str(amenities),),
+            landmark=text(record.get("landmark")),
+            description=text(record.get("description") or record.get("desc")),
+            latitude=number(record.get("latitude")),
+            longitude=number(record.get("longitude")),
+            offer=Offer(price=number(record.get("price")), currency=text(record.get("currency"))),
+            checkin_date=text(record.get("checkin_date")),
+            checkout_date=text(record.get("checkout_date")),
+            nights=integer(record.get("nights")),
+            total_price=number(record.get("total_price")),
+            room_types=tuple(RoomType.from_record(room) for room in record.get("room_types") or ()
+                             if isinstance(room, dict)),
+            policies=dict(policies) if isinstance(policies, dict) else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastDay(Model):
+    date: str
+    temp_high: Optional[float] = None
+    temp_low: Optional[float] = None
+    weather: Optional[str] = None          # Daytime condition
+    description: Optional[str] = None      # "day / night" conditions
+
+
+@dataclass(frozen=True, slots=True)
+class Weather(Model):
+    city: str
+    temperature: Optional[float] = None
+    feels_like: Optional[float] = None
+    weather: Optional[str] = None
+    humidity: Optional[float] = None
+    wind_speed: Optional[str] = None
+    wind_direction: Optional[str] = None
+    update_time: Optional[str] = None
+    air_quality: Optional[str] = None
+    sunrise: Optional[str] = None
+    sunset: Optional[str] = None
+    forecast: Tuple[ForecastDay, ...] = field(default=(), metadata={"kind": _MODELS})
+    source: Optional[str] = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], source: Optional[str] = None) -> "Weather":
+        """Map a loosely structured weather dict (LLM JSON); resolves the provider key variants once"""
+        current = record.get("current") if isinstance(record.get("current"), dict) else record
+        temperature = number(current.get("temperature"))
+        return cls(
+            city=text(record.get("city") or record.get("location") or record.get("city_name")) or "",
+            temperature=temperature,
+            feels_like=number(current.get("feels_like")) if current.get("feels_like") is not None else temperature,
+            weather=text(current.get("weather") or current.get("description")),
+            humidity=number(current.get("humidity")),
+            wind_speed=text(_first(current, "wind_speed", "windspeed")),
+            wind_direction=text(current.get("wind_direction")),
+            update_time=text(record.get("update_time") or record.get("report_time")),
+            air_quality=text(record.get("air_quality")),
+            sunrise=text(record.get("sunrise")),
+            sunset=text(record.get("sunset")),
+            forecast=tuple(_forecast_day(day) for day in record.get("forecast") or () if isinstance(day, dict)),
+            source=source,
+        )
+
+
+def _forecast_day(day: Dict[str, Any]) -> ForecastDay:
+    weather = text(day.get("weather") or day.get("day_weather") or day.get("dayweather"))
+    night = text(day.get("night_weather") or day.get("nightweather"))
+    return ForecastDay(
+        date=text(day.get("date")) or "",
+        temp_high=number(_first(day, "temp_high", "max_temp", "day_temp", "daytemp")),
+        temp_low=number(_first(day, "temp_low", "min_temp", "night_temp", "nighttemp")),
+        weather=weather,
+        description=text(day.get("description")) or (f"{weather} / {night}" if weather and night else weather),
+    )
+
+
+def _first(record: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if record.get(key) is not None:
+            return record[key]
+    return None
+
+
+def serialize(models: List[Model]) -> List[Dict[str, Any]]:
+    """Wire representation of a list of models"""
+    return [model.to_dict() for model in models]
@@ -0,0 +1,66 @@
+"""
+API Request Schemas
+Bodies accepted by the POST endpoints (see backend.utils.validation). They
+are compiled at import, and requests that do not match are answered with 400
+before the agent or any provider is called.
+"""
+from backend.utils.projection import VIEWS
+from backend.utils.validation import INTEGER, NUMBER, Field, Schema
+
+DATE = r"\d{4}-\d{2}-\d{2}"
+MAX_PROMPT_CHARS = 4000
+MAX_HISTORY_MESSAGES = 100
+CONVERSATION_ID = r"[\w-]{1,64}"
+
+PREFERENCES = Schema({
+    "destination": Field(str, nullable=True, max_length=100),
+    "origin": Field(str, nullable=True, max_length=100),
+    "budget": Field(NUMBER, minimum=0),
+    "remaining_budget": Field(NUMBER),
+    "days": Field(INTEGER, minimum=1, maximum=60),
+    # The chat page sends whatever the date pickers hold ("" / "None" when unset)
+    "start_date": Field(str, nullable=True, max_length=32),
+    "end_date": Field(str, nullable=True, max_length=32),
+    "interests": Field(list, items=str, max_items=20),
+})
+
+HISTORY_MESSAGE = Schema({
+    "role": Field(str, required=True, choices=("user", "assistant", "system")),
+    "content": Field(str, nullable=True),
+})
+
+# /api/chat and /api/chat/stream
+CHAT = Schema({
+    "prompt": Field(str, required=True, min_length=1, max_length=MAX_PROMPT_CHARS),
+    "preferences": Field(dict, default={}, schema=PREFERENCES),
+    "conversation_history": Field(list, default=[], items=HISTORY_MESSAGE, max_items=MAX_HISTORY_MESSAGES),
+    # Payload shaping (see backend.utils.projection): list view, and delta encoding per conversation
+    "view": Field(str, default="detail", choices=VIEWS),
+    "conversation_id": Field(str, nullable=True, pattern=CONVERSATION_ID),
+    "delta_base": Field(INTEGER, nullable=True, minimum=1),
+})
+
+SEARCH_HOTELS = Schema({
+    "destination": Field(str, required=True, min_length=1, max_length=100),
+    "checkin_date": Field(str, nullable=True, pattern=DATE),
+    "checkout_date": Field(str, nullable=True, pattern=DATE),
+    "budget": Field(NUMBER, default=5000, minimum=0),
+})
+
+SEARCH_FLIGHTS = Schema({
+    "origin": Field(str, required=True, min_length=1, max_length=100),
+    "destination": Field(str, required=True, min_length=1, max_length=100),
+    "departure_date": Field(str, nullable=True, pattern=DATE),
+    "return_date": Field(str, nullable=True, pattern=DATE),
+})
+
+WEATHER = Schema({
+    "city": Field(str, required=True, min_length=1, max_length=100),
+})
+
+PLAN_TRIP = Schema({
+    "destination": Field(str, required=True, min_length=1, max_length=100),
+    "days": Field(INTEGER, default=3, minimum=1, maximum=60),
+    "budget": Field(NUMBER, default=5000, minimum=0),
+    "interests": Field(list, default=[], items=str, max_items=20),
+})
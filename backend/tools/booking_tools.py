@@ -2,10 +2,10 @@
 Booking Tools - Amadeus API Wrapper
 Provides simple booking interfaces for the Agent.
 """
-from backend.booking import AmadeusService
-from config.config import Config
 from datetime import date, timedelta
 
+from backend.booking import AmadeusService, get_amadeus_service
+
 
 class BookingTool:
     """
@@ -13,15 +13,14 @@ class BookingTool:
     Wraps flight and hotel search functionality for Agent use.
     """
 
-    def __init__(self):
-        """Initialize Booking Tool"""
-        # Initialize DeepSeek client (for AI enhancement)
-        self.deepseek_client = Config.get_deepseek_client()
-
-        # Create Amadeus service
-        self.amadeus = AmadeusService(self.deepseek_client)
+    @property
+    def amadeus(self) -> AmadeusService:
+        """Process-wide Amadeus service (created, and warmed at startup, on first access)"""
+        return get_amadeus_service()
 
-        print("✅ Booking Tool Initialization Complete")
+    @property
+    def deepseek_client(self):
+        return self.amadeus.deepseek_client
 
     # ==================== Flight Search ====================
 
@@ -42,7 +41,7 @@ class BookingTool:
         Returns:
             {
                 'success': True/False,
-                'data': [...],      # List of flights
+                'data': [...],      # List of Flight models (backend.models)
                 'count': 5,         # Number of flights found
                 'message': 'Found 5 flights'
             }
@@ -53,7 +52,7 @@ class BookingTool:
             >>> if result['success']:
             >>>     print(f"Found {result['count']} flights")
             >>>     for flight in result['data']:
-            >>>         print(f"Price: ${flight['price']['total']}")
+            >>>         print(f"Price: ${flight.offer.price}")
         """
         params = {
             'origin': origin,
@@ -193,20 +192,21 @@ class BookingTool:
                 'success': True/False,
                 'cheapest_price': 500.00,
                 'currency': 'USD',
-                'message': 'Cheapest price: $500.00'
+                'message': 'Cheapest price: 500.00 USD'
             }
         """
         result = self.search_flights(origin, destination, date, max_results=5)
 
         if result['success'] and result['data']:
-            prices = [float(f['price']['total']) for f in result['data'] if 'price' in f]
-            if prices:
-                cheapest = min(prices)
+            priced = [f.offer for f in result['data'] if f.offer.price is not None]
+            if priced:
+                cheapest = min(priced, key=lambda offer: offer.price)
+                currency = cheapest.currency or 'USD'
                 return {
                     'success': True,
-                    'cheapest_price': cheapest,
-                    'currency': 'USD',
-                    'message': f"Cheapest price: ${cheapest:.2f}"
+                    'cheapest_price': float(cheapest.price),
+                    'currency': currency,
+                    'message': f"Cheapest price: {cheapest.price:.2f} {currency}"
                 }
 
         return {
@@ -7,10 +7,14 @@ from .weather_tools import WeatherTool
 from .map_tools import MapTool
 from .search_tools import SearchTool
 from .booking_tools import BookingTool
+from .transport import ToolTransport, HttpTransport, InProcessTransport
 
 __all__ = [
     'WeatherTool',
     'MapTool',
     'SearchTool',
-    'BookingTool'
+    'BookingTool',
+    'ToolTransport',
+    'HttpTransport',
+    'InProcessTransport'
 ]
\ No newline at end of file
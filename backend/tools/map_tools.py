@@ -300,25 +300,28 @@
 """
 Map Tools - Encapsulating Amap API
 """
-import requests
 import sys
 import os
 
 # Add project root directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from backend.tools.transport import ToolTransport, make_transport
+
 
 class MapTool:
     """Map Tool Class - Place Search, Route Planning"""
 
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url: str = None, transport: ToolTransport = None):
         """
         Initialize map tool
 
         Args:
-            base_url: Flask backend address
+            base_url: Flask backend address (forces HTTP transport)
+            transport: Explicit transport; defaults to in-process calls inside the backend
         """
         self.base_url = base_url
+        self.transport = transport or make_transport(base_url)
 
     def search_place(self, city: str, keyword: str) -> dict:
         """
@@ -342,8 +345,8 @@ class MapTool:
             }
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/api/map/search",
+            response = self.transport.get(
+                "/api/map/search",
                 params={
                     "city": city,
                     "keyword": keyword
@@ -436,8 +439,8 @@ class MapTool:
                     }
 
             # Plan route
-            response = requests.get(
-                f"{self.base_url}/api/map/route",
+            response = self.transport.get(
+                "/api/map/route",
                 params={
                     "origin": origin,
                     "destination": destination,
@@ -504,8 +507,8 @@ class MapTool:
             if mode:
                 params["mode"] = mode
 
-            response = requests.get(
-                f"{self.base_url}/api/map/distance",
+            response = self.transport.get(
+                "/api/map/distance",
                 params=params,
                 timeout=5
             )
@@ -14,6 +14,8 @@ Author: Zeng Jingshu
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from backend.models import Flight, Hotel, Offer, Weather, format_duration
+
 
 class ResponseFormatter:
     """Response Format Converter"""
@@ -24,7 +26,7 @@ class ResponseFormatter:
         Format flight data
         
         Args:
-            flights_data: Flight data returned by Amadeus
+            flights_data: Flight search result of AmadeusService ('data' holds Flight models)
             query_context: Query context (e.g., "flying to Tokyo")
         """
         if not flights_data.get('success') or not flights_data.get('data'):
@@ -42,45 +44,22 @@ class ResponseFormatter:
         if flights_data.get('ai_enhanced_count', 0) > 0:
             content += f" (Data for {flights_data['ai_enhanced_count']} flights was partially supplemented by AI)"
         
-        # Convert to frontend format
+        # Convert to frontend format: the Flight wire shape plus display defaults
         formatted_flights = []
         for flight in flights:
-            formatted_flight = {
-                "id": flight.get('id', 'unknown'),
-                "departure_iata": flight.get('departure', {}).get('iataCode'),
-                "arrival_iata": flight.get('arrival', {}).get('iataCode'),
-                "departure_time": flight.get('departure', {}).get('at'),
-                "arrival_time": flight.get('arrival', {}).get('at'),
-                "duration": ResponseFormatter._format_duration(flight.get('duration')),
-                "carrier_code": flight.get('carrierCode'),
-                "flight_number": str(flight.get('number', '')),
-                "aircraft_code": flight.get('aircraft'),
-                "operating_carrier": ResponseFormatter._get_airline_name(flight.get('carrierCode')),
-                "cabin_class": flight.get('cabinClass', 'ECONOMY'),
-                "currency": flight.get('price', {}).get('currency', 'USD'),
-                "total_price": float(flight.get('price', {}).get('total', 0)),
-                "base_price": float(flight.get('price', {}).get('base', 0)),
-                "grand_total": float(flight.get('price', {}).get('grandTotal', 0)),
-                "number_of_bookable_seats": 9,  # Amadeus test environment usually doesn't return this
-                "last_ticketing_date": ResponseFormatter._get_ticketing_date(),
-                "included_checked_bags": ResponseFormatter._format_baggage(
-                    flight.get('includedCheckedBags'),
-                    flight.get('cabinClass')
-                ),
-                "included_cabin_bags": "1 piece (7KG)",  # Standard value
-                "amenities": flight.get('amenities', ResponseFormatter._get_default_amenities(
-                    flight.get('carrierCode'),
-                    flight.get('cabinClass')
-                ))
-            }
-            
-            # Mark AI-enhanced data
-            if flight.get('_ai_enhanced'):
-                formatted_flight['_ai_enhanced'] = True
-                formatted_flight['_ai_fields'] = flight.get('_ai_fields', [])
-            
+            formatted_flight = flight.to_dict()
+            formatted_flight.setdefault("carrier_name", ResponseFormatter._get_airline_name(flight.carrier_code))
+            formatted_flight["included_checked_bags"] = ResponseFormatter._format_baggage(
+                flight.checked_bags,
+                flight.cabin_class
+            )
+            formatted_flight["included_cabin_bags"] = "1 piece (7KG)"  # Standard value
+            formatted_flight.setdefault("amenities", ResponseFormatter._get_default_amenities(
+                flight.carrier_code,
+                flight.cabin_class
+            ))
             formatted_flights.append(formatted_flight)
-        
+
         return {
             "action": "search_flights",
             "content": content,
@@ -113,44 +92,37 @@ class ResponseFormatter:
         if hotels_data.get('ai_enhanced'):
             content += " (Some data supplemented by AI generation)"
         
-        # Build hotel details dictionary
-        hotel_details = {}
+        # Room offers and reviews by hotel id
+        offer_by_hotel = {}
+        for offer in offers:
+            offer_data = offer.get('offers', [{}])[0]
+            offer_by_hotel[offer.get('hotel', {}).get('hotelId')] = offer_data
+
+        rating_by_hotel = {
+            review.get('hotelId'): round(review.get('overallRating', 0) / 20, 1)  # Convert to 5-star scale
+            for review in reviews
+        }
+
+        # Map each hotel into a Hotel once
+        formatted_hotels = []
         for hotel in hotels:
             hotel_id = hotel.get('hotelId')
-            hotel_details[hotel_id] = {
-                "id": hotel_id,
-                "name": hotel.get('name', 'Unknown Hotel'),
-                "location": hotel.get('address', {}).get('cityName', ''),
-                "rating": 0,  # Obtained from reviews
-                "desc": "",
-                "price": 0,
-                "nights": 0,
-                "total_price": 0,
-                "amenities": []
-            }
-        
-        # Fill in price information
-        for offer in offers:
-            hotel_id = offer.get('hotel', {}).get('hotelId')
-            if hotel_id in hotel_details:
-                offer_data = offer.get('offers', [{}])[0]
-                price = float(offer_data.get('price', {}).get('total', 0))
-                hotel_details[hotel_id]['price'] = price
-                hotel_details[hotel_id]['desc'] = offer_data.get('room', {}).get('description', {}).get('text', '')
-                
+            offer_data = offer_by_hotel.get(hotel_id, {})
+            formatted_hotels.append(Hotel(
+                id=hotel_id,
+                name=hotel.get('name', 'Unknown Hotel'),
+                location=hotel.get('address', {}).get('cityName') or None,
+                rating=rating_by_hotel.get(hotel_id, 0),
+                description=offer_data.get('room', {}).get('description', {}).get('text') or None,
+                latitude=hotel.get('geoCode', {}).get('latitude'),
+                longitude=hotel.get('geoCode', {}).get('longitude'),
+                offer=Offer(
+                    price=float(offer_data.get('price', {}).get('total', 0)),
+                    currency=offer_data.get('price', {}).get('currency')
+                ),
                 # Mark AI generation
-                if offer_data.get('_source') == 'ai_generated':
-                    hotel_details[hotel_id]['_ai_enhanced'] = True
-        
-        # Fill in review information
-        for review in reviews:
-            hotel_id = review.get('hotelId')
-            if hotel_id in hotel_details:
-                rating = review.get('overallRating', 0)
-                hotel_details[hotel_id]['rating'] = round(rating / 20, 1)  # Convert to 5-star scale
-        
-        # Convert to list
-        formatted_hotels = list(hotel_details.values())
+                ai_enhanced=True if offer_data.get('_source') == 'ai_generated' else None
+            ).to_dict())
         
         return {
             "action": "search_hotels",
@@ -180,15 +152,8 @@ class ResponseFormatter:
         content = f"The weather in {city} is {desc}, current temperature {temp}°C."
         
         # Format data
-        formatted_weather = {
-            "city_name": city,
-            "temperature": temp,
-            "feels_like": weather_data.get('temperature', temp),
-            "description": desc,
-            "humidity": weather_data.get('humidity', 50),
-            "wind_speed": weather_data.get('windspeed', 0),
-            "icon": ResponseFormatter._get_weather_icon(desc)
-        }
+        formatted_weather = Weather.from_record({**weather_data, "city": city}).to_dict()
+        formatted_weather["icon"] = ResponseFormatter._get_weather_icon(desc)
         
         return {
             "action": "get_weather",
@@ -218,27 +183,6 @@ class ResponseFormatter:
     
     # ==================== Helper Methods ====================
     
-    @staticmethod
-    def _format_duration(duration: str) -> str:
-        """
-        Format duration
-        PT4H30M → 4h 30m
-        """
-        if not duration:
-            return "unknown"
-        
-        import re
-        hours = re.search(r'(\d+)H', duration)
-        minutes = re.search(r'(\d+)M', duration)
-        
-        result = ""
-        if hours:
-            result += f"{hours.group(1)}h "
-        if minutes:
-            result += f"{minutes.group(1)}m"
-        
-        return result.strip() or "unknown"
-    
     @staticmethod
     def _get_airline_name(carrier_code: str) -> str:
         """Get airline name"""
@@ -324,17 +268,21 @@ if __name__ == "__main__":
     # Example: Format flight data
     sample_flight_data = {
         'success': True,
-        'data': [{
-            'id': 'fl_001',
-            'departure': {'iataCode': 'HKG', 'at': '2025-11-20T09:00:00'},
-            'arrival': {'iataCode': 'NRT', 'at': '2025-11-20T14:30:00'},
-            'carrierCode': 'CX',
-            'number': '504',
-            'aircraft': 'A350-900',
-            'duration': 'PT4H30M',
-            'cabinClass': 'ECONOMY',
-            'price': {'total': '450.50', 'base': '400.00', 'currency': 'USD'}
-        }],
+        'data': [Flight(
+            id='fl_001',
+            carrier_code='CX',
+            flight_number='504',
+            origin='HKG',
+            destination='NRT',
+            departure_date='2025-11-20',
+            departure_time='09:00',
+            arrival_time='14:30',
+            duration=format_duration('PT4H30M'),
+            stops=0,
+            cabin_class='ECONOMY',
+            aircraft='A350-900',
+            offer=Offer(price=450.5, currency='USD', base_price=400.0)
+        )],
         'count': 1
     }
     
@@ -0,0 +1,125 @@
+"""
+Tool Transports - How agent tools reach the map/weather endpoints
+InProcessTransport calls AmapService directly (default inside the backend);
+HttpTransport calls a remote backend over HTTP. Both return ToolResponse.
+"""
+import sys
+import os
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.config import Config
+
+
+class ToolResponse:
+    """
+    Transport-neutral response
+    Mirrors the parts of requests.Response the tools use (status_code, json()).
+    """
+
+    __slots__ = ('status_code', '_payload')
+
+    def __init__(self, status_code: int, payload: Any):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self) -> Any:
+        """Parsed body; raises ValueError when the body was not JSON"""
+        if self._payload is None:
+            raise ValueError("Response body is not JSON")
+        return self._payload
+
+
+class ToolTransport:
+    """Base transport interface"""
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None) -> ToolResponse:
+        """
+        GET a tool endpoint
+
+        Args:
+            path: Endpoint path, e.g. "/api/map/search"
+            params: Query parameters
+            timeout: Request timeout (ignored by in-process calls)
+
+        Returns:
+            ToolResponse carrying the {"code", "msg", "data"} envelope
+        """
+        raise NotImplementedError
+
+
+class HttpTransport(ToolTransport):
+    """Calls a (remote) TripPilot backend over HTTP with a keep-alive session"""
+
+    def __init__(self, base_url: str = None):
+        """
+        Initialize HTTP transport
+
+        Args:
+            base_url: Flask backend address
+        """
+        self.base_url = (base_url or Config.FLASK_BACKEND_URL).rstrip('/')
+        self.session = requests.Session()
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None) -> ToolResponse:
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=timeout)
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return ToolResponse(response.status_code, payload)
+
+
+class InProcessTransport(ToolTransport):
+    """
+    Calls AmapService directly in the current process
+    Skips JSON serialization and the socket round trip, and cannot deadlock
+    by waiting on a worker of the same server.
+    """
+
+    def __init__(self, service=None):
+        """
+        Initialize in-process transport
+
+        Args:
+            service: AmapService instance (defaults to the process-wide one)
+        """
+        if service is None:
+            from backend.maps.amap_service import get_amap_service
+            service = get_amap_service()
+        self.service = service
+        self.routes: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "/api/map/search": lambda p: service.search_place(p.get("city", ""), p.get("keyword", "")),
+            "/api/map/route": lambda p: service.plan_route(
+                p.get("origin", ""), p.get("destination", ""), p.get("mode", "driving")),
+            "/api/map/distance": lambda p: service.calculate_distance(
+                p.get("origins", ""), p.get("destination", ""), p.get("mode")),
+            "/api/weather/current": lambda p: service.current_weather(p.get("city", "")),
+            "/api/weather/forecast": lambda p: service.forecast(p.get("city", ""), int(p.get("days", 4))),
+            "/api/weather/batch": lambda p: service.weather_batch(
+                [c.strip() for c in str(p.get("cities", "")).split(",") if c.strip()], int(p.get("days", 4))),
+        }
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout=None) -> ToolResponse:
+        handler = self.routes.get(path)
+        if handler is None:
+            return ToolResponse(404, {"code": 1, "msg": f"Unknown tool endpoint: {path}", "data": None})
+
+        result = handler(params or {})
+        # Same status mapping as the HTTP routes in app.py
+        return ToolResponse(200 if result.get("code") == 0 else 502, result)
+
+
+def make_transport(base_url: str = None) -> ToolTransport:
+    """
+    Pick the transport for a tool
+
+    An explicit base_url always means HTTP. Otherwise Config.TOOL_TRANSPORT
+    decides ("inprocess" by default, "http" for tools running outside the backend).
+    """
+    if base_url or Config.TOOL_TRANSPORT == 'http':
+        return HttpTransport(base_url)
+    return InProcessTransport()
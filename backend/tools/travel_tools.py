@@ -711,8 +711,15 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import os
+import sys
 import requests
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.config import Config
+from backend.models import Flight, ForecastDay, Hotel, Offer, Weather, serialize
+from backend.utils import amenities
+
 
 class TravelTools:
     """
@@ -777,7 +784,7 @@ class TravelTools:
         }
 
     def search_hotels(self, city: str, checkin_date: str, checkout_date: str,
-                     requirements: List[str] = None) -> List[Dict]:
+                     requirements: List[str] = None) -> List[Hotel]:
         """
         Search Hotels (Enhanced)
 
@@ -790,90 +797,79 @@ class TravelTools:
         Returns:
             List of hotels, including detailed information
         """
-        hotels = []
+        records = []
 
         # Try to use Gaode API
         if self.amap_key and city:
             amap_hotels = self._search_hotels_amap(city)
-            hotels.extend(amap_hotels)
+            records.extend(amap_hotels)
 
         # Generate supplementary data
-        if len(hotels) < 10:
-            mock_hotels = self._generate_mock_hotels(city, 10 - len(hotels))
-            hotels.extend(mock_hotels)
+        if len(records) < 10:
+            mock_hotels = self._generate_mock_hotels(city, 10 - len(records))
+            records.extend(mock_hotels)
 
-        # Enhance data fields
-        for hotel in hotels:
-            # Ensure required fields exist
-            hotel['checkin_date'] = checkin_date
-            hotel['checkout_date'] = checkout_date
+        nights = self._calculate_nights(checkin_date, checkout_date)
 
-            # Calculate number of nights and total price
-            nights = self._calculate_nights(checkin_date, checkout_date)
-            hotel['nights'] = nights
-            hotel['total_price'] = hotel.get('price', 500) * nights
+        # Complete each record, then map it into a Hotel once
+        hotels = []
+        for index, record in enumerate(records):
+            price = record.get('price', 500)
+            record['checkin_date'] = checkin_date
+            record['checkout_date'] = checkout_date
+            record['nights'] = nights
+            record['total_price'] = price * nights
 
             # Generate room type information
-            if 'room_types' not in hotel:
-                hotel['room_types'] = self._generate_room_types(hotel.get('price', 500))
+            if 'room_types' not in record:
+                record['room_types'] = self._generate_room_types(price)
 
             # Ensure amenities information exists
-            if 'amenities' not in hotel:
-                hotel['amenities'] = random.sample(
+            if 'amenities' not in record:
+                record['amenities'] = random.sample(
                     self.hotel_amenities,
                     random.randint(5, 10)
                 )
 
             # Add detailed description
-            if 'description' not in hotel:
-                hotel['description'] = self._generate_hotel_description(hotel)
+            if 'description' not in record:
+                record['description'] = self._generate_hotel_description(record)
 
             # Add policy information
-            hotel['policies'] = {
+            record['policies'] = {
                 'checkin_time': '14:00',
                 'checkout_time': '12:00',
                 'cancellation': 'Free cancellation 24 hours before check-in',
                 'deposit': 'Deposit required'
             }
 
+            hotels.append(Hotel.from_record(record, index))
+
         # Filter based on requirements
         if requirements:
             hotels = self._filter_hotels_by_requirements(hotels, requirements)
 
         return hotels
 
-    def _filter_hotels_by_requirements(self, hotels: List[Dict],
-                                      requirements: List[str]) -> List[Dict]:
-        """Filter hotels based on requirements"""
-        filtered = []
-
-        for hotel in hotels:
-            amenities = hotel.get('amenities', [])
-            # Check if all requirements are met
-            meets_requirements = True
-            for req in requirements:
-                # Fuzzy matching
-                found = False
-                for amenity in amenities:
-                    if req in amenity or amenity in req:
-                        found = True
-                        break
-                if not found:
-                    meets_requirements = False
-                    break
-
-            if meets_requirements:
-                filtered.append(hotel)
-
-        return filtered
+    def _filter_hotels_by_requirements(self, hotels: List[Hotel],
+                                      requirements: List[str]) -> List[Hotel]:
+        """
+        Filter hotels based on requirements
+
+        Requirements are mapped to the canonical amenity vocabulary (EN/ZH
+        synonyms) and answered from an inverted amenity index, one AND of
+        posting bitsets per requirement; only terms outside the vocabulary
+        fall back to fuzzy text matching.
+        """
+        return amenities.AmenityIndex(hotels).having(*requirements)
 
     def search_flights(self, origin: str, destination: str,
-                      departure_date: str, cabin_class: str = 'ECONOMY') -> List[Dict]:
+                      departure_date: str, cabin_class: str = 'ECONOMY') -> List[Flight]:
         """
         Search Flights (Fixed Version)
 
         Returns:
-            Standardized list of flight data
+            Flights sorted by departure time
         """
         flights = []
 
@@ -905,53 +901,31 @@ class TravelTools:
             else:
                 price = base_price
 
-            flight = {
-                # Basic Info
-                'carrier_code': airline_code,
-                'carrier_name': airline_name,
-                'flight_number': flight_number,
-
-                # Airport Info
-                'departure_iata': origin[:3].upper(),
-                'arrival_iata': destination[:3].upper(),
-                'departure_airport': f"{origin} Airport",
-                'arrival_airport': f"{destination} Airport",
-
-                # Time Info (Fixed format)
-                'departure': departure_time.strftime("%H:%M"),
-                'arrival': arrival_time.strftime("%H:%M"),
-                'departure_time': departure_time.isoformat(),
-                'arrival_time': arrival_time.isoformat(),
-                'duration': f"{flight_duration.seconds//3600}h {(flight_duration.seconds%3600)//60}m",
-
-                # Cabin and Aircraft Type
-                'cabin_class': cabin_class,
-                'aircraft_code': random.choice(self.aircraft_types),
-
-                # Price Info
-                'base_price': price,
-                'total_price': price,
-                'currency': 'CNY',
-
-                # Other Info
-                'number_of_bookable_seats': random.randint(5, 30),
-                'included_checked_bags': '1 piece 23kg' if cabin_class == 'ECONOMY' else '2 pieces 32kg',
-                'included_cabin_bags': '1 piece 7kg',
-                'last_ticketing_date': (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d"),
-
-                # Flight Status
-                'status': 'Normal',
-                'on_time_rate': f"{random.randint(70, 95)}%"
-            }
-
-            flights.append(flight)
+            flights.append(Flight(
+                id=f"flight_{i+1:03d}",
+                carrier_code=airline_code,
+                carrier_name=airline_name,
+                flight_number=flight_number,
+                origin=origin[:3].upper(),
+                destination=destination[:3].upper(),
+                departure_date=departure_date,
+                departure_time=departure_time.strftime("%H:%M"),
+                arrival_time=arrival_time.strftime("%H:%M"),
+                duration=f"{flight_duration.seconds//3600}h {(flight_duration.seconds%3600)//60}m",
+                stops=0,
+                cabin_class=cabin_class,
+                aircraft=random.choice(self.aircraft_types),
+                available_seats=random.randint(5, 30),
+                checked_bags=1 if cabin_class == 'ECONOMY' else 2,
+                offer=Offer(price=price, currency='CNY', base_price=price)
+            ))
 
         # Sort by departure time
-        flights.sort(key=lambda x: x['departure_time'])
+        flights.sort(key=lambda flight: flight.departure_time)
 
         return flights
 
-    def get_weather(self, city: str) -> Dict:
+    def get_weather(self, city: str) -> Weather:
         """Get Weather Information"""
         try:
             # If Gaode API key exists, use real weather
@@ -963,27 +937,25 @@ class TravelTools:
         # Mock weather data
         weather_conditions = ['Sunny', 'Cloudy', 'Overcast', 'Light Rain', 'Fog']
 
-        return {
-            'success': True,
-            'city': city,
-            'current': {
-                'temperature': random.randint(10, 30),
-                'weather': random.choice(weather_conditions),
-                'humidity': random.randint(40, 80),
-                'wind_speed': random.randint(1, 5),
-                'feels_like': random.randint(8, 32)
-            },
-            'forecast': [
-                {
-                    'date': (datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d"),
-                    'day_weather': random.choice(weather_conditions),
-                    'night_weather': random.choice(weather_conditions),
-                    'day_temp': random.randint(15, 30),
-                    'night_temp': random.randint(10, 20)
-                }
+        temperature = random.randint(10, 30)
+        return Weather(
+            city=city,
+            temperature=temperature,
+            feels_like=temperature + random.randint(-2, 2),
+            weather=random.choice(weather_conditions),
+            humidity=random.randint(40, 80),
+            wind_speed=f"{random.randint(1, 5)} m/s",
+            forecast=tuple(
+                ForecastDay(
+                    date=(datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d"),
+                    temp_high=random.randint(15, 30),
+                    temp_low=random.randint(10, 20),
+                    weather=random.choice(weather_conditions)
+                )
                 for i in range(1, 4)
-            ]
-        }
+            ),
+            source='mock'
+        )
 
     def search_attractions(self, city: str) -> List[Dict]:
         """Search Attractions"""
@@ -1177,11 +1149,11 @@ class TravelTools:
             'total_budget': budget,
             'budget_allocation': budget_allocation,
             'daily_plans': daily_plans,
-            'recommended_hotels': hotels[:3],
+            'recommended_hotels': serialize(hotels[:3]),
             'must_visit': attractions[:5],
             'estimated_cost': budget * 0.9,
             'recommendations': [
-                f"Suggested to book {hotels[0]['name']} in advance",
+                f"Suggested to book {hotels[0].name} in advance",
                 f"Must-visit attraction: {attractions[0]['name']}",
                 "Remember to taste local specialty cuisine",
                 "Suggested to purchase a city tourist card"
@@ -1283,7 +1255,7 @@ class TravelTools:
     def _search_hotels_amap(self, city: str) -> List[Dict]:
         """Use Gaode Maps API to search for hotels"""
         try:
-            url = "https://restapi.amap.com/v3/place/text"
+            url = f"{Config.GAODE_BASE_URL}/v3/place/text"
             params = {
                 'key': self.amap_key,
                 'keywords': 'Hotel',
@@ -1315,10 +1287,10 @@ class TravelTools:
 
         return []
 
-    def _get_weather_amap(self, city: str) -> Dict:
+    def _get_weather_amap(self, city: str) -> Weather:
         """Use Gaode Maps API to get weather"""
         try:
-            url = "https://restapi.amap.com/v3/weather/weatherInfo"
+            url = f"{Config.GAODE_BASE_URL}/v3/weather/weatherInfo"
             params = {
                 'key': self.amap_key,
                 'city': city,
@@ -1332,26 +1304,23 @@ class TravelTools:
                     forecast = data['forecasts'][0]
                     current = forecast['casts'][0] if forecast.get('casts') else {}
 
-                    return {
-                        'success': True,
-                        'city': forecast['city'],
-                        'current': {
-                            'temperature': current.get('daytemp', 20),
-                            'weather': current.get('dayweather', 'Sunny'),
-                            'humidity': random.randint(40, 80),
-                            'wind_speed': current.get('daypower', '≤3')
-                        },
-                        'forecast': [
-                            {
-                                'date': cast['date'],
-                                'day_weather': cast['dayweather'],
-                                'night_weather': cast['nightweather'],
-                                'day_temp': cast['daytemp'],
-                                'night_temp': cast['nighttemp']
-                            }
+                    return Weather(
+                        city=forecast['city'],
+                        temperature=float(current.get('daytemp', 20)),
+                        weather=current.get('dayweather', 'Sunny'),
+                        wind_speed=current.get('daypower', '≤3'),
+                        forecast=tuple(
+                            ForecastDay(
+                                date=cast['date'],
+                                temp_high=float(cast['daytemp']),
+                                temp_low=float(cast['nighttemp']),
+                                weather=cast['dayweather'],
+                                description=f"{cast['dayweather']} / {cast['nightweather']}"
+                            )
                             for cast in forecast.get('casts', [])[:3]
-                        ]
-                    }
+                        ),
+                        source='amap'
+                    )
         except Exception as e:
             print(f"Weather API call failed: {e}")
 
@@ -1372,8 +1341,8 @@ if __name__ == "__main__":
     )
     print(f"Found {len(hotels)} hotels matching criteria")
     if hotels:
-        print(f"First hotel: {hotels[0]['name']}")
-        print(f"  Amenities: {hotels[0]['amenities']}")
+        print(f"First hotel: {hotels[0].name}")
+        print(f"  Amenities: {', '.join(hotels[0].amenities)}")
 
     # Test flight search
     print("\nTesting Flight Search:")
@@ -1381,9 +1350,9 @@ if __name__ == "__main__":
     print(f"Found {len(flights)} flights")
     if flights:
         flight = flights[0]
-        print(f"First flight: {flight['carrier_code']}{flight['flight_number']}")
-        print(f"  Time: {flight['departure']} -> {flight['arrival']}")
-        print(f"  Price: ¥{flight['total_price']}")
+        print(f"First flight: {flight.flight_number}")
+        print(f"  Time: {flight.departure_time} -> {flight.arrival_time}")
+        print(f"  Price: ¥{flight.offer.price}")
 
     # Test ticket query
     print("\nTesting Ticket Query:")
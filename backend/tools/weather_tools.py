@@ -152,58 +152,104 @@ Fixes issues with API response format handling.
 import requests
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from backend.tools.transport import ToolTransport, make_transport
+from config.config import Config
+
+# Current/forecast requests (and batch cities) are issued side by side on this pool
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="weather-tool")
+
 
 class WeatherTool:
     """Weather Query Tool Class"""
 
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url: str = None, transport: ToolTransport = None):
         """
         Initialize Weather Tool
         Args:
-            base_url: Flask backend address
+            base_url: Flask backend address (forces HTTP transport)
+            transport: Explicit transport; defaults to in-process calls inside the backend
         """
         self.base_url = base_url
+        self.transport = transport or make_transport(base_url)
 
     def get_weather(self, city: str) -> dict:
         """
-        Query City Weather - Fixed Version
+        Query City Weather - current conditions and forecast fetched concurrently
         """
+        return self._collect(city, *self._submit(city))
+
+    def get_weather_batch(self, cities: list) -> dict:
+        """
+        Query weather for several cities (e.g. a multi-city trip) in one request
+
+        Returns:
+            {city: result in the same shape as get_weather(city)}
+        """
+        cities = list(dict.fromkeys(cities))
         try:
-            # 1. Get current weather
-            response = requests.get(
-                f"{self.base_url}/api/weather/current",
-                params={"city": city},
-                timeout=5
+            response = self.transport.get(
+                "/api/weather/batch",
+                params={"cities": ",".join(cities), "days": 3},
+                timeout=(Config.WEATHER_HTTP_TIMEOUT[0], Config.WEATHER_FETCH_TIMEOUT)
             )
+            data = response.json() if response.status_code == 200 else {}
+        except Exception:
+            data = {}
+
+        if data.get("code") != 0:
+            # Batch endpoint unavailable: fall back to concurrent per-city requests, all under one deadline
+            deadline = time.monotonic() + Config.WEATHER_FETCH_TIMEOUT
+            pending = {city: self._submit(city) for city in cities}
+            return {city: self._collect(city, *futures, deadline=deadline) for city, futures in pending.items()}
+
+        results = {}
+        for city in cities:
+            fused = data.get("data", {}).get(city) or {"error": "No data"}
+            if "error" in fused:
+                results[city] = {'error': fused["error"], 'success': False}
+                continue
+            live = fused.get("live", {})
+            results[city] = {
+                'temperature': live.get('temperature', 'N/A'),
+                'description': live.get('description', 'N/A'),
+                'humidity': live['humidity'] if live.get('humidity') is not None else 'N/A',
+                'wind_speed': live.get('wind_speed', 'N/A'),
+                'city': fused.get('city', city),
+                'forecast': fused.get('forecast', []),
+                'success': True
+            }
+        return results
+
+    def _submit(self, city: str) -> tuple:
+        """Start the current and forecast requests for a city"""
+        return (
+            _EXECUTOR.submit(self._get, "/api/weather/current", {"city": city}),
+            _EXECUTOR.submit(self._get, "/api/weather/forecast", {"city": city, "days": 3})
+        )
+
+    def _collect(self, city: str, current_future, forecast_future, deadline: float = None) -> dict:
+        """
+        Build the get_weather result from the two in-flight requests
+
+        Args:
+            deadline: time.monotonic() by which both must be done (default: WEATHER_FETCH_TIMEOUT from now)
+        """
+        if deadline is None:
+            deadline = time.monotonic() + Config.WEATHER_FETCH_TIMEOUT
+        try:
+            response = current_future.result(timeout=max(0.0, deadline - time.monotonic()))
 
             if response.status_code == 200:
                 data = response.json()
 
                 if data.get("code") == 0:
                     weather_data = data.get("data", {})
-
-                    # 2. Get weather forecast
-                    forecast_response = requests.get(
-                        f"{self.base_url}/api/weather/forecast",
-                        params={"city": city, "days": 3},
-                        timeout=5
-                    )
-
-                    forecast = []
-                    if forecast_response.status_code == 200:
-                        forecast_data = forecast_response.json()
-                        if forecast_data.get("code") == 0:
-                            # Fix: Correctly retrieve forecast data
-                            forecast_list = forecast_data.get("data", [])
-                            # If data is a list, use it directly
-                            if isinstance(forecast_list, list):
-                                forecast = forecast_list
-                            # If data is a dictionary, it might contain a 'forecasts' field
-                            elif isinstance(forecast_list, dict):
-                                forecast = forecast_list.get("forecasts", [])
+                    forecast = self._parse_forecast(forecast_future, deadline)
 
                     # Consolidate and return data
                     return {
@@ -226,7 +272,7 @@ class WeatherTool:
                     'success': False
                 }
 
-        except requests.exceptions.Timeout:
+        except (requests.exceptions.Timeout, FutureTimeoutError):
             return {
                 'error': 'Request timed out, please try again later',
                 'success': False
@@ -237,6 +283,31 @@ class WeatherTool:
                 'success': False
             }
 
+    def _get(self, path: str, params: dict):
+        """GET a backend endpoint through the tool transport"""
+        return self.transport.get(path, params=params, timeout=Config.WEATHER_HTTP_TIMEOUT)
+
+    def _parse_forecast(self, forecast_future, deadline: float) -> list:
+        """Forecast list from the forecast request; empty if it failed or missed the deadline"""
+        try:
+            forecast_response = forecast_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:
+            return []
+
+        forecast = []
+        if forecast_response.status_code == 200:
+            forecast_data = forecast_response.json()
+            if forecast_data.get("code") == 0:
+                # Fix: Correctly retrieve forecast data
+                forecast_list = forecast_data.get("data", [])
+                # If data is a list, use it directly
+                if isinstance(forecast_list, list):
+                    forecast = forecast_list
+                # If data is a dictionary, it might contain a 'forecasts' field
+                elif isinstance(forecast_list, dict):
+                    forecast = forecast_list.get("forecasts", [])
+        return forecast
+
     def get_forecast_summary(self, city: str, days: int = 3) -> str:
         """
         Get weather forecast summary (plain text) - Fixed Version
@@ -0,0 +1,8 @@
+"""
+Utils Module - Shared backend infrastructure
+Request coalescing, caching and other helpers used by the agent and provider clients.
+"""
+from .singleflight import SingleFlight
+from .cache import TTLCache
+
+__all__ = ['SingleFlight', 'TTLCache']
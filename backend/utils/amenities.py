@@ -0,0 +1,165 @@
+"""
+Amenity Vocabulary
+Free-form amenity strings ("Free WiFi", "免费WiFi", "Swimming Pool", "泳池")
+are normalized once into a canonical vocabulary and stored as an integer
+bitmask, so "has all of these amenities" is one AND per hotel:
+
+    required = requirement_mask(["Parking", "游泳池"]).mask
+    hotels = [h for h in hotels if hotel_mask(h) & required == required]
+
+AmenityIndex inverts this into per-amenity posting bitsets, so "which hotels
+have X and Y" is an AND of a few integers (TravelTools and the result-set
+candidate table filter through it).
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+# Canonical amenity -> synonyms (EN and ZH, matched case-insensitively as substrings)
+AMENITY_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "wifi": ("wifi", "wi-fi", "wlan", "wireless internet", "internet", "无线网络", "无线上网", "宽带"),
+    "parking": ("parking", "car park", "停车场", "停车"),
+    "pool": ("swimming pool", "pool", "游泳池", "泳池"),
+    "gym": ("gym", "fitness", "健身房", "健身中心", "健身"),
+    "breakfast": ("breakfast", "早餐", "早点"),
+    "business_center": ("business center", "business centre", "商务中心"),
+    "laundry": ("laundry", "dry cleaning", "洗衣"),
+    "restaurant": ("restaurant", "dining", "餐厅", "餐饮"),
+    "bar": ("bar", "lounge", "酒吧"),
+    "spa": ("spa", "sauna", "massage", "水疗", "桑拿", "按摩"),
+    "front_desk_24h": ("24-hour front desk", "24 hour front desk", "24h front desk", "24-hour reception",
+                       "24小时前台", "24小时服务"),
+    "luggage_storage": ("luggage storage", "baggage storage", "行李寄存", "行李存放"),
+    "non_smoking": ("non-smoking", "non smoking", "smoke-free", "无烟", "禁烟"),
+    "family": ("children", "kids", "family", "儿童", "亲子", "家庭"),
+    "air_conditioning": ("air conditioning", "air-conditioning", "a/c", "空调"),
+    "airport_shuttle": ("airport shuttle", "airport transfer", "shuttle", "机场接送", "接机", "班车"),
+    "pet_friendly": ("pet friendly", "pets allowed", "pet-friendly", "宠物"),
+    "accessible": ("wheelchair", "accessible", "accessibility", "无障碍"),
+}
+
+CANONICAL_AMENITIES: Tuple[str, ...] = tuple(AMENITY_SYNONYMS)
+AMENITY_BITS: Dict[str, int] = {name: 1 << position for position, name in enumerate(CANONICAL_AMENITIES)}
+
+_SYNONYM_TO_CANONICAL = {synonym: name for name, synonyms in AMENITY_SYNONYMS.items() for synonym in synonyms}
+# Longest synonym first, so "swimming pool" wins over "pool" and "24-hour front desk" over "desk"
+_SYNONYMS = sorted(_SYNONYM_TO_CANONICAL, key=len, reverse=True)
+
+
+def _synonym_regex(synonym: str) -> str:
+    """
+    Latin synonyms match whole words, plural allowed ("spa" not in "spacious",
+    "bar" not in "barbecue"); the boundary is ASCII so "免费wifi" still matches
+    """
+    regex = re.escape(synonym)
+    if synonym[0].isascii() and synonym[0].isalnum():
+        regex = r"(?<![a-z0-9])" + regex
+    if synonym[-1].isascii() and synonym[-1].isalnum():
+        regex += r"(?:e?s)?(?![a-z0-9])"
+    return regex
+
+
+# One group per synonym, in _SYNONYMS order (match.lastindex - 1 is the synonym's position)
+_SYNONYM_PATTERN = re.compile("|".join(f"({_synonym_regex(synonym)})" for synonym in _SYNONYMS))
+# "no parking", "without breakfast", "不含早餐": the amenity is explicitly absent
+_NEGATION = re.compile(r"(?:(?<![a-z])(?:no|not|without)\s+|无|不含|没有|不提供)$")
+
+
+@lru_cache(maxsize=4096)
+def text_mask(text: str) -> int:
+    """Bitmask of every canonical amenity mentioned in one amenity string (0 if none)"""
+    text = str(text).casefold()
+    mask = 0
+    for match in _SYNONYM_PATTERN.finditer(text):
+        if _NEGATION.search(text, 0, match.start()):
+            continue
+        mask |= AMENITY_BITS[_SYNONYM_TO_CANONICAL[_SYNONYMS[match.lastindex - 1]]]
+    return mask
+
+
+def amenity_mask(amenities: Iterable[str]) -> int:
+    """Bitmask of a hotel's amenity list"""
+    mask = 0
+    for amenity in amenities or ():
+        mask |= text_mask(amenity)
+    return mask
+
+
+def _hotel_amenities(hotel: Any) -> Iterable[str]:
+    """Amenity strings of a hotel dict or Hotel model"""
+    return hotel.get("amenities") if isinstance(hotel, dict) else hotel.amenities
+
+
+def hotel_mask(hotel: Any) -> int:
+    """A hotel's amenity bitmask (the hotel is not modified; amenity strings are cached by text_mask)"""
+    return amenity_mask(_hotel_amenities(hotel))
+
+
+def names(mask: int) -> List[str]:
+    """Canonical amenities set in a mask"""
+    return [name for name, bit in AMENITY_BITS.items() if mask & bit]
+
+
+class Requirements(NamedTuple):
+    mask: int                # Canonical amenities that must all be present
+    unmatched: List[str]     # Requirements outside the vocabulary (fall back to text matching)
+
+
+def requirement_mask(requirements: Iterable[str]) -> Requirements:
+    """Split user requirements into a required bitmask and the terms the vocabulary doesn't know"""
+    mask, unmatched = 0, []
+    for requirement in requirements or ():
+        bits = text_mask(requirement)
+        if bits:
+            mask |= bits
+        elif str(requirement).strip():
+            unmatched.append(str(requirement).casefold())
+    return Requirements(mask, unmatched)
+
+
+def has_text(hotel: Any, requirement: str) -> bool:
+    """Fuzzy fallback for a requirement outside the vocabulary (either string contains the other)"""
+    return any(requirement in amenity or amenity in requirement
+               for amenity in (str(a).casefold() for a in _hotel_amenities(hotel) or ()))
+
+
+class AmenityIndex:
+    """
+    Inverted index over a fixed list of hotels (dicts or Hotel models)
+
+    Each canonical amenity maps to a posting bitset (bit i = hotels[i] has it),
+    so hotels having several amenities is an AND of a few integers.
+    """
+
+    def __init__(self, hotels: List[Any]):
+        self.hotels = hotels
+        self.postings: Dict[str, int] = dict.fromkeys(CANONICAL_AMENITIES, 0)
+        for position, hotel in enumerate(hotels):
+            for amenity in _bit_positions(hotel_mask(hotel)):
+                self.postings[CANONICAL_AMENITIES[amenity]] |= 1 << position
+
+    def bitset(self, mask: int) -> int:
+        """Bitset of the hotels having every amenity in a requirement mask (bit i = hotels[i])"""
+        selected = (1 << len(self.hotels)) - 1
+        for amenity in _bit_positions(mask):
+            selected &= self.postings[CANONICAL_AMENITIES[amenity]]
+        return selected
+
+    def having(self, *amenities: str) -> List[Any]:
+        """
+        Hotels having every given amenity, in index order
+
+        Canonical names and free-form synonyms are answered from the postings;
+        terms outside the vocabulary fall back to has_text on the hotels left.
+        """
+        required = requirement_mask(amenities)
+        selected = self.bitset(required.mask)
+        return [hotel for hotel in (self.hotels[position] for position in _bit_positions(selected))
+                if all(has_text(hotel, term) for term in required.unmatched)]
+
+
+def _bit_positions(bits: int) -> Iterable[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
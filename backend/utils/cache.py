@@ -0,0 +1,122 @@
+"""
+TTL Cache
+Thread-safe, size-bounded in-process cache with per-entry expiry.
+Loads on a miss are coalesced so a cold key triggers one provider call.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    TTL Cache with LRU eviction
+    Entries expire after their TTL; when maxsize is reached the least
+    recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or default when missing or expired"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return a live entry or _MISSING (caller holds the lock)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an entry (ttl overrides the cache default)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Get an entry, loading and storing it on a miss
+
+        Concurrent misses for the same key share one loader call. Exceptions
+        from the loader propagate and nothing is stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def load():
+            # A flight that finished between our miss and this call may have filled it
+            with self._lock:
+                cached = self._lookup(key)
+            if cached is not _MISSING:
+                return cached
+            loaded = loader()
+            self.set(key, loaded, ttl)
+            return loaded
+
+        return self._loads.do(key, load)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self) -> List[Tuple[Hashable, Any, float]]:
+        """Live entries as (key, value, remaining ttl), least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value, expires_at - now)
+                    for key, (value, expires_at) in self._data.items() if expires_at > now]
+
+    def restore(self, entries: List[Tuple[Hashable, Any, float]]) -> int:
+        """Load entries from snapshot() (keeps their remaining ttl); returns how many were live"""
+        restored = 0
+        for key, value, remaining in entries:
+            if remaining > 0:
+                self.set(key, value, remaining)
+                restored += 1
+        return restored
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,221 @@
+"""
+Candidate Table
+Columnar view over a list of hotel/flight candidates. Numeric fields live in
+NumPy arrays (NaN when missing) and low-cardinality strings as interned
+codes, so filters, sorts and top-k are array operations that return row
+indices; the original dicts are only picked out at the API boundary.
+
+    table = CandidateTable(hotels)
+    selected = table.where(price__le=600, rating__ge=4)
+    rows = table.rows(table.top_k(selected, "-rating", 5))
+
+Rows are shared, not copied: callers must treat them as read-only.
+"""
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from . import amenities
+
+_DURATION_PATTERN = re.compile(
+    r"(?:(?P<h>\d+(?:\.\d+)?)\s*(?:hours|hour|hrs|hr|h|小时))?\s*(?:(?P<m>\d+)\s*(?:minutes|minute|mins|min|m|分钟|分))?",
+    re.IGNORECASE,
+)
+_CLOCK_PATTERN = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+# ==================== Field Parsers ====================
+
+def _float(value: Any) -> float:
+    if isinstance(value, bool):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").lstrip("¥$€"))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _price(item: Dict) -> float:
+    value = item.get("price", item.get("total_price"))
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+
+def _minutes(value: Any) -> float:
+    """Duration in minutes: 150, "2h 30m", "2 hours 30 minutes", "2小时30分钟" or ISO "PT2H30M" """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value or "").strip()
+    if text.upper().startswith("PT"):
+        text = text[2:]
+    match = _DURATION_PATTERN.match(text)
+    if not text or not match or not (match.group("h") or match.group("m")):
+        return np.nan
+    return float(match.group("h") or 0) * 60 + float(match.group("m") or 0)
+
+
+def _clock_minutes(value: Any) -> float:
+    """Minutes after midnight of "HH:MM" or an ISO datetime"""
+    match = _CLOCK_PATTERN.search(str(value or ""))
+    return float(int(match.group(1)) * 60 + int(match.group(2))) if match else np.nan
+
+
+def _coordinate(item: Dict, axis: int) -> float:
+    """Latitude (axis 1) / longitude (axis 0): explicit fields, else an Amap style "lng,lat" location"""
+    value = item.get(("longitude", "latitude")[axis], item.get(("lng", "lat")[axis]))
+    if value is not None:
+        return _float(value)
+    parts = str(item.get("location") or "").split(",")
+    return _float(parts[axis]) if len(parts) == 2 else np.nan
+
+
+# Numeric column -> extractor; missing or malformed values become NaN
+NUMERIC_COLUMNS: Dict[str, Callable[[Dict], float]] = {
+    "price": _price,
+    "rating": lambda item: _float(item["rating"]) if "rating" in item else np.nan,
+    "latitude": lambda item: _coordinate(item, 1),
+    "longitude": lambda item: _coordinate(item, 0),
+    "duration": lambda item: _minutes(item.get("duration")),
+    "stops": lambda item: _float(item["stops"]) if "stops" in item else np.nan,
+    "departure": lambda item: _clock_minutes(item.get("departure_time")),
+}
+
+# String columns, compared case-insensitively
+STRING_COLUMNS = ("carrier_code", "carrier_name", "cabin_class")
+
+
+# ==================== Table ====================
+
+class StringColumn:
+    """Interned string column: one int32 code per row, -1 when missing"""
+
+    def __init__(self, values: Iterable[Any]):
+        self.vocabulary: List[str] = []
+        self._codes: Dict[str, int] = {}
+        codes = []
+        for value in values:
+            if value in (None, ""):
+                codes.append(-1)
+                continue
+            key = sys.intern(str(value).casefold())
+            code = self._codes.get(key)
+            if code is None:
+                code = self._codes[key] = len(self.vocabulary)
+                self.vocabulary.append(key)
+            codes.append(code)
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+    def equals(self, value: str) -> np.ndarray:
+        code = self._codes.get(str(value).casefold(), -2)
+        return self.codes == code
+
+
+class CandidateTable:
+    """Immutable columnar snapshot of candidate dicts"""
+
+    def __init__(self, items: List[Dict]):
+        self.items = [item for item in items if isinstance(item, dict)]
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.fromiter((extract(item) for item in self.items), dtype=np.float64, count=len(self.items))
+            for name, extract in NUMERIC_COLUMNS.items()
+        }
+        self.strings: Dict[str, StringColumn] = {
+            name: StringColumn(item.get(name) for item in self.items) for name in STRING_COLUMNS
+        }
+        self.amenity_index = amenities.AmenityIndex(self.items)
+        self._ids: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def all(self) -> np.ndarray:
+        return np.ones(len(self.items), dtype=bool)
+
+    def where(self, selected: Optional[np.ndarray] = None, **conditions: float) -> np.ndarray:
+        """
+        Boolean row mask of numeric conditions, ANDed with an optional mask
+
+        Args:
+            conditions: <column>__<op>=value with op in lt, le, gt, ge, eq;
+                rows missing the column never match
+
+        Returns:
+            Boolean array, one entry per row
+        """
+        mask = self.all() if selected is None else selected.copy()
+        for condition, value in conditions.items():
+            name, _, op = condition.rpartition("__")
+            column = self._column(name)
+            compare = {"lt": np.less, "le": np.less_equal, "gt": np.greater,
+                       "ge": np.greater_equal, "eq": np.equal}.get(op)
+            if compare is None:
+                raise ValueError(f"unknown comparison: {condition}")
+            with np.errstate(invalid="ignore"):
+                mask &= compare(column, value)
+        return mask
+
+    def equals(self, name: str, value: str) -> np.ndarray:
+        """Boolean row mask of a case-insensitive string column match"""
+        if name not in self.strings:
+            raise ValueError(f"unknown string column: {name}")
+        return self.strings[name].equals(value)
+
+    def has_amenities(self, required: int) -> np.ndarray:
+        """Boolean row mask of rows having every amenity in the `required` bitmask (from the inverted index)"""
+        bits = self.amenity_index.bitset(required)
+        packed = np.frombuffer(bits.to_bytes((len(self.items) + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, count=len(self.items), bitorder="little").astype(bool)
+
+    def order(self, selected: np.ndarray, sort: str) -> np.ndarray:
+        """
+        Indices of the selected rows, sorted by a column ("-column" for descending)
+
+        The sort is stable and rows missing the column go last.
+        """
+        indices = np.flatnonzero(selected)
+        if not sort:
+            return indices
+        descending = sort.startswith("-")
+        values = self._column(sort.lstrip("-"))[indices]
+        missing = np.isnan(values)
+        keys = -values if descending else values
+        # lexsort: last key is primary -> missing flag first, then the value, ties keep row order
+        return indices[np.lexsort((keys, missing))]
+
+    def top_k(self, selected: np.ndarray, sort: str, k: int) -> np.ndarray:
+        """First k indices of order(selected, sort), without sorting the whole selection"""
+        indices = np.flatnonzero(selected)
+        if k >= len(indices) or not sort:
+            return self.order(selected, sort)[:k]
+        descending = sort.startswith("-")
+        values = self._column(sort.lstrip("-"))[indices]
+        keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+        # Every row tied with the k-th key is a candidate, so ties are broken by row order as in order()
+        kth = np.partition(keys, k - 1)[k - 1]
+        nearest = np.flatnonzero(keys <= kth)
+        nearest = nearest[np.lexsort((nearest, keys[nearest]))][:k]
+        return indices[nearest]
+
+    def rows(self, indices: Iterable[int]) -> List[Dict]:
+        """The candidate dicts at the given indices or boolean row mask (shared, not copied)"""
+        if isinstance(indices, np.ndarray) and indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return [self.items[index] for index in indices]
+
+    def find(self, item_id: str) -> Optional[Dict]:
+        """The candidate dict with this id, None if there is none (id index built on first lookup)"""
+        if self._ids is None:
+            self._ids = {}
+            for row, item in enumerate(self.items):
+                self._ids.setdefault(str(item.get("id")), row)
+        row = self._ids.get(str(item_id))
+        return None if row is None else self.items[row]
+
+    def _column(self, name: str) -> np.ndarray:
+        column = self.columns.get(name)
+        if column is None:
+            raise ValueError(f"unknown column: {name}")
+        return column
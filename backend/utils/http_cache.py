@@ -0,0 +1,97 @@
+"""
+HTTP Response Caching Helpers
+JSON responses with ETag / Cache-Control headers, 304 revalidation and
+compression (brotli when the brotli package is installed, else gzip).
+"""
+import gzip
+import hashlib
+import importlib.util
+from typing import Any
+
+from flask import Response, request
+
+from . import serialization
+
+# Bodies smaller than this are sent uncompressed (compression overhead outweighs the savings)
+GZIP_MIN_SIZE = 512
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5  # 0-11; 4-6 is the usual speed/size balance for dynamic responses
+
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+if BROTLI_AVAILABLE:
+    import brotli
+
+# Streams are flushed event by event and must not be buffered for compression
+_UNCOMPRESSED_MIMETYPES = ("text/event-stream",)
+
+
+def cached_json_response(payload: Any, max_age: int = 0, status: int = 200) -> Response:
+    """
+    Build a JSON response with HTTP caching headers
+
+    Args:
+        payload: JSON-serializable body
+        max_age: Cache-Control max-age in seconds (0 = revalidate every time)
+        status: HTTP status code; non-200 responses are marked no-store
+
+    Returns:
+        Flask Response (304 when the client's If-None-Match matches)
+    """
+    body = serialization.dumps(payload)
+
+    if status != 200:
+        response = Response(body, status=status, mimetype='application/json')
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    etag = hashlib.sha1(body).hexdigest()
+    cache_control = f'public, max-age={max_age}' if max_age else 'no-cache'
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+    response = Response(body, status=status, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return compress_response(response)
+
+
+def _accepts(encoding: str) -> bool:
+    """Whether Accept-Encoding lists the encoding (and does not refuse it with q=0)"""
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() == encoding:
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+
+def compress_response(response: Response) -> Response:
+    """Brotli- or gzip-encode a response body in place if the client accepts it and it is large enough"""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype in _UNCOMPRESSED_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or response.status_code in (204, 206, 304)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if BROTLI_AVAILABLE and _accepts('br'):
+        encoding = 'br'
+    elif _accepts('gzip'):
+        encoding = 'gzip'
+    else:
+        return response
+
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = encoding
+    return response
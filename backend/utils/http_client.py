@@ -0,0 +1,260 @@
+"""
+Outbound HTTP Client
+Shared requests sessions for provider calls (DeepSeek, Amadeus, Amap) with an
+optional record/replay cassette layer for deterministic benchmark runs.
+
+Cassette modes (Config.PROVIDER_CASSETTE_MODE):
+    off     - normal network calls
+    record  - network calls, each request/response pair saved (gzip) to disk
+    replay  - no network; recorded responses served at recorded or zero latency
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config.config import Config
+from . import metrics, tracing
+
+# Never part of the match key; redacted in recorded request and response bodies before they are written
+SECRET_FIELDS = {"key", "client_id", "client_secret", "access_token", "refresh_token", "api_key"}
+REDACTED = "REDACTED"
+
+# Response headers never written to a cassette
+SECRET_HEADERS = {"set-cookie", "authorization"}
+
+# Request body fields that vary between runs without changing the answer
+VOLATILE_BODY_FIELDS = {"stream_options", "user"}
+
+
+def build_session(provider: str, pool_size: int = 20) -> requests.Session:
+    """
+    Create a keep-alive session for one provider
+
+    Args:
+        provider: Provider name, used as the cassette sub-directory
+        pool_size: Connections kept per host (match the server's thread count)
+
+    Returns:
+        requests.Session; in record/replay mode its adapter goes through the cassette
+    """
+    mode = Config.PROVIDER_CASSETTE_MODE
+    session = requests.Session()
+
+    if mode in ("record", "replay"):
+        cassette = Cassette(os.path.join(Config.PROVIDER_CASSETTE_DIR, provider))
+        adapter = CassetteAdapter(provider, cassette, mode, Config.PROVIDER_CASSETTE_LATENCY,
+                                  pool_connections=4, pool_maxsize=pool_size)
+    else:
+        adapter = ProviderAdapter(provider, pool_connections=4, pool_maxsize=pool_size)
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ProviderAdapter(HTTPAdapter):
+    """HTTPAdapter that records per-call latency under the provider's name"""
+
+    def __init__(self, provider: str, **kwargs):
+        super().__init__(**kwargs)
+        self.provider = provider
+
+    def send(self, request, **kwargs):
+        path = urlsplit(request.url).path
+        start = time.perf_counter()
+        status = "error"
+        with tracing.child_span(f"{self.provider} {request.method} {path}", kind="client") as span:
+            tracing.inject(request.headers)
+            try:
+                response = self._send(request, **kwargs)
+                status = str(response.status_code)
+                return response
+            finally:
+                if span is not None:
+                    span.set_attribute("http.status", status)
+                metrics.observe_provider(self.provider, path, status, time.perf_counter() - start)
+
+    def _send(self, request, **kwargs):
+        return super().send(request, **kwargs)
+
+
+class Cassette:
+    """
+    On-disk store of recorded interactions
+    One gzip JSON file per match key; repeated identical requests are kept in
+    order and replayed round-robin.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._replay_index: Dict[str, int] = {}
+        self._replay_entries: Dict[str, Optional[Dict[str, Any]]] = {}  # Files are read once per replay run
+
+    # ==================== Matching ====================
+
+    @staticmethod
+    def match_key(method: str, url: str, body: Optional[bytes]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Normalized request identity
+
+        Only the path and query are used (the cassette directory already scopes
+        the provider, so recordings survive a base URL change). Query
+        parameters and form fields are sorted and stripped of secrets; JSON
+        bodies are re-serialized with sorted keys, so key order and whitespace
+        don't cause misses.
+
+        Returns:
+            (sha1 hex digest, normalized request dict)
+        """
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_FIELDS)
+        normalized = {
+            "method": method.upper(),
+            "url": urlunsplit(("", "", parts.path, urlencode(query), "")),
+            "body": Cassette._normalize_body(body),
+        }
+        digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return digest, normalized
+
+    @staticmethod
+    def _normalize_body(body: Optional[bytes]) -> Any:
+        if not body:
+            return None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            data = json.loads(body)
+            if isinstance(data, dict):
+                data = {k: v for k, v in data.items() if k not in VOLATILE_BODY_FIELDS and k not in SECRET_FIELDS}
+            return data
+        except ValueError:
+            pass
+        try:
+            form = parse_qsl(body.decode("utf-8"), keep_blank_values=True, strict_parsing=True)
+            return sorted((k, v) for k, v in form if k not in SECRET_FIELDS)
+        except (UnicodeDecodeError, ValueError):
+            return hashlib.sha1(body).hexdigest()
+
+    @staticmethod
+    def redact_body(content: bytes) -> str:
+        """
+        Response body as stored: secret fields of a JSON body (e.g. the Amadeus
+        oauth2 access_token) are replaced by REDACTED, which replays as a token
+        that works against the recorded responses
+        """
+        text = content.decode("utf-8", errors="surrogateescape")
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return text
+        redacted = _redact(data)
+        return json.dumps(redacted, ensure_ascii=False) if redacted != data else text
+
+    # ==================== Storage ====================
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.json.gz")
+
+    def _load(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(self._path(digest), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, digest: str, request: Dict[str, Any], response: Dict[str, Any]):
+        """Append one interaction under its key"""
+        with self._lock:
+            entry = self._load(digest) or {"request": request, "responses": []}
+            entry["responses"].append(response)
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self._path(digest) + ".tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(digest))
+
+    def next_response(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Next recorded response for a key (cycling), or None if never recorded"""
+        with self._lock:
+            if digest not in self._replay_entries:
+                self._replay_entries[digest] = self._load(digest)
+            entry = self._replay_entries[digest]
+            if not entry or not entry["responses"]:
+                return None
+            index = self._replay_index.get(digest, 0)
+            self._replay_index[digest] = index + 1
+            return entry["responses"][index % len(entry["responses"])]
+
+
+def _redact(value: Any) -> Any:
+    """Copy of a JSON value with every SECRET_FIELDS value replaced by REDACTED"""
+    if isinstance(value, dict):
+        return {k: REDACTED if k in SECRET_FIELDS else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+class CassetteAdapter(ProviderAdapter):
+    """Transport adapter that records to or replays from a Cassette"""
+
+    def __init__(self, provider: str, cassette: Cassette, mode: str, latency: str = "zero", **kwargs):
+        """
+        Args:
+            provider: Provider name (metrics label)
+            cassette: Interaction store
+            mode: "record" or "replay"
+            latency: In replay mode, "recorded" sleeps for the original response time, "zero" doesn't
+        """
+        super().__init__(provider, **kwargs)
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+
+    def _send(self, request, **kwargs):
+        digest, normalized = Cassette.match_key(request.method, request.url, request.body)
+
+        if self.mode == "replay":
+            recorded = self.cassette.next_response(digest)
+            if recorded is None:
+                raise requests.ConnectionError(
+                    f"No recorded response for {normalized['method']} {normalized['url']}", request=request)
+            if self.latency == "recorded" and recorded.get("elapsed"):
+                time.sleep(recorded["elapsed"])
+            return self._build_response(request, recorded)
+
+        start = time.perf_counter()
+        response = super()._send(request, **kwargs)
+        content = response.content  # Reads streamed bodies fully so they can be stored
+        self.cassette.save(digest, normalized, {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items()
+                        if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+                        and k.lower() not in SECRET_HEADERS},
+            "body": Cassette.redact_body(content),
+            "elapsed": round(time.perf_counter() - start, 4),
+        })
+        return response
+
+    def _build_response(self, request, recorded: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason", "")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response._content = recorded["body"].encode("utf-8", errors="surrogateescape")
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
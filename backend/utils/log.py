@@ -0,0 +1,174 @@
+"""
+Structured Logging
+JSON log records written by a background thread (QueueHandler/QueueListener),
+per-module levels, sampling of verbose DEBUG events, and request-id / trace-id
+correlation on every record.
+
+    from backend.utils.log import get_logger
+    logger = get_logger(__name__)
+    logger.info("Request received", extra={"intent": intent})
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from config.config import Config
+from . import tracing
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied "extra" fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "trace_id"}
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Module logger; configures logging on first use
+
+    Args:
+        name: Fixed dotted name under "backend." (e.g. "backend.agent.travel_agent"),
+            not __name__: the app imports some modules as "agent.travel_agent",
+            others as "backend.booking", so __name__ would break LOG_LEVELS prefixes
+    """
+    setup_logging()
+    return logging.getLogger(name)
+
+
+def set_request_id(request_id: Optional[str]):
+    """Bind a request id to the current context; returns a token for reset_request_id"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra={...} fields are kept as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Stamps request id and trace id onto records in the calling thread (before queueing)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        record.trace_id = tracing.current_trace_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of DEBUG records; other levels always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that skips the eager message formatting of the stdlib version"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments are merged here (cheap) so the record is safe to hand to another thread
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_text = logging.Formatter().formatException(record.exc_info) if record.exc_info else None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Never block or raise on the request path: drop when the writer falls behind
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """"backend.agent=DEBUG,backend.booking=WARNING" -> {"backend.agent": "DEBUG", ...}"""
+    levels = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, level = part.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(force: bool = False):
+    """
+    Route all logging through a queue to a background JSON writer
+
+    Settings come from Config: LOG_LEVEL, LOG_LEVELS (per-module overrides),
+    LOG_FILE (stdout when empty) and LOG_DEBUG_SAMPLE_RATE.
+    """
+    global _listener
+    if _listener is not None and not force:
+        return
+
+    with _setup_lock:
+        if _listener is not None and not force:
+            return
+        if _listener is not None:
+            _listener.stop()
+
+        if Config.LOG_FILE:
+            output: logging.Handler = logging.handlers.WatchedFileHandler(Config.LOG_FILE, encoding="utf-8")
+        else:
+            output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter())
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=50000)
+        handler = _LazyQueueHandler(log_queue)
+        # Sampling first so dropped DEBUG records cost as little as possible
+        handler.addFilter(SamplingFilter(Config.LOG_DEBUG_SAMPLE_RATE))
+        handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            if isinstance(existing, logging.handlers.QueueHandler):
+                root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(Config.LOG_LEVEL.upper())
+        for name, level in _parse_levels(Config.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
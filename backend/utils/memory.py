@@ -0,0 +1,163 @@
+"""
+Memory Diagnostics
+tracemalloc snapshot diffs grouped by module, process RSS, and the current
+size of every registered in-process container (caches, history buffers,
+metric series), for the /api/admin/memory endpoints.
+
+    memory.register_container("weather.live_cache", _LIVE_CACHE)
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Union
+
+Sized = Union[Callable[[], int], Any]  # A zero-argument callable or anything with __len__
+
+_containers: Dict[str, Sized] = {}
+_lock = threading.Lock()
+_baseline: Optional[tracemalloc.Snapshot] = None
+
+# Allocation sites of the diagnostics themselves are excluded from snapshots
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# ==================== Containers ====================
+
+def register_container(name: str, container: Sized):
+    """Report a container's size under name (re-registering replaces it)"""
+    _containers[name] = container
+
+
+def container_sizes() -> Dict[str, int]:
+    sizes = {}
+    for name, container in list(_containers.items()):
+        try:
+            sizes[name] = len(container) if hasattr(container, "__len__") else container()
+        except Exception:
+            sizes[name] = -1
+    return sizes
+
+
+# ==================== tracemalloc ====================
+
+def start(frames: int = 1):
+    """Start tracing allocations (frames = traceback depth kept per allocation)"""
+    global _baseline
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, frames))
+            _baseline = None
+
+
+def stop():
+    """Stop tracing and drop the baseline snapshot"""
+    global _baseline
+    with _lock:
+        tracemalloc.stop()
+        _baseline = None
+
+
+def status() -> Dict[str, Any]:
+    """Tracing state, traced memory, RSS and container sizes"""
+    info: Dict[str, Any] = {
+        "tracing": tracemalloc.is_tracing(),
+        "rss_bytes": _rss_bytes(),
+        "containers": container_sizes(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        info.update(traced_bytes=current, traced_peak_bytes=peak,
+                    traceback_frames=tracemalloc.get_traceback_limit(),
+                    has_baseline=_baseline is not None)
+    return info
+
+
+def diff(limit: int = 25, group_by: str = "module", reset: bool = True) -> Dict[str, Any]:
+    """
+    Compare a new snapshot against the baseline
+
+    The first call (or the first after start()) only records the baseline and
+    returns the largest allocation sites instead.
+
+    Args:
+        limit: Number of rows returned
+        group_by: "module" (allocations summed per Python module) or "line"
+        reset: Make the new snapshot the baseline for the next call
+
+    Returns:
+        Dict with "top" rows sorted by growth (size_diff) or, without a baseline, by size
+    """
+    global _baseline
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not running")
+
+    with _lock:
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        baseline = _baseline
+        if reset or baseline is None:
+            _baseline = snapshot
+
+    key_type = "lineno" if group_by == "line" else "filename"
+    if baseline is None:
+        rows = [_row(stat.traceback[0], group_by, stat.size, stat.count)
+                for stat in snapshot.statistics(key_type)]
+        sort_key = "size"
+    else:
+        rows = [_row(stat.traceback[0], group_by, stat.size, stat.count, stat.size_diff, stat.count_diff)
+                for stat in snapshot.compare_to(baseline, key_type)]
+        sort_key = "size_diff"
+
+    if group_by != "line":
+        rows = _merge_by_module(rows)
+    rows.sort(key=lambda row: row[sort_key], reverse=True)
+    return {"baseline": baseline is not None, "group_by": group_by, "top": rows[:limit]}
+
+
+def _row(frame, group_by: str, size: int, count: int, size_diff: int = 0, count_diff: int = 0) -> Dict[str, Any]:
+    row = {"site": _module_name(frame.filename), "size": size, "count": count,
+           "size_diff": size_diff, "count_diff": count_diff}
+    if group_by == "line":
+        row["site"] = f"{row['site']}:{frame.lineno}"
+    return row
+
+
+def _merge_by_module(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        total = merged.setdefault(row["site"], dict(row, size=0, count=0, size_diff=0, count_diff=0))
+        for field in ("size", "count", "size_diff", "count_diff"):
+            total[field] += row[field]
+    return list(merged.values())
+
+
+_module_names: Dict[str, str] = {}
+
+
+def _module_name(filename: str) -> str:
+    """Dotted module name for a source file, falling back to the file name"""
+    name = _module_names.get(filename)
+    if name is None:
+        for module_name, module in list(sys.modules.items()):
+            if getattr(module, "__file__", None) == filename:
+                name = module_name
+                break
+        else:
+            name = filename
+        _module_names[filename] = name
+    return name
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size from /proc (Linux); None elsewhere"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,227 @@
+"""
+Metrics - Lightweight latency spans, histograms and counters
+Stage timings of the agent pipeline, provider call latencies and LLM token
+usage, rendered in Prometheus text format for the /metrics endpoint.
+
+    with metrics.span("llm_call"):
+        ...
+
+When Config.ENABLE_METRICS is off, span() hands back a shared no-op context
+manager and the decorators call straight through.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Tuple
+
+from config.config import Config
+from . import memory, tracing
+
+# Request-scoped labels (e.g. intent) added to every span recorded in this context
+_bound_labels: ContextVar[Dict[str, str]] = ContextVar("metric_labels", default={})
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, list] = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        self.dropped = 0  # Observations refused because of the series limit
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= Config.MAX_METRIC_SERIES:
+                    self.dropped += 1
+                    return
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {count}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(key, inf)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+class Counter:
+    """Monotonic counter keyed by label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            if key not in self._values and len(self._values) >= Config.MAX_METRIC_SERIES:
+                self.dropped += 1
+                return
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+# ==================== Registry ====================
+
+STAGE_SECONDS = Histogram(
+    "trippilot_stage_duration_seconds", "Time spent in each agent pipeline stage, by intent")
+PROVIDER_SECONDS = Histogram(
+    "trippilot_provider_request_duration_seconds", "Outbound provider call latency, by provider, endpoint and status")
+LLM_TOKENS = Counter(
+    "trippilot_llm_tokens_total", "LLM tokens from the completion usage field, by intent and direction (in/out)")
+LLM_CALLS = Counter(
+    "trippilot_llm_calls_total", "LLM completion calls, by intent and outcome")
+
+_REGISTRY = [STAGE_SECONDS, PROVIDER_SECONDS, LLM_TOKENS, LLM_CALLS]
+for _metric in _REGISTRY:
+    memory.register_container(f"metrics.{_metric.name}", _metric)
+
+
+def render_prometheus() -> str:
+    """All metrics in Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in _REGISTRY) + "\n"
+
+
+# ==================== Spans ====================
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """Stage timer; also a child trace span when a sampled trace is active"""
+
+    __slots__ = ("stage", "labels", "start", "trace")
+
+    def __init__(self, stage: str, labels: Dict[str, str]):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.trace = tracing.child_span(self.stage, self.labels)
+        self.trace.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.trace.__exit__(exc_type, *exc)
+        labels = dict(_bound_labels.get(), **self.labels)
+        labels.setdefault("intent", "none")
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, stage=self.stage, **labels)
+        return False
+
+
+def span(stage: str, **labels):
+    """Time a pipeline stage; labels bound with bind() (e.g. intent) are added"""
+    if not Config.ENABLE_METRICS:
+        return _NOOP
+    return _Span(stage, labels)
+
+
+def timed(stage: str):
+    """Decorator form of span()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Config.ENABLE_METRICS:
+                return fn(*args, **kwargs)
+            with _Span(stage, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def bind(**labels):
+    """Attach labels (e.g. intent=...) to every span recorded inside the block"""
+    token = _bound_labels.set(dict(_bound_labels.get(), **labels))
+    try:
+        yield
+    finally:
+        _bound_labels.reset(token)
+
+
+def current_label(name: str, default: str = "none") -> str:
+    """A label bound in the current context"""
+    return _bound_labels.get().get(name, default)
+
+
+def observe_provider(provider: str, endpoint: str, status: str, seconds: float):
+    """Record one outbound provider call"""
+    if Config.ENABLE_METRICS:
+        PROVIDER_SECONDS.observe(seconds, provider=provider, endpoint=endpoint, status=status)
+
+
+def record_llm_usage(usage: Dict, outcome: str = "ok"):
+    """Count an LLM call and its prompt/completion tokens against the bound intent"""
+    if not Config.ENABLE_METRICS:
+        return
+    intent = current_label("intent")
+    LLM_CALLS.inc(intent=intent, outcome=outcome)
+    if usage:
+        LLM_TOKENS.inc(usage.get("prompt_tokens", 0), intent=intent, direction="in")
+        LLM_TOKENS.inc(usage.get("completion_tokens", 0), intent=intent, direction="out")
@@ -0,0 +1,182 @@
+"""
+Request Profiling
+Per-request profiling switched on by a header or a sampling rate:
+
+    cprofile - deterministic cProfile; writes <id>.prof (pstats) and <id>.txt
+    sample   - low-overhead stack sampler; writes <id>.collapsed (flamegraph.pl /
+               speedscope "collapsed stacks") and <id>.speedscope.json
+
+When neither the header nor sampling selects a request, nothing is started.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from config.config import Config
+
+MODES = ("cprofile", "sample")
+
+# Only one deterministic profiler can be active per process
+_cprofile_lock = threading.Lock()
+
+
+def choose_mode(header_value: Optional[str]) -> Optional[str]:
+    """Profiling mode for a request: the X-Profile header if allowed, else random sampling"""
+    if header_value and Config.PROFILE_ALLOW_HEADER:
+        mode = header_value.strip().lower()
+        return mode if mode in MODES else None
+    if Config.PROFILE_SAMPLE_RATE > 0 and random.random() < Config.PROFILE_SAMPLE_RATE:
+        return Config.PROFILE_DEFAULT_MODE
+    return None
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a helper thread"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+
+class RequestProfile:
+    """One profiled request; start() on the request thread, then finish()"""
+
+    def __init__(self, mode: str, name: str):
+        self.mode = mode
+        self.name = name
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._start = 0.0
+
+    def start(self) -> bool:
+        """Begin profiling; False if the profiler is busy (only one cProfile at a time)"""
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                return False
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Another tool already owns the interpreter's profiling hook
+                _cprofile_lock.release()
+                return False
+        else:
+            self._sampler = StackSampler(threading.get_ident(), Config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+            self._sampler.start()
+        self._start = time.perf_counter()
+        return True
+
+    def finish(self) -> List[str]:
+        """Stop profiling and write the output files; returns their names"""
+        elapsed = time.perf_counter() - self._start
+        os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+        base = os.path.join(Config.PROFILE_DIR, self.name)
+
+        if self.mode == "cprofile":
+            try:
+                self._profiler.disable()
+            finally:
+                _cprofile_lock.release()
+            self._profiler.dump_stats(base + ".prof")
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(60)
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(f"Request wall time: {elapsed * 1000:.1f} ms\n\n{out.getvalue()}")
+            files = [self.name + ".prof", self.name + ".txt"]
+        else:
+            self._sampler.stop()
+            stacks = self._sampler.stacks
+            with open(base + ".collapsed", "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+            with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+                json.dump(_speedscope(self.name, stacks, self._sampler.interval), f)
+            files = [self.name + ".collapsed", self.name + ".speedscope.json"]
+
+        _prune(Config.PROFILE_DIR, Config.PROFILE_MAX_FILES)
+        return files
+
+
+def _speedscope(name: str, stacks: Counter, interval: float) -> Dict:
+    """Sampled profile in the speedscope file format"""
+    frames: List[Dict[str, str]] = []
+    index: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        ids = []
+        for frame in stack.split(";"):
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame})
+            ids.append(index[frame])
+        samples.append(ids)
+        weights.append(count * interval * 1000)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "milliseconds",
+            "startValue": 0, "endValue": sum(weights),
+            "samples": samples, "weights": weights,
+        }],
+        "name": name,
+    }
+
+
+def _prune(directory: str, keep: int):
+    """Delete the oldest profile files beyond keep"""
+    try:
+        entries = [os.path.join(directory, n) for n in os.listdir(directory)]
+    except FileNotFoundError:
+        return
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def list_profiles() -> List[Dict]:
+    """Profile files, newest first"""
+    try:
+        names = os.listdir(Config.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    result = []
+    for name in names:
+        path = os.path.join(Config.PROFILE_DIR, name)
+        stat = os.stat(path)
+        result.append({"name": name, "bytes": stat.st_size, "modified": round(stat.st_mtime, 3)})
+    result.sort(key=lambda item: item["modified"], reverse=True)
+    return result
@@ -0,0 +1,151 @@
+"""
+Response Projection
+Chat responses can carry a hotel/flight list in two views: "detail" (every
+field, the default) and "card" (only what a list card shows). The rest of an
+item is fetched when it is opened, from
+GET /api/results/<result_set_id>/items/<item_id>.
+
+Lists are also delta-encoded per conversation: when the client says which
+list it holds (delta_base) and that is the last one sent, only new or changed
+items are sent, plus the id order of the whole list:
+
+    {"data": [<changed items>], "delta": {"base": 3, "revision": 4, "order": ["h1", "h2", ...]}}
+
+Without a usable base the full list is sent with {"delta": {"revision": n}}.
+"""
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from config.config import Config
+from . import memory, serialization
+from .cache import TTLCache
+
+VIEWS = ("card", "detail")
+
+# Fields a list card shows, per result-set kind; everything else is detail
+CARD_FIELDS: Dict[str, tuple] = {
+    "hotels": ("id", "name", "location", "rating", "price", "currency", "amenities"),
+    "flights": ("id", "carrier_code", "carrier_name", "flight_number", "origin", "destination",
+                "departure_date", "departure_time", "arrival_time", "duration", "stops",
+                "cabin_class", "price", "currency"),
+}
+CARD_AMENITIES = 3  # Amenity tags on a card; amenity_count keeps the total
+
+# Chat action -> kind of its list
+_ACTION_KINDS = {"search_hotels": "hotels", "search_flights": "flights"}
+
+
+# ==================== Projection ====================
+
+def card(kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Card view of one hotel/flight dict (unknown kinds are returned as is)"""
+    fields = CARD_FIELDS.get(kind)
+    if fields is None:
+        return item
+    out = {key: item[key] for key in fields if key in item}
+    amenities = out.get("amenities")
+    if isinstance(amenities, list) and len(amenities) > CARD_AMENITIES:
+        out["amenities"] = amenities[:CARD_AMENITIES]
+        out["amenity_count"] = len(amenities)
+    return out
+
+
+def project(kind: str, items: List[Dict[str, Any]], view: str) -> List[Dict[str, Any]]:
+    """Items in the requested view ("card" or "detail")"""
+    if view != "card":
+        return items
+    return [card(kind, item) if isinstance(item, dict) else item for item in items]
+
+
+def list_kind(response: Dict[str, Any]) -> Optional[str]:
+    """Kind of the hotel/flight list in a chat response, None when it has none"""
+    if not isinstance(response.get("data"), list):
+        return None
+    return _ACTION_KINDS.get(response.get("action"))
+
+
+# ==================== Delta Encoding ====================
+
+def _digest(item: Any) -> bytes:
+    return hashlib.blake2b(serialization.dumps(item), digest_size=8).digest()
+
+
+class DeltaEncoder:
+    """Last list sent per conversation (item id -> digest), to send the next one as a delta"""
+
+    def __init__(self, maxsize: int = 2000, ttl: float = 1800, min_items: int = 5):
+        """
+        Args:
+            maxsize: Conversations remembered (least recently used dropped first)
+            ttl: Seconds a conversation's last list is remembered
+            min_items: Shorter lists are always sent in full
+        """
+        self.min_items = min_items
+        self._sent = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Revisions must not be handed out twice for one conversation
+        self._lock = threading.Lock()
+
+    def encode(self, conversation_id: str, base: Optional[int], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Encode a list against the conversation's previous one
+
+        Args:
+            conversation_id: Client conversation id
+            base: Revision of the list the client holds (None = nothing)
+            items: The list about to be sent (in its final view)
+
+        Returns:
+            {"data", "delta"}: data is the full list, or only the new/changed items
+            when delta has a "base"
+        """
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        digests = [_digest(item) for item in items]
+        # Items must be addressable by a unique id to be left out
+        addressable = None not in ids and len(set(ids)) == len(ids)
+        with self._lock:
+            previous = self._sent.get(conversation_id)
+            revision = (previous["revision"] if previous else 0) + 1
+            self._sent.set(conversation_id, {
+                "revision": revision,
+                "items": dict(zip(ids, digests)) if addressable else {},
+            })
+        if not (previous and addressable and base == previous["revision"] and len(items) >= self.min_items):
+            return {"data": items, "delta": {"revision": revision}}
+        known = previous["items"]
+        return {
+            "data": [item for item, item_id, digest in zip(items, ids, digests) if known.get(item_id) != digest],
+            "delta": {"base": base, "revision": revision, "order": ids},
+        }
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+
+DELTAS = DeltaEncoder(
+    maxsize=Config.PAYLOAD_DELTA_MAX_CONVERSATIONS,
+    ttl=Config.PAYLOAD_DELTA_TTL,
+    min_items=Config.PAYLOAD_DELTA_MIN_ITEMS,
+)
+memory.register_container("payload_deltas", DELTAS)
+
+
+def shape_response(response: Dict[str, Any], view: str = "detail", conversation_id: Optional[str] = None,
+                   delta_base: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Chat response as sent to the client: its list projected to the view and,
+    with a conversation id, delta-encoded (the agent's response is not modified)
+
+    Args:
+        response: Agent response ({"action", "content", "data", ...})
+        view: "card" or "detail"
+        conversation_id: Client conversation id; None disables delta encoding
+        delta_base: "revision" of the last delta the client applied
+    """
+    kind = list_kind(response)
+    if kind is None:
+        return response
+    shaped = dict(response, data=project(kind, response["data"], view))
+    if conversation_id:
+        shaped.update(DELTAS.encode(conversation_id, delta_base, shaped["data"]))
+    return shaped
@@ -0,0 +1,237 @@
+"""
+Result Sets
+Each hotel/flight search keeps its full candidate list under a result-set id,
+so refinements (price range, rating, stops, time slot, sort order, next page)
+are answered from memory by GET /api/results/<id> instead of another LLM call.
+Sets are kept as CandidateTable columns, so a query is a few array operations
+and only the rows of the requested page are handed out as dicts.
+
+    result_set_id = RESULT_SETS.put("hotels", hotels)
+    page = RESULT_SETS.query(result_set_id, {"max_price": "600", "sort": "-rating"})
+"""
+import base64
+import hashlib
+import json
+import math
+import uuid
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Union
+
+import numpy as np
+
+from config.config import Config
+from . import amenities, memory, projection
+from .cache import TTLCache
+from .candidates import CandidateTable
+
+
+class ResultSetNotFound(KeyError):
+    """Unknown or expired result-set id"""
+
+
+# ==================== Filters ====================
+
+def _number(value: str, name: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+    # "inf", "nan" and overflowing input like "1e400" parse, but are no usable bound or page size
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a number")
+    return number
+
+
+def _clock(value: str, name: str) -> float:
+    """"H:MM" / "HH:MM" as minutes after midnight"""
+    try:
+        hour, minute = (int(part) for part in str(value).split(":")[:2])
+    except ValueError:
+        raise ValueError(f"{name} must be HH:MM")
+    return float(hour * 60 + minute)
+
+
+def _stops(table: CandidateTable) -> np.ndarray:
+    # A flight without a stops field is taken as direct
+    return np.nan_to_num(table.columns["stops"], nan=0.0)
+
+
+# name -> (parse the query value, boolean row mask for it); all given filters must match
+_FILTERS: Dict[str, Tuple[Callable[[str, str], Any], Callable[[CandidateTable, Any], np.ndarray]]] = {
+    "min_price": (_number, lambda table, v: table.where(price__ge=v)),
+    "max_price": (_number, lambda table, v: table.where(price__le=v)),
+    "min_rating": (_number, lambda table, v: table.where(rating__ge=v)),
+    "max_stops": (_number, lambda table, v: _stops(table) <= v),
+    "stops": (_number, lambda table, v: _stops(table) == v),
+    "depart_after": (_clock, lambda table, v: table.where(departure__ge=v)),
+    "depart_before": (_clock, lambda table, v: table.where(departure__lt=v)),
+    "carrier": (lambda v, _: v.lower(), lambda table, v: (
+        table.equals("carrier_code", v) | table.equals("carrier_name", v))),
+}
+
+# Allowed sort fields -> table column; "-field" sorts descending. Items missing the field go last.
+_SORT_FIELDS = {
+    "price": "price",
+    "rating": "rating",
+    "departure_time": "departure",
+    "duration": "duration",
+    "stops": "stops",
+}
+
+
+def _sort_column(sort: str) -> str:
+    column = _SORT_FIELDS.get(sort.lstrip("-"))
+    if column is None:
+        raise ValueError(f"sort must be one of {', '.join(sorted(_SORT_FIELDS))} (prefix - for descending)")
+    return ("-" if sort.startswith("-") else "") + column
+
+
+# ==================== Cursors ====================
+
+def _fingerprint(filters: Dict[str, List[Any]], sort: str) -> str:
+    canonical = json.dumps([sorted(filters.items()), sort], separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:8]
+
+
+def _encode_cursor(offset: int, fingerprint: str) -> str:
+    raw = json.dumps({"o": offset, "q": fingerprint}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> int:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset = int(data["o"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("invalid cursor")
+    if data.get("q") != fingerprint:
+        raise ValueError("cursor belongs to a different filter/sort")
+    return max(0, offset)
+
+
+# ==================== Store ====================
+
+class ResultSetStore:
+    """TTL- and size-bounded store of search result sets"""
+
+    def __init__(self, maxsize: int = 500, ttl: float = 1800, max_page: int = 50):
+        """
+        Args:
+            maxsize: Result sets kept (least recently used dropped first)
+            ttl: Seconds a result set stays queryable
+            max_page: Largest page a query may ask for
+        """
+        self.max_page = max_page
+        self._sets = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def put(self, kind: str, items: Union[List[Dict], CandidateTable]) -> str:
+        """Store a search's candidates (a list or an already built table); returns the result-set id"""
+        result_set_id = uuid.uuid4().hex[:16]
+        table = items if isinstance(items, CandidateTable) else CandidateTable(items)
+        prices = table.columns["price"][~np.isnan(table.columns["price"])]
+        self._sets.set(result_set_id, {
+            "kind": kind,
+            "table": table,
+            "stats": {
+                "size": len(table),  # Whole set, before filtering
+                "min_price": prices.min().item() if prices.size else None,
+                "max_price": prices.max().item() if prices.size else None,
+            },
+        })
+        return result_set_id
+
+    def get(self, result_set_id: str) -> Dict:
+        result_set = self._sets.get(result_set_id)
+        if result_set is None:
+            raise ResultSetNotFound(result_set_id)
+        return result_set
+
+    def item(self, result_set_id: str, item_id: str) -> Dict:
+        """
+        One candidate of a result set, with all its fields
+
+        Raises:
+            ResultSetNotFound: Unknown or expired id, or no item with item_id
+        """
+        item = self.get(result_set_id)["table"].find(item_id)
+        if item is None:
+            raise ResultSetNotFound(f"{result_set_id}/{item_id}")
+        return item
+
+    def query(self, result_set_id: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Filter, sort and page a result set
+
+        Args:
+            params: Query parameters (request.args works; repeated keys such as
+                amenity=A&amenity=B are read with getlist when available):
+                filters (see _FILTERS), amenity (repeatable; EN/ZH synonyms), sort, limit, cursor,
+                view ("card" for list-card fields only, see projection)
+
+        Returns:
+            {"result_set_id", "kind", "total", "items", "next_cursor", "stats"};
+            next_cursor is None on the last page
+
+        Raises:
+            ResultSetNotFound: Unknown or expired id
+            ValueError: Invalid parameter or cursor
+        """
+        result_set = self.get(result_set_id)
+        table: CandidateTable = result_set["table"]
+
+        filters: Dict[str, List[Any]] = {}
+        selected = table.all()
+        for name, (parse, mask) in _FILTERS.items():
+            values = params.getlist(name) if hasattr(params, "getlist") else [params[name]] if name in params else []
+            values = [parse(value, name) for value in values if value not in (None, "")]
+            if values:
+                filters[name] = values
+                for value in values:
+                    selected &= mask(table, value)
+
+        # Amenities: one AND of bitmasks over the column, text matching only for terms outside the vocabulary
+        wanted = [value for value in (params.getlist("amenity") if hasattr(params, "getlist")
+                                      else [params.get("amenity")]) if value]
+        if wanted:
+            filters["amenity"] = sorted(wanted)
+            required = amenities.requirement_mask(wanted)
+            selected &= table.has_amenities(required.mask)
+            if required.unmatched:
+                for index in np.flatnonzero(selected):
+                    selected[index] = all(amenities.has_text(table.items[index], term)
+                                          for term in required.unmatched)
+
+        view = params.get("view") or "detail"
+        if view not in projection.VIEWS:
+            raise ValueError(f"view must be one of {', '.join(projection.VIEWS)}")
+
+        sort = params.get("sort") or ""
+        column = _sort_column(sort) if sort else ""
+
+        limit = int(_number(params.get("limit") or 10, "limit"))
+        limit = max(1, min(limit, self.max_page))
+        fingerprint = _fingerprint(filters, sort)
+        offset = _decode_cursor(params["cursor"], fingerprint) if params.get("cursor") else 0
+        end = offset + limit
+
+        total = int(selected.sum())
+        # Only the rows up to the end of this page are ordered, and only they become dicts
+        page = table.top_k(selected, column, end)[offset:end]
+        return {
+            "result_set_id": result_set_id,
+            "kind": result_set["kind"],
+            "total": total,
+            "items": projection.project(result_set["kind"], table.rows(page), view),
+            "next_cursor": _encode_cursor(end, fingerprint) if end < total else None,
+            "stats": dict(result_set["stats"]),
+        }
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+RESULT_SETS = ResultSetStore(
+    maxsize=Config.RESULT_SET_MAX_SETS,
+    ttl=Config.RESULT_SET_TTL,
+    max_page=Config.RESULT_SET_MAX_PAGE,
+)
+memory.register_container("result_sets", RESULT_SETS)
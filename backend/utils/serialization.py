@@ -0,0 +1,85 @@
+"""
+JSON Serialization
+One JSON layer for request bodies, responses and SSE events. orjson is used
+when installed (several times faster than the stdlib encoder, UTF-8 bytes
+out); otherwise the stdlib json module with the same output. Flask picks it
+up through FastJSONProvider, so request.json and jsonify use it too.
+
+Responses are compact unless Config.JSON_COMPACT is off or the request asks
+for ?pretty=1.
+"""
+import importlib.util
+import json
+from typing import Any
+
+from flask import has_request_context, request
+from flask.json.provider import JSONProvider
+
+from config.config import Config
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+if ORJSON_AVAILABLE:
+    import orjson
+
+    # Dataclasses go through _default so backend.models keep their wire shape (to_dict)
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles natively"""
+    if hasattr(obj, "to_dict"):  # backend.models
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "isoformat"):  # date / time (datetime is native to orjson)
+        return obj.isoformat()
+    if hasattr(obj, "item"):  # NumPy scalars with the stdlib encoder
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON (non-ASCII characters kept as is)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_default,
+                                option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0))
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: fall back to the stdlib encoder
+    return json.dumps(obj, default=_default, ensure_ascii=False,
+                      indent=2 if pretty else None,
+                      separators=None if pretty else (",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any, pretty: bool = False) -> str:
+    return dumps(obj, pretty).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str; raises ValueError on malformed input"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pretty_requested() -> bool:
+    """Whether this response should be indented"""
+    if not Config.JSON_COMPACT:
+        return True
+    return has_request_context() and request.args.get("pretty") in ("1", "true")
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps/loads (app.json = FastJSONProvider(app))"""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_str(obj, pretty=kwargs.get("indent") is not None)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj, pretty=pretty_requested()), mimetype=self.mimetype)
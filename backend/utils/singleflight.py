@@ -0,0 +1,89 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key wait on one in-flight computation
+and share its result instead of each hitting DeepSeek, Amadeus or Gaode.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Single-Flight Group
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and receive the same result (or the
+    same exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        """Initialize Single-Flight Group"""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Hashable request key (already normalized by the caller)
+            fn: Function computing the result
+            *args, **kwargs: Passed through to fn
+
+        Returns:
+            fn's result, shared by every caller that joined the flight
+        """
+        result, _ = self.do_shared(key, fn, *args, **kwargs)
+        return result
+
+    def do_shared(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> tuple:
+        """
+        Same as do(), but also reports whether the result was shared
+
+        Returns:
+            (result, shared) - shared is True for callers that waited on
+            another caller's computation
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, call.waiters > 0
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,274 @@
+"""
+Tracing - W3C trace-context propagation and span export
+One trace id follows a chat turn from the Streamlit frontend through the Flask
+route, the agent stages and the provider calls. Spans are exported by a
+background thread as JSON lines to a local file and/or POSTed in batches to a
+collector URL.
+
+Settings (environment, or configure()):
+    TRACE_SAMPLE_RATE   - fraction of new root traces recorded (default 0); an
+                          incoming sampled traceparent is always honoured
+    TRACE_EXPORT_FILE   - JSON-lines file spans are appended to
+    TRACE_COLLECTOR_URL - HTTP endpoint receiving {"spans": [...]} batches
+
+Kept free of backend imports so the frontend can use it as well.
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+TRACEPARENT = "traceparent"
+
+
+class SpanContext:
+    """Identity of a span as carried in the traceparent header"""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def to_header(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("trace_context", default=None)
+
+
+# ==================== Configuration ====================
+
+class _Settings:
+    service = "trippilot"
+    sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    export_file = os.getenv("TRACE_EXPORT_FILE", "")
+    collector_url = os.getenv("TRACE_COLLECTOR_URL", "")
+
+
+def configure(service: str, sample_rate: float = None, export_file: str = None, collector_url: str = None):
+    """
+    Set the service name and (optionally) override the environment settings
+
+    Args:
+        service: Name stored on every span, e.g. "trippilot-backend"
+        sample_rate: Fraction of new root traces to record
+        export_file: JSON-lines output file
+        collector_url: Collector endpoint for batched JSON POSTs
+    """
+    _Settings.service = service
+    if sample_rate is not None:
+        _Settings.sample_rate = sample_rate
+    if export_file is not None:
+        _Settings.export_file = export_file
+    if collector_url is not None:
+        _Settings.collector_url = collector_url
+
+
+def enabled() -> bool:
+    """Spans are only built when they have somewhere to go"""
+    return bool(_Settings.export_file or _Settings.collector_url)
+
+
+# ==================== Propagation ====================
+
+def extract(headers) -> Optional[SpanContext]:
+    """Parse a traceparent header ("00-<trace>-<span>-<flags>"); None if absent or malformed"""
+    value = headers.get(TRACEPARENT) if headers else None
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return SpanContext(parts[1], parts[2], sampled)
+
+
+def inject(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the current span's traceparent to outgoing headers (in place) and return them"""
+    context = _current.get()
+    if context is not None:
+        headers[TRACEPARENT] = context.to_header()
+    return headers
+
+
+def current_trace_id() -> Optional[str]:
+    context = _current.get()
+    return context.trace_id if context else None
+
+
+# ==================== Spans ====================
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    """Active span: makes itself the current context and exports itself on exit"""
+
+    __slots__ = ("name", "kind", "context", "parent_id", "attributes", "start", "_token")
+
+    def __init__(self, name: str, kind: str, context: SpanContext, parent_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+
+    def __enter__(self):
+        self.start = time.time()
+        self._token = _current.set(self.context)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.time()
+        _current.reset(self._token)
+        if self.context.sampled:
+            if exc_type is not None:
+                self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+            _EXPORTER.submit({
+                "trace_id": self.context.trace_id,
+                "span_id": self.context.span_id,
+                "parent_id": self.parent_id,
+                "name": self.name,
+                "kind": self.kind,
+                "service": _Settings.service,
+                "start": round(self.start, 6),
+                "duration_ms": round((end - self.start) * 1000, 3),
+                "attributes": self.attributes,
+                "status": "error" if exc_type is not None or self.attributes.get("error") else "ok",
+            })
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: str = "internal",
+               parent: Optional[SpanContext] = None):
+    """
+    Open a span as a context manager
+
+    The parent is the given context (e.g. from extract()), else the current
+    span. Without either a new trace is started, sampled at TRACE_SAMPLE_RATE.
+    Unsampled traces still propagate (flags 00) but record nothing.
+    """
+    if not enabled():
+        return _NOOP
+
+    parent = parent or _current.get()
+    if parent is None:
+        context = SpanContext(secrets.token_hex(16), secrets.token_hex(8), random.random() < _Settings.sample_rate)
+        return _SpanScope(name, kind, context, None, attributes)
+
+    return _SpanScope(name, kind, SpanContext(parent.trace_id, secrets.token_hex(8), parent.sampled),
+                      parent.span_id, attributes)
+
+
+def child_span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: str = "internal"):
+    """A span only when a sampled trace is already active (never starts a new trace)"""
+    parent = _current.get()
+    if parent is None or not parent.sampled or not enabled():
+        return _NOOP
+    return _SpanScope(name, kind, SpanContext(parent.trace_id, secrets.token_hex(8), True),
+                      parent.span_id, attributes)
+
+
+# ==================== Export ====================
+
+class _Exporter:
+    """Background writer; spans are dropped rather than blocking when the queue is full"""
+
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10000)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, span: Dict[str, Any]):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def flush(self):
+        """Write whatever is still queued (called at exit)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    @staticmethod
+    def _write(batch):
+        if _Settings.export_file:
+            try:
+                directory = os.path.dirname(_Settings.export_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(_Settings.export_file, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(span, ensure_ascii=False) + "\n" for span in batch))
+            except OSError:
+                pass
+        if _Settings.collector_url:
+            body = json.dumps({"spans": batch}, ensure_ascii=False).encode("utf-8")
+            req = urllib.request.Request(_Settings.collector_url, data=body,
+                                         headers={"Content-Type": "application/json"})
+            try:
+                urllib.request.urlopen(req, timeout=2).close()
+            except OSError:
+                pass
+
+
+_EXPORTER = _Exporter()
@@ -0,0 +1,212 @@
+"""
+Request Validation
+Declarative request-body schemas, compiled once at import into a flat list of
+checks. The validate_json decorator parses the body and rejects bad input
+with a 400 before the view (and any provider or LLM work) runs.
+
+    CHAT = Schema({"prompt": Field(str, required=True, max_length=4000)})
+
+    @app.route('/api/chat', methods=['POST'])
+    @validate_json(CHAT)
+    def chat():
+        data = g.body  # Validated, defaults filled in
+"""
+import re
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import g, jsonify, request
+
+from . import serialization
+
+# Field types beyond the builtins
+NUMBER = "number"      # int or float (not bool)
+INTEGER = "integer"    # int, or a float without fraction (not bool)
+
+_TYPE_NAMES = {str: "a string", bool: "a boolean", list: "an array", dict: "an object",
+               NUMBER: "a number", INTEGER: "an integer"}
+
+
+class ValidationError(ValueError):
+    """Request body does not match its schema; errors lists every problem found"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class Field:
+    """One field of a Schema"""
+
+    __slots__ = ("type", "required", "default", "nullable", "minimum", "maximum",
+                 "min_length", "max_length", "max_items", "pattern", "items", "schema", "choices")
+
+    def __init__(self, type_: Any, required: bool = False, default: Any = None, nullable: bool = False,
+                 minimum: Optional[float] = None, maximum: Optional[float] = None,
+                 min_length: Optional[int] = None, max_length: Optional[int] = None, max_items: Optional[int] = None,
+                 pattern: Optional[str] = None, items: Any = None, schema: "Optional[Schema]" = None, choices: Optional[Tuple] = None):
+        """
+        Args:
+            type_: str, bool, list, dict, NUMBER or INTEGER
+            required: Missing field is an error (otherwise default is filled in)
+            default: Value used when the field is missing (lists/dicts are copied)
+            nullable: Accept an explicit null
+            minimum / maximum: Bounds for numbers
+            min_length: Shortest string, not counting leading/trailing whitespace
+                (min_length=1 rejects "" and "   ")
+            max_length: Longest string
+            max_items: Longest list
+            pattern: Regular expression a string must match (compiled here, once)
+            items: Element type of a list (a type or a Schema)
+            schema: Nested schema of a dict
+            choices: Allowed values
+        """
+        self.type = type_
+        self.required = required
+        self.default = default
+        self.nullable = nullable
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_length = min_length
+        self.max_length = max_length
+        self.max_items = max_items
+        self.pattern = re.compile(pattern) if pattern else None
+        self.items = items
+        self.schema = schema
+        self.choices = choices
+
+
+def _is_type(value: Any, type_: Any) -> bool:
+    if type_ == NUMBER:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if type_ == INTEGER:
+        return (isinstance(value, int) and not isinstance(value, bool)) or \
+            (isinstance(value, float) and value.is_integer())
+    return isinstance(value, type_)
+
+
+def _compile_field(path: str, spec: Field) -> Callable[[Any, List[str]], Any]:
+    """Check function for one field: returns the (normalized) value and appends errors"""
+    checks: List[Callable[[Any], Optional[str]]] = []
+    if spec.minimum is not None:
+        checks.append(lambda v: f"{path} must be >= {spec.minimum}" if v < spec.minimum else None)
+    if spec.maximum is not None:
+        checks.append(lambda v: f"{path} must be <= {spec.maximum}" if v > spec.maximum else None)
+    if spec.min_length is not None:
+        checks.append(lambda v: (f"{path} must not be blank" if spec.min_length == 1
+                                 else f"{path} must be at least {spec.min_length} characters")
+                      if len(v.strip()) < spec.min_length else None)
+    if spec.max_length is not None:
+        checks.append(lambda v: f"{path} must be at most {spec.max_length} characters"
+                      if len(v) > spec.max_length else None)
+    if spec.max_items is not None:
+        checks.append(lambda v: f"{path} must have at most {spec.max_items} items" if len(v) > spec.max_items else None)
+    if spec.pattern is not None:
+        checks.append(lambda v: f"{path} has an invalid format" if not spec.pattern.fullmatch(v) else None)
+    if spec.choices is not None:
+        checks.append(lambda v: f"{path} must be one of {', '.join(map(str, spec.choices))}"
+                      if v not in spec.choices else None)
+
+    nested = spec.schema
+    check_item = None
+    if isinstance(spec.items, Schema):
+        item_schema = spec.items
+
+        def check_item(item: Any, item_path: str, errors: List[str]) -> Any:
+            return item_schema.run(item, errors, item_path)
+    elif spec.items is not None:
+        item_type = spec.items
+
+        def check_item(item: Any, item_path: str, errors: List[str]) -> Any:
+            if not _is_type(item, item_type):
+                errors.append(f"{item_path} must be {_TYPE_NAMES[item_type]}")
+            return item
+    expected = _TYPE_NAMES[spec.type]
+
+    def check(value: Any, errors: List[str]) -> Any:
+        if value is None:
+            if not spec.nullable:
+                errors.append(f"{path} must not be null")
+            return None
+        if not _is_type(value, spec.type):
+            errors.append(f"{path} must be {expected}")
+            return value
+        if spec.type == INTEGER:
+            value = int(value)
+        for rule in checks:
+            error = rule(value)
+            if error:
+                errors.append(error)
+        if nested is not None:
+            value = nested.run(value, errors, path)
+        elif check_item is not None:
+            value = [check_item(item, f"{path}[{index}]", errors) for index, item in enumerate(value)]
+        return value
+
+    return check
+
+
+class Schema:
+    """Compiled object schema; keys not listed are passed through unchanged"""
+
+    def __init__(self, fields: Dict[str, Field]):
+        self.fields = fields
+        # Field paths in error messages are relative; run() prefixes them for nested objects
+        self._plan = [(name, spec, _compile_field(name, spec)) for name, spec in fields.items()]
+
+    def run(self, data: Any, errors: List[str], path: str = "") -> Any:
+        """Check data, appending problems (prefixed with path) to errors; returns the normalized copy"""
+        if not isinstance(data, dict):
+            errors.append(f"{path or 'body'} must be an object")
+            return data
+        prefix = f"{path}." if path else ""
+        own: List[str] = []
+        out = dict(data)
+        for name, spec, check in self._plan:
+            if name not in data:
+                if spec.required:
+                    own.append(f"{name} is required")
+                elif spec.default is not None:
+                    default = spec.default
+                    out[name] = default.copy() if isinstance(default, (list, dict)) else default
+                continue
+            out[name] = check(data[name], own)
+        errors.extend(prefix + error for error in own)
+        return out
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        """
+        Validated copy of data with defaults filled in
+
+        Raises:
+            ValidationError: Every problem found, not just the first
+        """
+        errors: List[str] = []
+        out = self.run(data, errors)
+        if errors:
+            raise ValidationError(errors)
+        return out
+
+
+def validate_json(schema: Schema):
+    """
+    View decorator: parse the JSON body, validate it and store it in g.body
+
+    Malformed JSON or a schema mismatch is answered with
+    400 {"error", "details"} without calling the view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            raw = request.get_data(cache=True)
+            try:
+                data = serialization.loads(raw) if raw else {}
+            except ValueError:
+                return jsonify({"error": "Request body is not valid JSON"}), 400
+            try:
+                g.body = schema.validate(data)
+            except ValidationError as e:
+                return jsonify({"error": "Invalid request", "details": e.errors}), 400
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
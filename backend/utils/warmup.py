@@ -0,0 +1,160 @@
+"""
+Startup Warm-up
+Moves first-request costs out of user requests: DNS + TLS to each provider
+(several pooled connections per session), the Amadeus OAuth token, and the
+provider caches saved at the previous shutdown.
+
+The backend reports not-ready on /health until the warm-up has finished, so a load
+balancer only routes traffic to warmed instances.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from config.config import Config
+from .cache import TTLCache
+from .log import get_logger
+
+logger = get_logger("backend.utils.warmup")
+
+# Caches saved to / loaded from Config.CACHE_SNAPSHOT_FILE
+_persistent_caches: Dict[str, TTLCache] = {}
+
+
+def register_cache(name: str, cache: TTLCache):
+    """Include a cache in the shutdown snapshot (values must be JSON-serializable)"""
+    _persistent_caches[name] = cache
+
+
+# ==================== Cache Snapshot ====================
+
+def _freeze(value: Any) -> Any:
+    """JSON turns tuple keys into lists; turn them back"""
+    return tuple(_freeze(v) for v in value) if isinstance(value, list) else value
+
+
+def save_cache_snapshot(path: Optional[str] = None) -> int:
+    """Write every registered cache to disk; returns the number of entries saved"""
+    path = path or Config.CACHE_SNAPSHOT_FILE
+    if not path:
+        return 0
+    caches = {}
+    for name, cache in _persistent_caches.items():
+        entries = []
+        for key, value, remaining in cache.snapshot():
+            try:
+                json.dumps([key, value])
+            except (TypeError, ValueError):
+                continue
+            entries.append([key, value, round(remaining, 1)])
+        caches[name] = entries
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time(), "caches": caches}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return sum(len(entries) for entries in caches.values())
+
+
+def load_cache_snapshot(path: Optional[str] = None) -> int:
+    """Restore registered caches from disk, minus the time since the snapshot; returns entries restored"""
+    path = path or Config.CACHE_SNAPSHOT_FILE
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    elapsed = time.time() - snapshot.get("saved_at", 0)
+    restored = 0
+    for name, entries in snapshot.get("caches", {}).items():
+        cache = _persistent_caches.get(name)
+        if cache is not None:
+            restored += cache.restore([(_freeze(key), value, remaining - elapsed)
+                                       for key, value, remaining in entries])
+    return restored
+
+
+# ==================== Connections ====================
+
+def warm_session(session: requests.Session, base_url: str, connections: int, timeout: float) -> int:
+    """
+    Open up to `connections` pooled keep-alive connections to a provider
+
+    Concurrent HEAD requests to the origin force that many TCP/TLS handshakes;
+    any HTTP answer (even 404/405) leaves a reusable connection in the pool.
+
+    Returns:
+        Number of requests that got an HTTP response
+    """
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}/"
+
+    def probe():
+        session.head(origin, timeout=timeout, allow_redirects=False).close()
+
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        futures = [pool.submit(probe) for _ in range(connections)]
+    return sum(1 for future in futures if future.exception() is None)
+
+
+# ==================== Orchestration ====================
+
+class Warmup:
+    """Runs warm-up steps once in a background thread and tracks readiness"""
+
+    def __init__(self):
+        self.state = "idle"  # idle -> warming -> ready
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.duration_s: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state != "warming"
+
+    def start(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        """Run the (name, fn) steps concurrently; failures are logged and don't block readiness"""
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "warming"
+            self.started_at = time.time()
+        threading.Thread(target=self._run, args=(steps,), name="warmup", daemon=True).start()
+
+    def _run(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=max(1, len(steps)), thread_name_prefix="warmup")
+        futures = [pool.submit(self._step, name, fn) for name, fn in steps]
+        # Past the timeout the instance reports ready anyway; slow steps finish in the background
+        wait(futures, timeout=Config.WARMUP_TIMEOUT)
+        pool.shutdown(wait=False)
+        self.duration_s = round(time.perf_counter() - start, 3)
+        self.state = "ready"
+        logger.info("Warm-up complete", extra={"duration_s": self.duration_s, "steps": self.steps})
+
+    def _step(self, name: str, fn: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            result = fn()
+            self.steps[name] = {"ok": True, "result": result}
+        except Exception as e:
+            self.steps[name] = {"ok": False, "error": str(e)}
+            logger.warning("Warm-up step failed", extra={"step": name, "error": str(e)})
+        self.steps[name]["seconds"] = round(time.perf_counter() - start, 3)
+
+    def status(self) -> Dict[str, Any]:
+        return {"state": self.state, "duration_s": self.duration_s, "steps": dict(self.steps)}
+
+
+WARMUP = Warmup()
+
+if Config.CACHE_SNAPSHOT_FILE:
+    atexit.register(save_cache_snapshot)
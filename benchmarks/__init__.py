@@ -0,0 +1,4 @@
+"""
+Benchmarks Module - End-to-end performance measurements
+Runs backend/app.py against local provider stand-ins and records latency per intent.
+"""
@@ -0,0 +1,77 @@
+"""
+Compare Two Benchmark Result Files
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+
+Exits with status 1 if any p95 latency got worse (or rps got lower) by more
+than the threshold percentage.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Optional
+
+
+def _pct_change(old: float, new: float) -> Optional[float]:
+    if not old:
+        return None
+    return (new - old) / old * 100
+
+
+def _index(report: Dict) -> Dict:
+    """{(intent, concurrency): row}"""
+    return {
+        (intent, row["concurrency"]): row
+        for intent, rows in report["results"].items()
+        for row in rows
+    }
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> bool:
+    """Print a side-by-side table; return True if a regression exceeds threshold"""
+    old_rows, new_rows = _index(baseline), _index(candidate)
+    regressed = False
+
+    print(f"Baseline:  {baseline['commit']} ({baseline['timestamp']})")
+    print(f"Candidate: {candidate['commit']} ({candidate['timestamp']})")
+    print(f"{'intent':<15} {'c':>3} {'p95 old':>10} {'p95 new':>10} {'Δp95':>8} {'rps old':>8} {'rps new':>8} {'Δrps':>8}")
+
+    for key in sorted(old_rows.keys() & new_rows.keys()):
+        old, new = old_rows[key], new_rows[key]
+        d_p95 = _pct_change(old["p95_ms"], new["p95_ms"])
+        d_rps = _pct_change(old["rps"], new["rps"])
+
+        flag = ""
+        if (d_p95 is not None and d_p95 > threshold) or (d_rps is not None and -d_rps > threshold):
+            regressed = True
+            flag = "  ⚠️"
+
+        fmt = lambda d: f"{d:+7.1f}%" if d is not None else f"{'n/a':>8}"
+        print(f"{key[0]:<15} {key[1]:>3} {old['p95_ms']:>10.1f} {new['p95_ms']:>10.1f} {fmt(d_p95)} "
+              f"{old['rps']:>8.2f} {new['rps']:>8.2f} {fmt(d_rps)}{flag}")
+
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two TripPilot benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10, help="Allowed regression in percent")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    if compare(baseline, candidate, args.threshold):
+        print(f"❌ Regression above {args.threshold}%")
+        return 1
+    print("✅ No regression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
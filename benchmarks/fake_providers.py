@@ -0,0 +1,356 @@
+"""
+Fake Providers - Local stand-ins for DeepSeek, Amadeus and Gaode (Amap)
+Each provider is a threaded stdlib HTTP server answering with canned,
+well-formed responses after a configurable delay, so the backend can be
+benchmarked without network access or API quota.
+"""
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+# ==================== Canned Payloads ====================
+
+def _hotels_block() -> Dict[str, Any]:
+    return {"hotels": [
+        {
+            "id": f"hotel_{i:03d}",
+            "name": f"Benchmark Hotel {i}",
+            "location": "City Center",
+            "address": f"{i} Benchmark Road",
+            "tel": "010-00000000",
+            "price": 300 + i * 40,
+            "rating": 4.0 + i / 10,
+            "amenities": ["WiFi", "Breakfast", "Parking"],
+            "landmark": "Near the central station",
+            "description": "Fake hotel returned by the benchmark provider"
+        } for i in range(1, 6)
+    ]}
+
+
+def _flights_block() -> Dict[str, Any]:
+    date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    return {"flights": [
+        {
+            "id": f"flight_{i:03d}",
+            "carrier_code": "BM",
+            "carrier_name": "Benchmark Air",
+            "flight_number": f"BM{100 + i}",
+            "origin": "Shanghai",
+            "destination": "Beijing",
+            "departure_time": f"{7 + i * 2:02d}:00",
+            "arrival_time": f"{9 + i * 2:02d}:15",
+            "departure_date": date,
+            "duration": "2h15m",
+            "price": 500 + i * 80,
+            "cabin_class": "Economy",
+            "stops": 0,
+            "aircraft": "A320",
+            "available_seats": 9
+        } for i in range(1, 6)
+    ]}
+
+
+def _chat_content(prompt: str) -> str:
+    """Pick a reply shaped like what the agent's prompt asks for"""
+    text = prompt.lower()
+    if '"hotels"' in text:
+        block = _hotels_block()
+    elif '"flights"' in text:
+        block = _flights_block()
+    else:
+        return (
+            "## Day 1\n- Morning: Old town walk\n- Afternoon: Museum\n- Evening: Night market\n\n"
+            "## Day 2\n- Morning: Park\n- Afternoon: Shopping street\n- Evening: Local cuisine\n\n"
+            "Tips: carry water and book tickets online."
+        )
+    return "Here are some good-value options.\n\n```json\n" + json.dumps(block, ensure_ascii=False) + "\n```"
+
+
+def _amap_weather(extensions: str) -> Dict[str, Any]:
+    if extensions == "all":
+        today = datetime.now()
+        casts = [{
+            "date": (today + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "dayweather": "晴", "nightweather": "多云",
+            "daytemp": str(20 + i), "nighttemp": str(10 + i)
+        } for i in range(4)]
+        return {"status": "1", "forecasts": [{"city": "北京市", "adcode": "110000", "casts": casts}]}
+    return {"status": "1", "lives": [{
+        "city": "北京市", "weather": "晴", "temperature": "22", "winddirection": "北",
+        "windpower": "≤3", "humidity": "40", "reporttime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }]}
+
+
+def _amap_pois() -> Dict[str, Any]:
+    return {"status": "1", "count": "3", "pois": [{
+        "id": f"B000{i}", "name": f"Benchmark POI {i}", "address": f"{i} Test Street",
+        "location": f"116.39{i},39.90{i}", "tel": "010-00000000", "type": "酒店"
+    } for i in range(1, 4)]}
+
+
+def _amadeus_payload(path: str, query: Dict[str, str]) -> Dict[str, Any]:
+    if path.endswith("/oauth2/token"):
+        return {"access_token": "benchmark-token", "token_type": "Bearer", "expires_in": 1799}
+
+    if path.endswith("/shopping/flight-offers"):
+        origin = query.get("originLocationCode", "PVG")
+        destination = query.get("destinationLocationCode", "PEK")
+        date = query.get("departureDate", datetime.now().strftime("%Y-%m-%d"))
+        return {"meta": {"count": 3}, "data": [{
+            "type": "flight-offer", "id": str(i),
+            "itineraries": [{"duration": "PT2H15M", "segments": [{
+                "departure": {"iataCode": origin, "at": f"{date}T{7 + i * 3:02d}:00:00"},
+                "arrival": {"iataCode": destination, "at": f"{date}T{9 + i * 3:02d}:15:00"},
+                "carrierCode": "BM", "number": str(100 + i), "aircraft": {"code": "320"},
+                "numberOfStops": 0
+            }]}],
+            "price": {"currency": query.get("currencyCode", "USD"), "total": f"{90 + i * 15}.00"},
+            "travelerPricings": [{"fareDetailsBySegment": [{"cabin": query.get("travelClass", "ECONOMY")}]}],
+            "numberOfBookableSeats": 9
+        } for i in range(1, 4)]}
+
+    if path.endswith("/hotels/by-geocode"):
+        lat, lon = float(query.get("latitude", 39.9)), float(query.get("longitude", 116.4))
+        return {"meta": {"count": 5}, "data": [{
+            "hotelId": f"BMHTL{i:03d}", "name": f"BENCHMARK HOTEL {i}", "iataCode": "BJS",
+            "geoCode": {"latitude": lat + i / 1000, "longitude": lon + i / 1000},
+            "distance": {"value": i * 0.5, "unit": "KM"}
+        } for i in range(1, 6)]}
+
+    if path.endswith("/shopping/hotel-offers"):
+        hotel_id = query.get("hotelIds", "BMHTL001")
+        return {"data": [{"type": "hotel-offers", "hotel": {"hotelId": hotel_id}, "available": True, "offers": [{
+            "id": f"OFFER-{hotel_id}", "checkInDate": query.get("checkInDate"),
+            "checkOutDate": query.get("checkOutDate"),
+            "room": {"typeEstimated": {"category": "STANDARD_ROOM", "beds": 1, "bedType": "DOUBLE"}},
+            "price": {"currency": "CNY", "total": "420.00"}
+        }]}]}
+
+    if path.endswith("/e-reputation/hotel-sentiments"):
+        return {"data": [{"type": "hotelSentiment", "hotelId": query.get("hotelIds", "BMHTL001"),
+                          "overallRating": 82, "numberOfReviews": 240,
+                          "sentiments": {"sleepQuality": 80, "service": 85, "location": 90}}]}
+
+    return {"errors": [{"status": 404, "title": "RESOURCE NOT FOUND", "detail": path}]}
+
+
+def _stream_events(completion: Dict[str, Any], chunk_chars: int = 24):
+    """Split a chat completion into OpenAI-style chat.completion.chunk events"""
+    content = completion["choices"][0]["message"]["content"]
+    base = {"id": completion["id"], "object": "chat.completion.chunk",
+            "created": completion["created"], "model": completion["model"]}
+
+    yield json.dumps(dict(base, choices=[{"index": 0, "delta": {"role": "assistant", "content": ""},
+                                          "finish_reason": None}]), ensure_ascii=False)
+    for start in range(0, len(content), chunk_chars):
+        yield json.dumps(dict(base, choices=[{"index": 0, "delta": {"content": content[start:start + chunk_chars]},
+                                              "finish_reason": None}]), ensure_ascii=False)
+    yield json.dumps(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                          usage=completion["usage"]), ensure_ascii=False)
+    yield "[DONE]"
+
+
+# ==================== Server Plumbing ====================
+
+class _Handler(BaseHTTPRequestHandler):
+    """Hands every request to the owning FakeProvider's serve()"""
+
+    protocol_version = "HTTP/1.1"
+    provider: "FakeProvider" = None
+
+    def do_GET(self):
+        self._dispatch(None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._dispatch(self.rfile.read(length) if length else b"")
+
+    def _dispatch(self, body: Optional[bytes]):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            self.provider.serve(self, url.path, query, body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (timeout) before we answered
+            self.close_connection = True
+
+    def send_bytes(self, status: int, data: bytes, content_type: str = "application/json",
+                   headers: Dict[str, str] = None):
+        """Write a complete response"""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, status: int, payload: Any, headers: Dict[str, str] = None):
+        self.send_bytes(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), headers=headers)
+
+    def send_sse(self, events, chunk_delay: float = 0):
+        """Stream server-sent events; the connection is closed afterwards"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for event in events:
+            self.wfile.write(f"data: {event}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if chunk_delay:
+                time.sleep(chunk_delay)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeProvider:
+    """
+    One fake upstream service
+
+    Args:
+        name: Provider name ("deepseek", "amadeus" or "gaode")
+        latency_ms: Mean response delay
+        jitter_ms: Uniform +/- jitter applied to the delay
+        stream_chunk_ms: Delay between streamed chat completion chunks
+    """
+
+    def __init__(self, name: str, latency_ms: float = 0, jitter_ms: float = 0, stream_chunk_ms: float = 20):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.stream_chunk_ms = stream_chunk_ms
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "FakeProvider":
+        """Start serving on a background thread (port 0 = any free port)"""
+        handler = type(f"{self.name.title()}Handler", (_Handler,), {"provider": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def delay(self):
+        """Sleep for the configured latency (plus jitter)"""
+        with self._lock:
+            self.requests += 1
+        ms = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    def serve(self, handler: _Handler, path: str, query: Dict[str, str], body: Optional[bytes]):
+        """Answer one request (after the latency delay); streams when a chat completion asks for it"""
+        self.delay()
+        status, payload = self.route(path, query, body)
+        if status == 200 and self.name == "deepseek" and json.loads(body or b"{}").get("stream"):
+            handler.send_sse(_stream_events(payload), self.stream_chunk_ms / 1000)
+        else:
+            handler.send_json(status, payload)
+
+    def route(self, path: str, query: Dict[str, str], body: Optional[bytes]) -> Tuple[int, Any]:
+        """Return (status, JSON payload) for a request"""
+        if self.name == "deepseek":
+            if not path.endswith("/chat/completions"):
+                return 404, {"error": {"message": f"Unknown path {path}"}}
+            request = json.loads(body or b"{}")
+            prompt = (request.get("messages") or [{}])[-1].get("content", "")
+            content = _chat_content(prompt)
+            return 200, {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "deepseek-chat"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(prompt) + len(content)) // 4}
+            }
+
+        if self.name == "gaode":
+            if path.endswith("/weather/weatherInfo"):
+                return 200, _amap_weather(query.get("extensions", "base"))
+            if path.endswith("/place/text") or path.endswith("/place/around"):
+                return 200, _amap_pois()
+            if path.endswith("/distance"):
+                return 200, {"status": "1", "results": [{"distance": "12000", "duration": "1500"}]}
+            if "/direction/" in path:
+                return 200, {"status": "1", "route": {"paths": [{"distance": "12000", "duration": "1500", "steps": []}]}}
+            return 200, {"status": "0", "info": "UNKNOWN_PATH"}
+
+        payload = _amadeus_payload(path, query)
+        return (404 if "errors" in payload else 200), payload
+
+
+class FakeProviders:
+    """
+    All three fake providers plus the environment that points the backend at them
+
+    Args:
+        latency_ms: Per-provider mean latency, e.g. {"deepseek": 800, "gaode": 40}
+        jitter_ms: Jitter applied to every provider
+    """
+
+    NAMES = ("deepseek", "amadeus", "gaode")
+
+    def __init__(self, latency_ms: Dict[str, float] = None, jitter_ms: float = 0):
+        latency_ms = latency_ms or {}
+        self.providers = {name: FakeProvider(name, latency_ms.get(name, 0), jitter_ms) for name in self.NAMES}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self) -> "FakeProviders":
+        for provider in self.providers.values():
+            provider.start()
+        return self
+
+    def stop(self):
+        for provider in self.providers.values():
+            provider.stop()
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that redirect config.Config to the fakes"""
+        return {
+            "DEEPSEEK_BASE_URL": self.providers["deepseek"].base_url,
+            "AMADEUS_BASE_URL": self.providers["amadeus"].base_url,
+            "GAODE_BASE_URL": self.providers["gaode"].base_url,
+        }
+
+    def request_counts(self) -> Dict[str, int]:
+        return {name: provider.requests for name, provider in self.providers.items()}
+
+
+if __name__ == "__main__":
+    with FakeProviders() as fakes:
+        for key, value in fakes.env().items():
+            print(f"export {key}={value}")
+        print("Fake providers running, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,110 @@
+"""
+Import-Time Report
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+summarizes where cold-start time goes: slowest modules by cumulative and self
+time, and self time summed per top-level package.
+
+Usage:
+    python -m benchmarks.import_report                      # backend app
+    python -m benchmarks.import_report --module config.config --cwd .
+    python -m benchmarks.import_report --budget-ms 400      # exit 1 if slower
+
+Each run is a separate process, so --repeat N reports the median total.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)\s*$")
+
+
+def measure(module: str, cwd: str) -> List[Dict]:
+    """
+    Import one module in a fresh interpreter
+
+    Returns:
+        [{"module", "self_us", "cumulative_us", "depth"}] in import order
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": (len(match.group(3)) - 1) // 2,
+            })
+    return rows
+
+
+def summarize(rows: List[Dict], top: int) -> Dict:
+    """Total, slowest modules and per-package self time"""
+    packages: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self_us"]
+    return {
+        "total_ms": round(sum(row["self_us"] for row in rows) / 1000, 1),
+        "modules": len(rows),
+        "by_cumulative": sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top],
+        "by_self": sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top],
+        "by_package": sorted(({"package": k, "self_us": v} for k, v in packages.items()),
+                             key=lambda r: r["self_us"], reverse=True)[:top],
+    }
+
+
+def print_report(module: str, summary: Dict):
+    print(f"import {module}: {summary['total_ms']:.1f} ms across {summary['modules']} modules\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in summary["by_cumulative"]:
+        print(f"{row['cumulative_us'] / 1000:>14.1f} {row['self_us'] / 1000:>9.1f}  {'  ' * row['depth']}{row['module']}")
+
+    print(f"\n{'self ms':>9}  package")
+    for row in summary["by_package"]:
+        print(f"{row['self_us'] / 1000:>9.1f}  {row['package']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize python -X importtime for a TripPilot module")
+    parser.add_argument("--module", default="app", help="Module to import (default: the backend app)")
+    parser.add_argument("--cwd", default=os.path.join(ROOT, "backend"), help="Working directory for the import")
+    parser.add_argument("--top", type=int, default=20, help="Rows per table")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs; the median-total run is reported")
+    parser.add_argument("--budget-ms", type=float, help="Exit with status 1 if the import takes longer")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    runs = [summarize(measure(args.module, args.cwd), args.top) for _ in range(max(1, args.repeat))]
+    median = statistics.median_low([run["total_ms"] for run in runs])
+    summary = next(run for run in runs if run["total_ms"] == median)
+    print_report(args.module, summary)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(dict(summary, module=args.module, runs=[run["total_ms"] for run in runs]), f, indent=2)
+
+    if args.budget_ms is not None and summary["total_ms"] > args.budget_ms:
+        print(f"\n❌ Import took {summary['total_ms']:.1f} ms, budget is {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Provider Emulator - Fault- and latency-injecting DeepSeek / Amadeus / Gaode stand-ins
+Builds on fake_providers with a scriptable FaultProfile per provider: latency
+distributions, error rates, rate limits, 429 storms, hangs, truncated JSON and
+401 token expiry. Profiles come from a scenario JSON file and can be swapped
+at runtime through the /__emulator/profile control endpoint.
+
+Scenario file format (every key optional):
+    {
+        "deepseek": {
+            "latency": {"dist": "lognormal", "median": 800, "sigma": 0.6, "max_ms": 20000},
+            "error_rate": 0.02, "error_status": 500,
+            "rate_limit_rps": 5, "rate_limit_burst": 10,
+            "storms": [{"after_s": 30, "duration_s": 10, "status": 429}],
+            "hang_rate": 0.01, "hang_s": 60,
+            "truncate_rate": 0.01,
+            "unauthorized_rate": 0.0,
+            "stream_chunk_ms": 20
+        },
+        "amadeus": {"token_ttl_s": 30},
+        "gaode": {"latency": {"dist": "uniform", "min": 20, "max": 80}}
+    }
+
+Usage:
+    python -m benchmarks.provider_emulator --scenario benchmarks/scenarios/429_storm.json
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_providers import FakeProvider, FakeProviders, _Handler, _stream_events
+
+CONTROL_PREFIX = "/__emulator"
+
+
+class LatencyModel:
+    """
+    Response delay distribution (milliseconds)
+
+    Supported "dist" values and their parameters:
+        fixed:     ms
+        uniform:   min, max
+        normal:    mean, stddev
+        lognormal: median, sigma
+        pareto:    scale, alpha (heavy tail)
+    Every distribution is clamped to [0, max_ms].
+    """
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        spec = dict(spec or {"dist": "fixed", "ms": 0})
+        self.dist = spec.pop("dist", "fixed")
+        self.max_ms = float(spec.pop("max_ms", math.inf))
+        self.params = spec
+        if self.dist not in ("fixed", "uniform", "normal", "lognormal", "pareto"):
+            raise ValueError(f"Unknown latency distribution: {self.dist}")
+
+    def sample(self) -> float:
+        p = self.params
+        if self.dist == "uniform":
+            ms = random.uniform(p.get("min", 0), p.get("max", 0))
+        elif self.dist == "normal":
+            ms = random.gauss(p.get("mean", 0), p.get("stddev", 0))
+        elif self.dist == "lognormal":
+            ms = random.lognormvariate(math.log(max(p.get("median", 1), 1e-3)), p.get("sigma", 0.5))
+        elif self.dist == "pareto":
+            ms = p.get("scale", 1) * random.paretovariate(p.get("alpha", 2))
+        else:
+            ms = p.get("ms", 0)
+        return min(max(ms, 0.0), self.max_ms)
+
+
+class FaultProfile:
+    """Fault and latency settings for one provider (see module docstring for keys)"""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        spec = spec or {}
+        self.latency = LatencyModel(spec.get("latency"))
+        self.error_rate = float(spec.get("error_rate", 0))
+        self.error_status = int(spec.get("error_status", 500))
+        self.rate_limit_rps = float(spec.get("rate_limit_rps", 0))
+        self.rate_limit_burst = float(spec.get("rate_limit_burst", max(self.rate_limit_rps, 1)))
+        self.storms: List[Dict[str, Any]] = list(spec.get("storms", []))
+        self.hang_rate = float(spec.get("hang_rate", 0))
+        self.hang_s = float(spec.get("hang_s", 60))
+        self.truncate_rate = float(spec.get("truncate_rate", 0))
+        self.unauthorized_rate = float(spec.get("unauthorized_rate", 0))
+        self.token_ttl_s = float(spec.get("token_ttl_s", 0))
+        self.stream_chunk_ms = float(spec.get("stream_chunk_ms", 20))
+
+    def storm_status(self, elapsed: float) -> Optional[int]:
+        """Status forced by a storm window active at elapsed seconds, if any"""
+        for storm in self.storms:
+            start = storm.get("after_s", 0)
+            if start <= elapsed < start + storm.get("duration_s", 0):
+                return int(storm.get("status", 429))
+        return None
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; rate 0 disables limiting"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class EmulatedProvider(FakeProvider):
+    """
+    FakeProvider with fault injection
+
+    Faults are applied in this order: storm window, hang, rate limit, 401
+    (expired Amadeus token or random unauthorized), random error status,
+    then a normal response that may be truncated mid-body.
+    """
+
+    def __init__(self, name: str, profile: FaultProfile):
+        super().__init__(name, stream_chunk_ms=profile.stream_chunk_ms)
+        self.stats: Counter = Counter()
+        self.set_profile(profile)
+
+    def set_profile(self, profile: FaultProfile):
+        """Swap the active profile (restarts storm timing and the rate limiter)"""
+        with self._lock:
+            self.profile = profile
+            self.stream_chunk_ms = profile.stream_chunk_ms
+            self.started = time.monotonic()
+            self._bucket = _TokenBucket(profile.rate_limit_rps, profile.rate_limit_burst)
+            self._tokens: Dict[str, float] = {}
+
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+        ms = self.profile.latency.sample()
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    def serve(self, handler: _Handler, path: str, query: Dict[str, str], body: Optional[bytes]):
+        if path.startswith(CONTROL_PREFIX):
+            return self._serve_control(handler, path, body)
+
+        profile = self.profile
+        storm_status = profile.storm_status(time.monotonic() - self.started)
+        outcome = "storm" if storm_status is not None else self._pick_fault(profile, handler, path)
+        self.stats[outcome] += 1
+
+        if outcome == "hang":
+            # Hold the connection open without answering, then drop it
+            time.sleep(profile.hang_s)
+            handler.close_connection = True
+            return
+
+        self.delay()
+        if outcome == "storm":
+            return handler.send_json(storm_status, self._error_body(storm_status), self._retry_headers(storm_status))
+        if outcome == "rate_limited":
+            return handler.send_json(429, self._error_body(429), self._retry_headers(429))
+        if outcome == "unauthorized":
+            return handler.send_json(401, self._error_body(401))
+        if outcome == "error":
+            return handler.send_json(profile.error_status, self._error_body(profile.error_status))
+
+        if self.name == "amadeus" and path.endswith("/oauth2/token"):
+            return handler.send_json(200, self._mint_token())
+
+        status, payload = self.route(path, query, body)
+        if status == 200 and self.name == "deepseek" and json.loads(body or b"{}").get("stream"):
+            return handler.send_sse(self._events(payload, outcome == "truncated"), self.stream_chunk_ms / 1000)
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if outcome == "truncated":
+            data = data[:max(1, len(data) // 2)]
+        handler.send_bytes(status, data)
+
+    # ==================== Fault Selection ====================
+
+    def _pick_fault(self, profile: FaultProfile, handler: _Handler, path: str) -> str:
+        if random.random() < profile.hang_rate:
+            return "hang"
+        if not self._bucket.take():
+            return "rate_limited"
+        if self._token_expired(profile, handler, path) or random.random() < profile.unauthorized_rate:
+            return "unauthorized"
+        if random.random() < profile.error_rate:
+            return "error"
+        if random.random() < profile.truncate_rate:
+            return "truncated"
+        return "ok"
+
+    def _token_expired(self, profile: FaultProfile, handler: _Handler, path: str) -> bool:
+        """Amadeus only: the bearer token is unknown or older than token_ttl_s"""
+        if self.name != "amadeus" or not profile.token_ttl_s or path.endswith("/oauth2/token"):
+            return False
+        token = handler.headers.get("Authorization", "").replace("Bearer ", "", 1)
+        with self._lock:
+            issued = self._tokens.get(token)
+        return issued is None or time.monotonic() - issued > profile.token_ttl_s
+
+    def _mint_token(self) -> Dict[str, Any]:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic()
+        # Advertise the normal lifetime: the client should only learn of expiry via 401
+        return {"access_token": token, "token_type": "Bearer", "expires_in": 1799}
+
+    @staticmethod
+    def _events(payload: Dict[str, Any], truncated: bool):
+        """Stream events; a truncated stream stops halfway without [DONE]"""
+        events = list(_stream_events(payload))
+        return events[:max(1, len(events) // 2)] if truncated else events
+
+    def _error_body(self, status: int) -> Dict[str, Any]:
+        if self.name == "gaode":
+            # Amap answers 200-style bodies with status "0" on errors, but HTTP errors still carry a body
+            return {"status": "0", "info": f"EMULATED_{status}", "infocode": str(status)}
+        if self.name == "amadeus":
+            return {"errors": [{"status": status, "code": status, "title": f"EMULATED {status}"}]}
+        return {"error": {"message": f"Emulated {status}", "type": "emulated_error", "code": status}}
+
+    @staticmethod
+    def _retry_headers(status: int) -> Dict[str, str]:
+        return {"Retry-After": "1"} if status == 429 else {}
+
+    # ==================== Control Endpoint ====================
+
+    def _serve_control(self, handler: _Handler, path: str, body: Optional[bytes]):
+        """
+        GET  /__emulator/stats    -> request and outcome counters
+        POST /__emulator/profile  -> replace the fault profile with the JSON body
+        """
+        if path == f"{CONTROL_PREFIX}/profile" and body is not None:
+            try:
+                self.set_profile(FaultProfile(json.loads(body or b"{}")))
+            except (ValueError, TypeError) as e:
+                return handler.send_json(400, {"error": str(e)})
+            return handler.send_json(200, {"ok": True})
+        if path == f"{CONTROL_PREFIX}/stats":
+            return handler.send_json(200, {"provider": self.name, "requests": self.requests,
+                                           "outcomes": dict(self.stats)})
+        return handler.send_json(404, {"error": f"Unknown control path {path}"})
+
+
+class ProviderEmulator(FakeProviders):
+    """
+    All three emulated providers, configured from a scenario dict
+
+    Args:
+        scenario: {"deepseek": {...}, "amadeus": {...}, "gaode": {...}} fault profiles
+    """
+
+    def __init__(self, scenario: Optional[Dict[str, Dict[str, Any]]] = None):
+        scenario = scenario or {}
+        unknown = set(scenario) - set(self.NAMES)
+        if unknown:
+            raise ValueError(f"Unknown providers in scenario: {', '.join(sorted(unknown))}")
+        self.providers = {name: EmulatedProvider(name, FaultProfile(scenario.get(name))) for name in self.NAMES}
+
+    @classmethod
+    def from_file(cls, path: str) -> "ProviderEmulator":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def start_on(self, host: str = "127.0.0.1", port_base: int = 0) -> "ProviderEmulator":
+        """Start on fixed consecutive ports (port_base, +1, +2), or free ports when 0"""
+        for offset, provider in enumerate(self.providers.values()):
+            provider.start(host, port_base + offset if port_base else 0)
+        return self
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(provider.stats) for name, provider in self.providers.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TripPilot provider emulator")
+    parser.add_argument("--scenario", help="Scenario JSON file (default: no faults)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port-base", type=int, default=18100,
+                        help="DeepSeek on this port, Amadeus +1, Gaode +2 (0 = any free port)")
+    args = parser.parse_args()
+
+    emulator = ProviderEmulator.from_file(args.scenario) if args.scenario else ProviderEmulator()
+    emulator.start_on(args.host, args.port_base)
+    for key, value in emulator.env().items():
+        print(f"export {key}={value}")
+    print("Provider emulator running, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(json.dumps(emulator.stats(), indent=2))
+        emulator.stop()
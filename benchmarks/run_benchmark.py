@@ -0,0 +1,230 @@
+"""
+TripPilot End-to-End Benchmark
+Starts backend/app.py against the fake providers, drives /api/chat once per
+intent at several concurrency levels and writes p50/p95/p99 latency and
+requests/s to a JSON file (compare two files with benchmarks/compare.py).
+
+Usage:
+    python -m benchmarks.run_benchmark --concurrency 1,4,16 --requests 64
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.fake_providers import FakeProviders
+from benchmarks.provider_emulator import ProviderEmulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# One message per intent, worded so TravelAgent._identify_intent picks that intent
+INTENT_MESSAGES = {
+    "full_planning": "Plan a 3-day trip for me",
+    "search_hotels": "Find a hotel near the city center",
+    "search_flights": "Find me a flight from Shanghai",
+    "weather": "What's the weather like?",
+    "attraction": "Recommend some attractions",
+    "general": "What currency do they use there?",
+}
+
+DESTINATIONS = ["Beijing", "Shanghai", "Chengdu", "Hangzhou", "Xi'an"]
+
+
+# ==================== Backend Process ====================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(env_overrides: Dict[str, str], port: int, timeout: float = 60) -> subprocess.Popen:
+    """Launch backend/app.py and wait until /health answers"""
+    env = dict(os.environ, **env_overrides, PORT=str(port), FLASK_DEBUG="0", PYTHONUNBUFFERED="1")
+    log = open(os.path.join(ROOT, "benchmarks", "results", "backend.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=os.path.join(ROOT, "backend"), env=env,
+        stdout=log, stderr=subprocess.STDOUT
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}, see benchmarks/results/backend.log")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("Backend did not become healthy in time")
+
+
+# ==================== Load Generation ====================
+
+def _build_request(intent: str, i: int, identical: bool) -> bytes:
+    """
+    Request body for the i-th call of an intent
+
+    Unless identical is set, destination and budget vary per call so request
+    coalescing and response caches don't turn the run into a cache benchmark.
+    """
+    n = 0 if identical else i
+    preferences = {
+        "destination": DESTINATIONS[n % len(DESTINATIONS)],
+        "origin": "Shanghai",
+        "budget": 5000 + n * 1000,
+        "days": 3,
+    }
+    return json.dumps({"prompt": INTENT_MESSAGES[intent], "preferences": preferences}).encode("utf-8")
+
+
+def _one_request(url: str, body: bytes, timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as rsp:
+            rsp.read()
+            ok = rsp.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return {"latency": time.perf_counter() - start, "ok": ok}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def run_level(url: str, intent: str, concurrency: int, total: int,
+              identical: bool, timeout: float) -> Dict[str, Any]:
+    """Send total requests for one intent with the given concurrency"""
+    bodies = [_build_request(intent, i, identical) for i in range(total)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda b: _one_request(url, b, timeout), bodies))
+    elapsed = time.perf_counter() - start
+
+    latencies = [r["latency"] * 1000 for r in results if r["ok"]]
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": sum(1 for r in results if not r["ok"]),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+# ==================== Main ====================
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TripPilot end-to-end /api/chat benchmark")
+    parser.add_argument("--intents", default=",".join(INTENT_MESSAGES), help="Comma-separated intents")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=32, help="Requests per intent and concurrency level")
+    parser.add_argument("--deepseek-latency", type=float, default=800, help="Fake DeepSeek latency (ms)")
+    parser.add_argument("--amadeus-latency", type=float, default=300, help="Fake Amadeus latency (ms)")
+    parser.add_argument("--gaode-latency", type=float, default=50, help="Fake Gaode latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="Uniform +/- jitter for all providers (ms)")
+    parser.add_argument("--scenario", help="Provider emulator scenario JSON (overrides the latency flags)")
+    parser.add_argument("--cassette", choices=["off", "record", "replay"], default="off",
+                        help="Provider record/replay mode (replay = deterministic, no provider latency)")
+    parser.add_argument("--cassette-latency", choices=["zero", "recorded"], default="zero",
+                        help="Replay at zero or at the recorded provider latency")
+    parser.add_argument("--identical", action="store_true", help="Send identical requests (measures coalescing)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout (s)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+
+    intents = [i.strip() for i in args.intents.split(",") if i.strip()]
+    unknown = [i for i in intents if i not in INTENT_MESSAGES]
+    if unknown:
+        parser.error(f"Unknown intents: {', '.join(unknown)}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    os.makedirs(os.path.join(ROOT, "benchmarks", "results"), exist_ok=True)
+    latency = {"deepseek": args.deepseek_latency, "amadeus": args.amadeus_latency, "gaode": args.gaode_latency}
+    commit = _git_commit()
+
+    providers = ProviderEmulator.from_file(args.scenario) if args.scenario else FakeProviders(latency, args.jitter)
+
+    with providers as fakes:
+        port = _free_port()
+        print(f"🚀 Starting backend on port {port}...")
+        env = dict(fakes.env(), PROVIDER_CASSETTE_MODE=args.cassette,
+                   PROVIDER_CASSETTE_LATENCY=args.cassette_latency)
+        backend = start_backend(env, port)
+        url = f"http://127.0.0.1:{port}/api/chat"
+
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            for intent in intents:
+                # Warm-up request (imports, connection pools) is not measured
+                _one_request(url, _build_request(intent, -1, args.identical), args.timeout)
+                results[intent] = []
+                for concurrency in levels:
+                    row = run_level(url, intent, concurrency, args.requests, args.identical, args.timeout)
+                    results[intent].append(row)
+                    print(f"  {intent:<15} c={concurrency:<3} p50={row['p50_ms']:>9.1f}ms "
+                          f"p95={row['p95_ms']:>9.1f}ms p99={row['p99_ms']:>9.1f}ms "
+                          f"rps={row['rps']:>7.2f} errors={row['errors']}")
+        finally:
+            backend.terminate()
+            backend.wait(timeout=10)
+
+        provider_requests = fakes.request_counts()
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": levels,
+            "provider_latency_ms": latency,
+            "jitter_ms": args.jitter,
+            "identical": args.identical,
+            "scenario": os.path.basename(args.scenario) if args.scenario else None,
+            "cassette": args.cassette,
+        },
+        "provider_requests": provider_requests,
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{commit}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -158,7 +158,8 @@ TripPilot Configuration File
 Contains all API keys and system configurations
 """
 import os
-from openai import OpenAI
+import re
+from typing import Optional
 
 
 class Config:
@@ -168,10 +169,11 @@ class Config:
 
     # Gaode Maps API (Configured)
     GAODE_API_KEY = "33b713c72bf676bdbf300951b0f238ce"
+    GAODE_BASE_URL = os.getenv('GAODE_BASE_URL', "https://restapi.amap.com")
 
     # DeepSeek API (Requires your own key)
     DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY', 'sk-08493e83ce83432ea0d142f39b794ddf')
-    DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+    DEEPSEEK_BASE_URL = os.getenv('DEEPSEEK_BASE_URL', "https://api.deepseek.com")
     DEEPSEEK_MODEL = "deepseek-chat"
 
     # Amadeus API (Optional, for real flight/hotel data)
@@ -179,6 +181,7 @@ class Config:
     AMADEUS_CLIENT_ID = os.getenv('AMADEUS_CLIENT_ID', '6VI59RCfSUaykDxeRa5GSO6arTqdAqGl')
     AMADEUS_CLIENT_SECRET = os.getenv('AMADEUS_CLIENT_SECRET', 'gAiUpG7C6UJbsndp')
     AMADEUS_TEST_MODE = True  # True=Test environment (Free but limited data), False=Production environment (Paid)
+    AMADEUS_BASE_URL = os.getenv('AMADEUS_BASE_URL', "https://test.api.amadeus.com")
 
     # ==================== System Configuration ====================
 
@@ -191,6 +194,105 @@ class Config:
     # Flask Backend Configuration
     FLASK_BACKEND_URL = "http://localhost:5000"
 
+    # How MapTool/WeatherTool reach the backend: "inprocess" (direct calls) or "http"
+    TOOL_TRANSPORT = os.getenv('TOOL_TRANSPORT', 'inprocess')
+
+    # Stage/provider latency histograms and token counters served at /metrics
+    ENABLE_METRICS = os.getenv('ENABLE_METRICS', 'true').lower() == 'true'
+
+    # Structured logging: JSON lines via a background writer thread
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # Per-module overrides, e.g. "backend.booking=WARNING,werkzeug=ERROR"
+    LOG_FILE = os.getenv('LOG_FILE', '')  # Empty = stdout
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '0.1'))  # Share of DEBUG records kept
+
+    # Distributed tracing (traceparent propagation frontend -> backend -> providers)
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0'))  # Share of new traces recorded
+    TRACE_EXPORT_FILE = os.getenv(
+        'TRACE_EXPORT_FILE',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'traces.jsonl')
+    )
+    TRACE_COLLECTOR_URL = os.getenv('TRACE_COLLECTOR_URL', '')
+
+    # Provider record/replay for deterministic benchmark runs: "off", "record" or "replay"
+    PROVIDER_CASSETTE_MODE = os.getenv('PROVIDER_CASSETTE_MODE', 'off').lower()
+    PROVIDER_CASSETTE_DIR = os.getenv(
+        'PROVIDER_CASSETTE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'cassettes')
+    )
+    PROVIDER_CASSETTE_LATENCY = os.getenv('PROVIDER_CASSETTE_LATENCY', 'zero')  # "zero" or "recorded"
+
+    # Bounds on long-lived in-process state
+    MAX_HISTORY_MESSAGES = int(os.getenv('MAX_HISTORY_MESSAGES', '20'))  # Conversation turns the agent keeps
+    MAX_HISTORY_MESSAGE_CHARS = int(os.getenv('MAX_HISTORY_MESSAGE_CHARS', '4000'))  # Longer contents are truncated
+    MAX_METRIC_SERIES = int(os.getenv('MAX_METRIC_SERIES', '2000'))  # Label sets per metric; new ones dropped beyond
+
+    # Allocation tracing for /api/admin/memory (can also be started at runtime)
+    ENABLE_TRACEMALLOC = os.getenv('ENABLE_TRACEMALLOC', 'false').lower() == 'true'
+    TRACEMALLOC_FRAMES = int(os.getenv('TRACEMALLOC_FRAMES', '1'))
+
+    # Startup warm-up (provider connections, Amadeus token, cache snapshot); /health reports 503 until done
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'false').lower() == 'true'
+    WARMUP_CONNECTIONS = int(os.getenv('WARMUP_CONNECTIONS', '4'))  # Pooled connections opened per provider
+    WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', '15'))  # Ready after this even if a step is still running
+    CACHE_SNAPSHOT_FILE = os.getenv('CACHE_SNAPSHOT_FILE', '')  # Provider caches saved at exit, loaded at warm-up
+
+    # Hotel/flight candidate sets kept for /api/results refinements (filter, sort, next page)
+    RESULT_SET_TTL = int(os.getenv('RESULT_SET_TTL', '1800'))
+    RESULT_SET_MAX_SETS = int(os.getenv('RESULT_SET_MAX_SETS', '500'))  # Least recently used sets dropped beyond
+    RESULT_SET_MAX_PAGE = int(os.getenv('RESULT_SET_MAX_PAGE', '50'))
+
+    # API responses: compact JSON (?pretty=1 indents one response) and brotli/gzip for bodies >= 512 bytes
+    JSON_COMPACT = os.getenv('JSON_COMPACT', 'true').lower() == 'true'
+    RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'true').lower() == 'true'
+
+    # Chat payloads: hotel/flight lists of at least this many items are sent as a delta against
+    # the conversation's previous list; the last list sent per conversation is remembered for the TTL
+    PAYLOAD_DELTA_MIN_ITEMS = int(os.getenv('PAYLOAD_DELTA_MIN_ITEMS', '5'))
+    PAYLOAD_DELTA_TTL = int(os.getenv('PAYLOAD_DELTA_TTL', '1800'))
+    PAYLOAD_DELTA_MAX_CONVERSATIONS = int(os.getenv('PAYLOAD_DELTA_MAX_CONVERSATIONS', '2000'))
+
+    # Shared secret for /api/admin/* endpoints and the X-Profile header (X-Admin-Token header);
+    # empty = admin endpoints are disabled
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+    # On-demand request profiling: X-Profile header ("cprofile" or "sample", admin token required) or random sampling
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))  # Share of requests profiled
+    PROFILE_DEFAULT_MODE = os.getenv('PROFILE_DEFAULT_MODE', 'sample')  # Mode used for sampled requests
+    PROFILE_ALLOW_HEADER = os.getenv('PROFILE_ALLOW_HEADER', 'true').lower() == 'true'
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '200'))  # Oldest files deleted beyond this
+    PROFILE_DIR = os.getenv(
+        'PROFILE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'profiles')
+    )
+
+    # Coalesce identical concurrent requests into a single LLM/provider call
+    ENABLE_REQUEST_COALESCING = os.getenv('ENABLE_REQUEST_COALESCING', 'true').lower() == 'true'
+    COALESCE_BUDGET_BUCKET = 500  # Budgets within the same ¥500 bucket share a result
+
+    # Weather cache TTLs (seconds): Amap live data refreshes ~hourly, forecasts a few times a day
+    WEATHER_LIVE_TTL = 600
+    WEATHER_FORECAST_TTL = 3600
+
+    # Weather fetch timeouts (seconds): per HTTP call (connect, read) and per fused/batch fetch
+    WEATHER_HTTP_TIMEOUT = (2, 4)
+    WEATHER_FETCH_TIMEOUT = 6
+
+    # Amap weather only accepts Chinese city names or adcodes
+    AMAP_CITY_NAMES = {
+        'Beijing': '北京',
+        'Shanghai': '上海',
+        'Guangzhou': '广州',
+        'Shenzhen': '深圳',
+        'Hong Kong': '香港',
+        'Chengdu': '成都',
+        'Hangzhou': '杭州',
+        'Xi\'an': '西安',
+        'Wuhan': '武汉',
+        'Chongqing': '重庆',
+    }
+
     # ==================== City Coordinates Mapping ====================
     CITY_COORDINATES = {
         # Chinese Cities
@@ -274,6 +376,8 @@ class Config:
     @classmethod
     def get_deepseek_client(cls):
         """Get DeepSeek client"""
+        # Imported here: the openai package takes ~0.5s to import and most processes never need it
+        from openai import OpenAI
         return OpenAI(
             api_key=cls.DEEPSEEK_API_KEY,
             base_url=cls.DEEPSEEK_BASE_URL
@@ -287,4 +391,17 @@ class Config:
     @classmethod
     def get_airport_code(cls, city: str) -> str:
         """Get airport code"""
-        return cls.AIRPORT_CODES.get(city, 'PEK')  # Default to Beijing Capital Airport
\ No newline at end of file
+        return cls.AIRPORT_CODES.get(city, 'PEK')  # Default to Beijing Capital Airport
+
+    @classmethod
+    def get_amap_city(cls, city: str) -> Optional[str]:
+        """Get the city name Amap understands, or None for cities outside its coverage"""
+        if not city:
+            return None
+        city = city.strip()
+        for name, amap_name in cls.AMAP_CITY_NAMES.items():
+            if city.lower() == name.lower():
+                return amap_name
+        if re.search(r'[\u4e00-\u9fff]', city):
+            return city
+        return None
@@ -1,13 +1,92 @@
+import json
+import os
+import threading
+import time
+
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# 后端地址与超时（环境变量可覆盖）
+BACKEND_URL = os.getenv("TRIPPILOT_BACKEND_URL", "http://localhost:5000").rstrip("/")
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "5"))
+BACKEND_READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT", "90"))  # 流式请求：两个事件之间的最长间隔
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "10"))  # 每个进程到后端的 keep-alive 连接数
+BACKEND_QUERY_TIMEOUT = float(os.getenv("BACKEND_QUERY_TIMEOUT", "5"))  # 不调用模型的快速接口，如 /api/results
+HEALTH_POLL_INTERVAL = float(os.getenv("HEALTH_POLL_INTERVAL", "10"))
+HEALTH_TIMEOUT = float(os.getenv("HEALTH_TIMEOUT", "2"))
+
+
+def iter_sse_events(response):
+    """
+    解析 Server-Sent Events 响应流
+    :param response: requests 的流式响应 (stream=True)
+    :return: 逐个产出 (event, data) ，data 为解析后的 JSON
+    """
+    response.encoding = "utf-8"  # text/event-stream 没有 charset，requests 会误用 latin-1
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line:
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            continue
+        # 空行 = 一个事件结束
+        if data_lines:
+            yield event, json.loads("\n".join(data_lines))
+        event, data_lines = "message", []
+
+def apply_list_delta(response, state):
+    """
+    还原增量编码的酒店/航班列表（见 backend/utils/projection.py）
+    :param response: /api/chat 响应；带 delta.base 时 data 只含新增或变化的条目，这里替换为完整列表
+    :param state: 本会话的列表状态 {"revision", "items": {id: item}}，原地更新
+    :return: response
+    """
+    delta = response.get("delta")
+    if not delta:
+        return response
+    data = response.get("data") or []
+    if "base" in delta:
+        # 后端只在 base 等于本地 revision 时发送增量
+        known = state.get("items", {}) if state.get("revision") == delta["base"] else {}
+        changed = {item.get("id"): item for item in data}
+        data = [changed.get(item_id) or known.get(item_id) for item_id in delta["order"]]
+        response["data"] = data = [item for item in data if item is not None]
+    state["revision"] = delta["revision"]
+    state["items"] = {item.get("id"): item for item in data if isinstance(item, dict)}
+    return response
 
 class APIClient:
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url=None, timeout=None, pool_size=BACKEND_POOL_SIZE):
         """
         initialize the 客户端
-        :param base_url: 后端 API 地址
+        :param base_url: 后端 API 地址（默认 BACKEND_URL）
+        :param timeout: (连接超时, 读取超时)，默认 (BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT)
+        :param pool_size: 保持的空闲连接数；并发请求超过时临时新建连接，用完即关闭
         """
-        self.base_url = base_url
+        self.base_url = (base_url or BACKEND_URL).rstrip("/")
+        self.timeout = timeout or (BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT)
+        # 一个 Session 复用 TCP 连接，省去每次请求的握手
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # =======================
+    #  HTTP Helpers
+    # =======================
+
+    def get(self, path, **kwargs):
+        """GET 后端路径（如 /health），走连接池"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(f"{self.base_url}{path}", **kwargs)
+
+    def post(self, path, **kwargs):
+        """POST 后端路径（如 /api/chat），走连接池"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(f"{self.base_url}{path}", **kwargs)
 
     # =======================
     #  Core API Methods
@@ -16,27 +95,29 @@ class APIClient:
     def check_health(self):
         """检查后端服务是否在线"""
         try:
-            resp = requests.get(f"{self.base_url}/health", timeout=2)
+            resp = self.get("/health", timeout=HEALTH_TIMEOUT)
             return resp.status_code == 200
-        except:
+        except requests.RequestException:
             return False
 
-    def chat(self, prompt, preferences):
+    def chat(self, prompt, preferences, view="card"):
         """
         统一入口：发送用户需求和旅行偏好给后端
         
         :param prompt: 用户输入的文本需求
         :param preferences: 侧边栏的旅行偏好（预算、日期等）
+        :param view: 酒店/航班列表字段："card" 只含卡片字段（详情用 item_details 按需获取），"detail" 全部字段
         :return: 后端返回的标准 JSON 响应 (包含 action, content, data)
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
+            response = self.post(
+                "/api/chat",
                 json={
                     "prompt": prompt,
-                    "preferences": preferences
+                    "preferences": preferences,
+                    "view": view
                 },
-                timeout=30
+                timeout=(BACKEND_CONNECT_TIMEOUT, 30)
             )
             
             if response.status_code == 200:
@@ -48,3 +129,93 @@ class APIClient:
         except Exception as e:
             st.error(f"发送需求失败: {str(e)}")
             return None
+
+    def chat_stream(self, prompt, preferences, view="card"):
+        """
+        流式版本的 chat：边生成边返回
+        
+        :param prompt: 用户输入的文本需求
+        :param preferences: 侧边栏的旅行偏好（预算、日期等）
+        :param view: 同 chat
+        :return: 逐个产出 (event, data)：delta 文本片段、item 完整的酒店/航班、done 最终响应
+        """
+        with self.post(
+            "/api/chat/stream",
+            json={
+                "prompt": prompt,
+                "preferences": preferences,
+                "view": view
+            },
+            stream=True,
+            timeout=(BACKEND_CONNECT_TIMEOUT, 30)
+        ) as response:
+            response.raise_for_status()
+            yield from iter_sse_events(response)
+
+    def item_details(self, result_set_id, item_id):
+        """
+        卡片视图中酒店/航班的全部字段（GET /api/results/<id>/items/<item_id>）
+        :return: 条目 dict；结果集过期或条目不存在时为 None
+        """
+        resp = self.get(f"/api/results/{result_set_id}/items/{item_id}", timeout=BACKEND_QUERY_TIMEOUT)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return resp.json()["item"]
+
+
+class HealthMonitor:
+    """
+    后台线程定期检查 /health，页面重跑时只读取缓存的状态，不再阻塞渲染
+    状态：ok / warming（后端预热中，返回 503）/ error / down（连不上）
+    """
+
+    def __init__(self, client, interval=HEALTH_POLL_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self._status = {"state": "unknown", "checked_at": None, "status_code": None}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.check()  # 首次同步检查，第一次渲染就有结果
+        threading.Thread(target=self._run, name="backend-health", daemon=True).start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self):
+        """立即检查一次并更新状态"""
+        status_code = None
+        try:
+            resp = self.client.get("/health", timeout=HEALTH_TIMEOUT)
+            status_code = resp.status_code
+            if status_code == 200:
+                state = "ok"
+            elif status_code == 503 and resp.json().get("status") == "warming":
+                state = "warming"
+            else:
+                state = "error"
+        except (requests.RequestException, ValueError):
+            state = "down" if status_code is None else "error"
+        with self._lock:
+            self._status = {"state": state, "checked_at": time.time(), "status_code": status_code}
+
+    def status(self):
+        """最近一次检查结果（dict 副本）"""
+        with self._lock:
+            return dict(self._status)
+
+
+@st.cache_resource(show_spinner=False)
+def get_api_client():
+    """进程内共享的后端客户端（所有会话共用一个连接池）"""
+    return APIClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_health_monitor():
+    """进程内共享的健康检查线程"""
+    return HealthMonitor(get_api_client()).start()
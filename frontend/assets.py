@@ -0,0 +1,84 @@
+"""
+Static Assets
+Images and stylesheets are read and encoded once per process instead of on
+every script rerun.
+
+Images are referenced by URL from Streamlit's static file server
+(frontend/static, enabled by server.enableStaticServing in
+.streamlit/config.toml) with a content hash in the query string, so the
+browser caches each image across reruns and a changed file gets a new URL.
+When static serving is off, or the page was started without
+frontend/streamlit_app.py as entry point, a cached data: URI is used instead.
+
+Stylesheets live in frontend/styles and are emitted by the page as a single
+<style> block per run. Streamlit has to re-emit an element on every rerun to
+keep it, but forward messages above global.minCachedMessageSize (10 KB) that
+the browser has already received are only sent again as a hash reference,
+so the combined block crosses the websocket once per session.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import sys
+
+import streamlit as st
+
+FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(FRONTEND_DIR, "static")
+STYLES_DIR = os.path.join(FRONTEND_DIR, "styles")
+
+
+@st.cache_resource(show_spinner=False)
+def _load(path: str, mtime: float) -> dict:
+    """File contents with its hash and base64 encoding (cached per process, per file version)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return {
+        "raw": raw,
+        "digest": hashlib.sha1(raw).hexdigest()[:12],
+        "base64": base64.b64encode(raw).decode(),
+    }
+
+
+def _asset(path: str) -> dict:
+    return _load(path, os.path.getmtime(path))
+
+
+def _static_serving() -> bool:
+    """Whether Streamlit serves frontend/static at app/static/"""
+    if not st.get_option("server.enableStaticServing"):
+        return False
+    # Streamlit serves the "static" folder next to the entry script (sys.argv[0] under `streamlit run`)
+    app_static = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "static")
+    return os.path.realpath(app_static) == os.path.realpath(STATIC_DIR)
+
+
+def static_path(filename: str) -> str:
+    """Filesystem path of a file in frontend/static"""
+    return os.path.join(STATIC_DIR, filename)
+
+
+def image_src(filename: str) -> str:
+    """
+    Value for <img src> of an image in frontend/static
+
+    Returns:
+        A versioned app/static URL, a data: URI, or "" if the file is missing
+    """
+    path = static_path(filename)
+    try:
+        asset = _asset(path)
+    except OSError as e:
+        print(f"Image loading failed: {e}")
+        return ""
+    if _static_serving():
+        return f"app/static/{filename}?v={asset['digest']}"
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return f"data:{mime};base64,{asset['base64']}"
+
+
+def inject_styles(*names: str):
+    """Emit frontend/styles/<name>.css for each name as one <style> block"""
+    css = "\n".join(_asset(os.path.join(STYLES_DIR, f"{name}.css"))["raw"].decode("utf-8") for name in names)
+    st.markdown(f"<style>\n{css}</style>", unsafe_allow_html=True)
@@ -11,6 +11,11 @@ Features:
 import streamlit as st
 from datetime import datetime
 
+try:
+    from components.render_cache import memoize_html
+except ImportError:  # Run directly: streamlit run flight_card.py
+    from render_cache import memoize_html
+
 
 def get_remaining_budget():
     """Get remaining budget - consistent with chat.py"""
@@ -20,7 +25,50 @@ def get_remaining_budget():
     return 0
 
 
-def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_callback=None):
+def _flight_route_html(flight):
+    """Origin -> destination banner of a flight card"""
+    origin = flight.get('origin', 'Origin')
+    destination = flight.get('destination', 'Destination')
+
+    origin_code = origin[:3].upper()
+    dest_code = destination[:3].upper()
+
+    return f"""
+        <div class='flight-route-display'>
+            <div class='flight-city-info'>
+                <div class='flight-city-code'>{origin_code}</div>
+                <div class='flight-city-name'>{origin}</div>
+            </div>
+            <div class='flight-arrow'>✈</div>
+            <div class='flight-city-info'>
+                <div class='flight-city-code'>{dest_code}</div>
+                <div class='flight-city-name'>{destination}</div>
+            </div>
+        </div>
+        """
+
+
+def _flight_times_html(flight):
+    """Departure / duration / arrival row of a flight card"""
+    return f"""
+        <div class='flight-basic-info'>
+            <div class='flight-info-item'>
+                <div class='flight-info-label'>Departure Time</div>
+                <div class='flight-info-value'>{flight.get('departure_time', 'N/A')}</div>
+            </div>
+            <div class='flight-info-item'>
+                <div class='flight-info-label'>Flight Duration</div>
+                <div class='flight-info-value'>{flight.get('duration', 'N/A')}</div>
+            </div>
+            <div class='flight-info-item'>
+                <div class='flight-info-label'>Arrival Time</div>
+                <div class='flight-info-value'>{flight.get('arrival_time', 'N/A')}</div>
+            </div>
+        </div>
+        """
+
+
+def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_callback=None, load_details=None):
     """
     Simulated Flight Card Display - with Unified Budget Check
 
@@ -29,131 +77,10 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
         key_prefix: Button key prefix
         message_id: Message ID
         on_book_callback: Booking callback function
+        load_details: Optional callable(flight_id) -> all fields of a card-view flight (or None);
+                      called only when the details are opened
     """
-
-    st.markdown("""
-    <style>
-    .flight-card-realistic {
-        background: #ffffff;
-        border: 1px solid #d1d5db;
-        border-radius: 12px;
-        padding: 20px;
-        margin-bottom: 16px;
-        transition: all 0.2s ease;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .flight-card-realistic:hover {
-        border-color: #10b981;
-        box-shadow: 0 4px 12px rgba(10, 185, 129, 0.15);
-    }
-    
-    .flight-route-display {
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        margin-bottom: 16px;
-        padding: 16px;
-        background: linear-gradient(135deg, #f0fdf4 0%, #d1fae5 100%);
-        border-radius: 10px;
-    }
-    
-    .flight-city-info {
-        flex: 1;
-        text-align: center;
-    }
-    
-    .flight-city-code {
-        font-size: 28px;
-        font-weight: 800;
-        color: #047857;
-        margin-bottom: 4px;
-    }
-    
-    .flight-city-name {
-        font-size: 13px;
-        color: #6b7280;
-    }
-    
-    .flight-arrow {
-        font-size: 32px;
-        color: #10b981;
-        margin: 0 16px;
-    }
-    
-    .flight-basic-info {
-        display: grid;
-        grid-template-columns: repeat(3, 1fr);
-        gap: 12px;
-        margin-bottom: 16px;
-        padding-bottom: 16px;
-        border-bottom: 1px solid #e5e7eb;
-    }
-    
-    .flight-info-item {
-        text-align: center;
-        padding: 8px;
-    }
-    
-    .flight-info-label {
-        font-size: 12px;
-        color: #6b7280;
-        margin-bottom: 4px;
-    }
-    
-    .flight-info-value {
-        font-size: 16px;
-        font-weight: 600;
-        color: #111827;
-    }
-    
-    .flight-airline-badge {
-        display: inline-flex;
-        align-items: center;
-        background: #f3f4f6;
-        color: #374151;
-        padding: 6px 12px;
-        border-radius: 6px;
-        font-size: 13px;
-        font-weight: 500;
-        margin-right: 8px;
-    }
-    
-    .flight-price-display {
-        font-size: 28px;
-        font-weight: 700;
-        color: #10b981;
-        line-height: 1;
-    }
-    
-    .flight-cabin-notice {
-        font-size: 12px;
-        color: #6b7280;
-        margin-top: 4px;
-    }
-    
-    .budget-warning-flight {
-        background: #fef3c7;
-        border: 1px solid #f59e0b;
-        border-radius: 6px;
-        padding: 8px 12px;
-        font-size: 13px;
-        color: #92400e;
-        margin-top: 8px;
-    }
-    
-    .budget-ok-flight {
-        background: #d1fae5;
-        border: 1px solid #10b981;
-        border-radius: 6px;
-        padding: 8px 12px;
-        font-size: 13px;
-        color: #065f46;
-        margin-top: 8px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Styles: frontend/styles/flight_card.css, injected by the page (inject_styles)
 
     flight_id = flight.get('id', 0)
     details_key = f"{key_prefix}_detail_{message_id}_{flight_id}"
@@ -167,7 +94,7 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
         st.session_state[cabin_key] = "economy"
 
     # Cabin Price Configuration
-    base_price = flight.get('price', flight.get('total_price', 0))
+    base_price = flight.get('price', 0)
     cabin_prices = {
         "economy": {"name": "Economy Class", "price": base_price, "multiplier": 1.0},
         "business": {"name": "Business Class", "price": int(base_price * 2.5), "multiplier": 2.5},
@@ -181,32 +108,14 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
         st.markdown("<div class='flight-card-realistic'>", unsafe_allow_html=True)
 
         # Route Display
-        origin = flight.get('origin', 'Origin')
-        destination = flight.get('destination', 'Destination')
-
-        origin_code = origin[:3].upper() if len(origin) <= 4 else origin[:3].upper()
-        dest_code = destination[:3].upper() if len(destination) <= 4 else destination[:3].upper()
-
-        st.markdown(f"""
-        <div class='flight-route-display'>
-            <div class='flight-city-info'>
-                <div class='flight-city-code'>{origin_code}</div>
-                <div class='flight-city-name'>{origin}</div>
-            </div>
-            <div class='flight-arrow'>✈</div>
-            <div class='flight-city-info'>
-                <div class='flight-city-code'>{dest_code}</div>
-                <div class='flight-city-name'>{destination}</div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            memoize_html(message_id, ("flight_route", flight_id), lambda: _flight_route_html(flight)),
+            unsafe_allow_html=True
+        )
 
         # Basic Information
         carrier_name = flight.get('carrier_name', flight.get('carrier_code', 'Airline'))
         flight_number = flight.get('flight_number', 'XXXX')
-        departure_time = flight.get('departure_time', 'N/A')
-        arrival_time = flight.get('arrival_time', 'N/A')
-        duration = flight.get('duration', 'N/A')
         departure_date = flight.get('departure_date', datetime.now().strftime('%Y-%m-%d'))
 
         col_airline, col_date = st.columns([2, 1])
@@ -224,22 +133,10 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
             """, unsafe_allow_html=True)
 
         # Time Information Card
-        st.markdown(f"""
-        <div class='flight-basic-info'>
-            <div class='flight-info-item'>
-                <div class='flight-info-label'>Departure Time</div>
-                <div class='flight-info-value'>{departure_time}</div>
-            </div>
-            <div class='flight-info-item'>
-                <div class='flight-info-label'>Flight Duration</div>
-                <div class='flight-info-value'>{duration}</div>
-            </div>
-            <div class='flight-info-item'>
-                <div class='flight-info-label'>Arrival Time</div>
-                <div class='flight-info-value'>{arrival_time}</div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            memoize_html(message_id, ("flight_times", flight_id), lambda: _flight_times_html(flight)),
+            unsafe_allow_html=True
+        )
 
         # Cabin Selection and Price Display
         col_cabin, col_price, col_btn = st.columns([2, 1.5, 1.5])
@@ -337,6 +234,8 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
 
         # Details Expansion Area
         if st.session_state[details_key]:
+            if load_details:
+                flight = {**flight, **(load_details(flight_id) or {})}
             st.markdown("""
             <div style='background: #f9fafb; border: 1px solid #e5e7eb; border-radius: 8px; 
                         padding: 16px; margin-top: 12px;'>
@@ -426,7 +325,7 @@ def display_flight_card_v2(flight, key_prefix="flight", message_id=0, on_book_ca
     return None
 
 
-def display_flight_list_v2(flights, message_id=0, on_book_callback=None):
+def display_flight_list_v2(flights, message_id=0, on_book_callback=None, results=None):
     """
     Flight List Display - with Unified Budget Management
 
@@ -434,6 +333,8 @@ def display_flight_list_v2(flights, message_id=0, on_book_callback=None):
         flights: List of flights
         message_id: Message ID
         on_book_callback: Booking callback function
+        results: Optional server-side view of the search's result set (chat.ResultSetView);
+                 filters, sorting and "show more" are then answered by the backend
     """
     if not flights:
         st.info("No flights matching the criteria were found.")
@@ -457,7 +358,7 @@ def display_flight_list_v2(flights, message_id=0, on_book_callback=None):
         st.metric("💰 Remaining Budget", f"¥{remaining_budget:,}")
 
     # Filter
-    with st.expander("Filter Options", expanded=False):
+    with st.expander("Filter Options", expanded=results.filters_open if results else False):
         col1, col2, col3 = st.columns(3)
 
         with col1:
@@ -484,66 +385,99 @@ def display_flight_list_v2(flights, message_id=0, on_book_callback=None):
                 key=f"flight_stops_{message_id}"
             )
 
-    # Filter flights
-    filtered = []
-    for flight in flights:
-        if flight.get('price', 0) > max_price:
-            continue
+    # Sorting options
+    col_sort1, col_sort2 = st.columns([3, 1])
+    with col_sort2:
+        sort_by = st.selectbox(
+            "Sort By",
+            options=["Price: Low to High", "Price: High to Low", "Departure Time"],
+            key=f"flight_sort_{message_id}",
+            label_visibility="collapsed"
+        )
 
-        if flight_time != "All":
-            dep_time = flight.get('departure_time', '00:00')
-            hour = int(dep_time.split(':')[0])
+    # Filter and sort on the backend's result set when available
+    page = None
+    if results:
+        time_slots = {
+            "Morning (06:00-12:00)": ("06:00", "12:00"),
+            "Afternoon (12:00-18:00)": ("12:00", "18:00"),
+            "Evening (18:00-24:00)": ("18:00", "23:59"),
+        }
+        depart_after, depart_before = time_slots.get(flight_time, (None, None))
+        page = results.query(
+            max_price=max_price,
+            depart_after=depart_after,
+            depart_before=depart_before,
+            max_stops=0 if stops_filter == "Non-stop Only" else None,
+            stops=1 if stops_filter == "1 Stop" else None,
+            sort={"Price: Low to High": "price", "Price: High to Low": "-price"}.get(sort_by, "departure_time")
+        )
 
-            if flight_time == "Morning (06:00-12:00)" and not (6 <= hour < 12):
+    if page is not None:
+        filtered = page["items"]
+    else:
+        filtered = []
+        for flight in flights:
+            if flight.get('price', 0) > max_price:
                 continue
-            elif flight_time == "Afternoon (12:00-18:00)" and not (12 <= hour < 18):
+
+            if flight_time != "All":
+                dep_time = flight.get('departure_time', '00:00')
+                hour = int(dep_time.split(':')[0])
+
+                if flight_time == "Morning (06:00-12:00)" and not (6 <= hour < 12):
+                    continue
+                elif flight_time == "Afternoon (12:00-18:00)" and not (12 <= hour < 18):
+                    continue
+                elif flight_time == "Evening (18:00-24:00)" and not (18 <= hour < 24):
+                    continue
+
+            stops = flight.get('stops', 0)
+            if stops_filter == "Non-stop Only" and stops != 0:
                 continue
-            elif flight_time == "Evening (18:00-24:00)" and not (18 <= hour < 24):
+            elif stops_filter == "1 Stop" and stops != 1:
                 continue
 
-        stops = flight.get('stops', 0)
-        if stops_filter == "Non-stop Only" and stops != 0:
-            continue
-        elif stops_filter == "1 Stop" and stops != 1:
-            continue
+            filtered.append(flight)
 
-        filtered.append(flight)
+        if sort_by == "Price: Low to High":
+            filtered.sort(key=lambda x: x.get('price', 0))
+        elif sort_by == "Price: High to Low":
+            filtered.sort(key=lambda x: x.get('price', 0), reverse=True)
+        elif sort_by == "Departure Time":
+            filtered.sort(key=lambda x: x.get('departure_time', '00:00'))
+        filtered = filtered[:10]
 
     if not filtered:
         st.warning("No flights match the filtering criteria.")
         return
 
-    # Sorting options
-    col_sort1, col_sort2 = st.columns([3, 1])
-    with col_sort2:
-        sort_by = st.selectbox(
-            "Sort By",
-            options=["Price: Low to High", "Price: High to Low", "Departure Time"],
-            key=f"flight_sort_{message_id}",
-            label_visibility="collapsed"
-        )
-
-    if sort_by == "Price: Low to High":
-        filtered.sort(key=lambda x: x.get('price', 0))
-    elif sort_by == "Price: High to Low":
-        filtered.sort(key=lambda x: x.get('price', 0), reverse=True)
-    elif sort_by == "Departure Time":
-        filtered.sort(key=lambda x: x.get('departure_time', '00:00'))
-
     # Display flight cards
-    for flight in filtered[:10]:
+    for flight in filtered:
         display_flight_card_v2(
             flight,
             key_prefix="flight",
             message_id=message_id,
-            on_book_callback=on_book_callback
+            on_book_callback=on_book_callback,
+            load_details=results.details if results else None
         )
 
+    if page is not None and page["has_more"]:
+        st.button(f"Show more flights ({page['total'] - len(filtered)} more)",
+                  key=f"flight_more_{message_id}", on_click=results.show_more)
+
 
 # Testing code
 if __name__ == "__main__":
     st.set_page_config(page_title="Simulated Flight Card - Unified Budget Version", layout="wide")
 
+    # Styles are normally injected by the page
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from assets import inject_styles
+    inject_styles("flight_card")
+
     st.title("Simulated Flight Card Component - Unified Budget Version")
     st.caption("Demonstrates unified budget management and cabin selection")
 
@@ -11,6 +11,11 @@ Features:
 import streamlit as st
 from datetime import datetime, timedelta
 
+try:
+    from components.render_cache import memoize_html
+except ImportError:  # Run directly: streamlit run hotel_card.py
+    from render_cache import memoize_html
+
 
 def render_star_rating(rating):
     """Render stars based on rating"""
@@ -36,6 +41,28 @@ def render_star_rating(rating):
     """
 
 
+def _hotel_info_html(hotel):
+    """Static header of a hotel card"""
+    location = hotel.get('location', hotel.get('address', 'N/A'))
+    html = (
+        f"<div class='hotel-name-modern'>{hotel.get('name', 'Unknown Hotel')}</div>"
+        f"<div class='hotel-location-modern'>📍 {location}</div>"
+        f"<div class='hotel-rating-badge'>{render_star_rating(hotel.get('rating', 0))}</div>"
+    )
+
+    amenities = hotel.get('amenities', [])
+    if amenities:
+        html += "<div>"
+        for amenity in amenities[:3]:
+            html += f"<span class='amenity-tag-modern'>{amenity}</span>"
+        # Card-view hotels carry the first amenities and the total in amenity_count
+        total = hotel.get('amenity_count', len(amenities))
+        if total > 3:
+            html += f"<span class='amenity-tag-modern'>+{total-3} more</span>"
+        html += "</div>"
+    return html
+
+
 def get_remaining_budget():
     """Get remaining budget"""
     if "current_trip" in st.session_state and "total_spent" in st.session_state:
@@ -44,7 +71,8 @@ def get_remaining_budget():
     return 0
 
 
-def display_hotel_card_v2(hotel, key_prefix="hotel", message_id=0, on_book_callback=None, is_first=False):
+def display_hotel_card_v2(hotel, key_prefix="hotel", message_id=0, on_book_callback=None, is_first=False,
+                          load_details=None):
     """
     Modern hotel card display - compact collapsible version
 
@@ -54,116 +82,16 @@ def display_hotel_card_v2(hotel, key_prefix="hotel", message_id=0, on_book_callb
         message_id: Message ID
         on_book_callback: Booking callback function
         is_first: Whether it's the first hotel (expanded by default)
+        load_details: Optional callable(hotel_id) -> all fields of a card-view hotel (or None);
+                      called for the first hotel and for others once "Show full details" is clicked
     """
-
-    st.markdown("""
-    <style>
-    .modern-hotel-card {
-        background: #ffffff;
-        border: 1px solid #e5e7eb;
-        border-radius: 12px;
-        padding: 20px;
-        margin-bottom: 16px;
-        transition: all 0.2s ease;
-    }
-    
-    .modern-hotel-card:hover {
-        border-color: #10b981;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-    }
-    
-    .hotel-name-modern {
-        font-size: 18px;
-        font-weight: 600;
-        color: #111827;
-        margin-bottom: 8px;
-        line-height: 1.4;
-    }
-    
-    .hotel-location-modern {
-        color: #6b7280;
-        font-size: 14px;
-        margin-bottom: 12px;
-    }
-    
-    .hotel-rating-badge {
-        display: inline-flex;
-        align-items: center;
-        background: #f0fdf4;
-        padding: 4px 12px;
-        border-radius: 6px;
-        font-size: 13px;
-        font-weight: 500;
-        margin-right: 8px;
-        margin-bottom: 8px;
-    }
-    
-    .amenity-tag-modern {
-        display: inline-block;
-        background: #f9fafb;
-        color: #374151;
-        padding: 4px 10px;
-        border-radius: 6px;
-        font-size: 12px;
-        margin-right: 6px;
-        margin-bottom: 6px;
-        border: 1px solid #e5e7eb;
-    }
-    
-    .hotel-price-modern {
-        font-size: 24px;
-        font-weight: 700;
-        color: #10b981;
-        line-height: 1;
-    }
-    
-    .hotel-price-unit {
-        color: #6b7280;
-        font-size: 13px;
-        margin-top: 4px;
-    }
-    
-    .budget-warning-inline {
-        background: #fef3c7;
-        border: 1px solid #f59e0b;
-        border-radius: 6px;
-        padding: 8px 12px;
-        font-size: 13px;
-        color: #92400e;
-        margin-top: 8px;
-    }
-    
-    .budget-ok-inline {
-        background: #d1fae5;
-        border: 1px solid #10b981;
-        border-radius: 6px;
-        padding: 8px 12px;
-        font-size: 13px;
-        color: #065f46;
-        margin-top: 8px;
-    }
-    
-    .booking-section {
-        background: #f9fafb;
-        border: 1px solid #e5e7eb;
-        border-radius: 8px;
-        padding: 16px;
-        margin-top: 16px;
-    }
-    
-    .section-title {
-        font-weight: 600;
-        color: #374151;
-        margin-bottom: 12px;
-        font-size: 14px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Styles: frontend/styles/hotel_card.css, injected by the page (inject_styles)
 
     hotel_id = hotel.get('id', 0)
     checkin_key = f"{key_prefix}_checkin_{message_id}_{hotel_id}"
     checkout_key = f"{key_prefix}_checkout_{message_id}_{hotel_id}"
     book_key = f"{key_prefix}_book_{message_id}_{hotel_id}"
+    details_key = f"{key_prefix}_details_{message_id}_{hotel_id}"
 
     # ✅ Initialize dates
     if checkin_key not in st.session_state:
@@ -194,55 +122,50 @@ def display_hotel_card_v2(hotel, key_prefix="hotel", message_id=0, on_book_callb
 
     col_info, col_price = st.columns([3, 1])
 
-    with col_info:
-        st.markdown(
-            f"<div class='hotel-name-modern'>{hotel.get('name', 'Unknown Hotel')}</div>",
-            unsafe_allow_html=True
-        )
-
-        location = hotel.get('location', hotel.get('address', 'N/A'))
-        st.markdown(
-            f"<div class='hotel-location-modern'>📍 {location}</div>",
-            unsafe_allow_html=True
-        )
+    rating = hotel.get('rating', 0)
+    amenities = hotel.get('amenities', [])
 
-        rating = hotel.get('rating', 0)
-        stars_html = render_star_rating(rating)
+    with col_info:
+        # Name, location, rating and amenities as one memoized block
         st.markdown(
-            f"<div class='hotel-rating-badge'>{stars_html}</div>",
+            memoize_html(message_id, ("hotel_info", hotel_id), lambda: _hotel_info_html(hotel)),
             unsafe_allow_html=True
         )
 
-        amenities = hotel.get('amenities', [])
-        if amenities:
-            amenities_html = ""
-            for amenity in amenities[:3]:
-                amenities_html += f"<span class='amenity-tag-modern'>{amenity}</span>"
-            if len(amenities) > 3:
-                amenities_html += f"<span class='amenity-tag-modern'>+{len(amenities)-3} more</span>"
-            st.markdown(amenities_html, unsafe_allow_html=True)
-
     with col_price:
-        st.markdown(f"""
+        st.markdown(
+            memoize_html(message_id, ("hotel_price", hotel_id), lambda: f"""
             <div style='text-align: right;'>
                 <div class='hotel-price-modern'>¥{price_per_night:,}</div>
                 <div class='hotel-price-unit'>per night</div>
             </div>
-        """, unsafe_allow_html=True)
+        """),
+            unsafe_allow_html=True
+        )
 
     st.markdown("</div>", unsafe_allow_html=True)
 
     # === Expanded area (details + booking) ===
     with st.expander("📋 View details and book", expanded=is_first):
 
+        # Collapsed expanders still run their body: details are only loaded on request
+        show_details = not load_details or is_first or st.session_state.get(details_key, False)
+        if load_details and show_details:
+            hotel = {**hotel, **(load_details(hotel_id) or {})}
+            amenities = hotel.get('amenities', [])
+
         # Hotel details
         st.markdown("<div style='margin-bottom: 16px;'>", unsafe_allow_html=True)
 
         col_detail1, col_detail2 = st.columns(2)
 
         with col_detail1:
-            st.write(f"**Full address**: {hotel.get('address', 'N/A')}")
-            st.write(f"**Contact phone**: {hotel.get('tel', 'N/A')}")
+            if show_details:
+                st.write(f"**Full address**: {hotel.get('address', 'N/A')}")
+                st.write(f"**Contact phone**: {hotel.get('tel', 'N/A')}")
+            else:
+                st.button("📄 Show full details", key=f"{details_key}_btn",
+                          on_click=st.session_state.__setitem__, args=(details_key, True))
 
         with col_detail2:
             st.write(f"**Rating**: {rating:.1f}/5.0")
@@ -370,7 +293,7 @@ def display_hotel_card_v2(hotel, key_prefix="hotel", message_id=0, on_book_callb
         st.markdown("</div>", unsafe_allow_html=True)
 
 
-def display_hotel_list_v2(hotels, message_id=0, on_book_callback=None):
+def display_hotel_list_v2(hotels, message_id=0, on_book_callback=None, results=None):
     """
     Modern hotel list display
 
@@ -378,6 +301,8 @@ def display_hotel_list_v2(hotels, message_id=0, on_book_callback=None):
         hotels: List of hotels
         message_id: Message ID
         on_book_callback: Booking callback function
+        results: Optional server-side view of the search's result set (chat.ResultSetView);
+                 filters, sorting and "show more" are then answered by the backend
     """
     if not hotels:
         st.info("No hotels found matching the criteria")
@@ -400,7 +325,7 @@ def display_hotel_list_v2(hotels, message_id=0, on_book_callback=None):
         st.metric("💰 Remaining budget", f"¥{remaining_budget:,}")
 
     # Compact filter
-    with st.expander("🔧 Filter criteria", expanded=False):
+    with st.expander("🔧 Filter criteria", expanded=results.filters_open if results else False):
         col1, col2 = st.columns(2)
 
         with col1:
@@ -424,34 +349,51 @@ def display_hotel_list_v2(hotels, message_id=0, on_book_callback=None):
                 key=f"hotel_rating_{message_id}"
             )
 
-    # Filter
-    filtered = [
-        h for h in hotels
-        if h.get('price', 0) <= max_price and h.get('rating', 0) >= min_rating
-    ]
+    # Filter (on the backend's result set when available)
+    page = results.query(max_price=max_price, min_rating=min_rating or None, sort="price") if results else None
+    if page is not None:
+        filtered = page["items"]
+    else:
+        filtered = [
+            h for h in hotels
+            if h.get('price', 0) <= max_price and h.get('rating', 0) >= min_rating
+        ]
+
+        # Sort by price
+        filtered.sort(key=lambda x: x.get('price', 0))
+        filtered = filtered[:10]
 
     if not filtered:
         st.warning("No hotels match the filter criteria")
         return
 
-    # Sort by price
-    filtered.sort(key=lambda x: x.get('price', 0))
-
     # ✅ Display hotel cards (only first one expanded)
-    for idx, hotel in enumerate(filtered[:10]):
+    for idx, hotel in enumerate(filtered):
         display_hotel_card_v2(
             hotel,
             key_prefix="hotel",
             message_id=message_id,
             on_book_callback=on_book_callback,
-            is_first=(idx == 0)  # Only first hotel is expanded by default
+            is_first=(idx == 0),  # Only first hotel is expanded by default
+            load_details=results.details if results else None
         )
 
+    if page is not None and page["has_more"]:
+        st.button(f"Show more hotels ({page['total'] - len(filtered)} more)",
+                  key=f"hotel_more_{message_id}", on_click=results.show_more)
+
 
 # Test code
 if __name__ == "__main__":
     st.set_page_config(page_title="Hotel Card - Compact Collapsible Version", layout="wide")
 
+    # Styles are normally injected by the page
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from assets import inject_styles
+    inject_styles("hotel_card")
+
     st.title("🏨 Hotel Card Component - Compact Collapsible Version")
     st.caption("Only the first hotel is expanded by default, booking function is in the expanded area")
 
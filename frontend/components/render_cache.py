@@ -0,0 +1,42 @@
+"""
+Render Cache - Memoized HTML for chat messages and cards
+A stored message never changes, so the HTML built for it (message body,
+card headers, collapsed summaries) is kept per message id and reused on
+every rerun instead of being rebuilt.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+# Shared by all sessions of this Streamlit process; least recently used entries are dropped
+MAX_ENTRIES = 5000
+
+_cache: "OrderedDict[Hashable, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def memoize_html(message_id, part: Hashable, build: Callable[[], str]) -> str:
+    """
+    HTML for one part of a message, built on first use
+
+    Args:
+        message_id: The message's unique id; anything else (e.g. a list index) bypasses the cache
+        part: What is being rendered, e.g. ("hotel", "hotel_001")
+        build: Builds the HTML on a miss
+    """
+    if not isinstance(message_id, str):
+        return build()
+
+    key = (message_id, part)
+    with _lock:
+        html = _cache.get(key)
+        if html is not None:
+            _cache.move_to_end(key)
+            return html
+
+    html = build()
+    with _lock:
+        _cache[key] = html
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return html
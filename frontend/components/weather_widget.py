@@ -40,110 +40,23 @@ def display_weather_enhanced(weather_data, city_name=None):
         weather_data: Weather data dictionary, must contain:
             - temperature: Temperature
             - feels_like: Feels Like Temperature
-            - weather/description: Weather Description
+            - weather: Weather Description
             - humidity: Humidity
             - wind_speed: Wind Speed
             - forecast: Future Weather Forecast Array (Optional)
         city_name: City Name (Optional)
     """
 
-    # CSS Styles - Using Light Green
-    st.markdown("""
-    <style>
-    /* Main Weather Card - Large Card */
-    .weather-card-main {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        padding: 30px;
-        border-radius: 20px;
-        color: white;
-        margin: 16px 0;
-        box-shadow: 0 8px 30px rgba(16, 185, 129, 0.4);
-    }
-    
-    .weather-city-name {
-        font-size: 20px;
-        font-weight: 600;
-        opacity: 0.95;
-        margin-bottom: 12px;
-    }
-    
-    .weather-main-display {
-        text-align: center;
-        margin: 20px 0;
-    }
-    
-    .weather-icon-large {
-        font-size: 96px;
-        margin: 12px 0;
-        filter: drop-shadow(0 4px 8px rgba(0,0,0,0.2));
-    }
-    
-    .weather-temp-large {
-        font-size: 72px;
-        font-weight: 800;
-        line-height: 1;
-        margin: 12px 0;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .weather-desc-text {
-        font-size: 24px;
-        opacity: 0.95;
-        font-weight: 500;
-    }
-    
-    /* Future Weather Small Card */
-    .forecast-small-card {
-        background: white;
-        border: 1px solid #e5e7eb;
-        border-radius: 12px;
-        padding: 16px;
-        text-align: center;
-        transition: all 0.2s ease;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-    }
-    
-    .forecast-small-card:hover {
-        border-color: #10b981;
-        box-shadow: 0 4px 12px rgba(16, 185, 129, 0.15);
-        transform: translateY(-2px);
-    }
-    
-    .forecast-date {
-        font-size: 13px;
-        color: #6b7280;
-        font-weight: 500;
-        margin-bottom: 8px;
-    }
-    
-    .forecast-icon {
-        font-size: 48px;
-        margin: 12px 0;
-    }
-    
-    .forecast-temp {
-        font-size: 18px;
-        font-weight: 700;
-        color: #10b981;
-        margin: 8px 0;
-    }
-    
-    .forecast-desc {
-        font-size: 12px;
-        color: #9ca3af;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
+    # CSS Styles - frontend/styles/weather_widget.css, injected by the page (inject_styles)
 
     # Extract Data
     if not city_name:
-        city_name = weather_data.get('city', weather_data.get('location', 'City'))
+        city_name = weather_data.get('city', 'City')
 
     temp = weather_data.get('temperature', 20)
     feels_like = weather_data.get('feels_like', temp)
-    desc = weather_data.get('weather', weather_data.get('description', 'Clear'))
-    humidity = weather_data.get('humidity', 60)
+    desc = weather_data.get('weather', 'Clear')
+    humidity = weather_data.get('humidity')
     wind_speed = weather_data.get('wind_speed', '3.0 m/s')
 
     # Ensure wind_speed is a string
@@ -194,7 +107,7 @@ def display_weather_enhanced(weather_data, city_name=None):
         st.metric("🌡️ Feels Like", f"{feels_like}°C")
 
     with col2:
-        st.metric("💧 Humidity", f"{humidity}%")
+        st.metric("💧 Humidity", f"{humidity}%" if humidity is not None else "N/A")
 
     with col3:
         st.metric("💨 Wind Speed", wind_speed)
@@ -293,6 +206,13 @@ def get_mock_forecast_data(days=4):
 if __name__ == "__main__":
     st.set_page_config(page_title="Weather Widget Test", layout="wide")
 
+    # Styles are normally injected by the page
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from assets import inject_styles
+    inject_styles("weather_widget")
+
     st.title("🌤️ Weather Widget Test - Main Weather Large Display")
     st.caption("Current Day Large Card, Future Weather Small Cards")
 
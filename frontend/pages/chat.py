@@ -15,39 +15,56 @@ from datetime import datetime, timedelta
 import json
 import sys
 import os
-import base64
+import importlib
+import html
 
 # ✅ Fix path: add frontend directory to path
 current_dir = os.path.dirname(__file__)  # frontend/pages/
 frontend_dir = os.path.abspath(os.path.join(current_dir, '..'))  # frontend/
 sys.path.insert(0, frontend_dir)
 
+# Project root, for the shared tracing helpers
+project_root = os.path.abspath(os.path.join(frontend_dir, '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from backend.utils import tracing
+from api_client import BACKEND_QUERY_TIMEOUT, apply_list_delta, get_api_client, get_health_monitor, iter_sse_events
+from components.render_cache import memoize_html
+from assets import image_src, inject_styles, static_path
+
+# Each chat turn starts a trace that the backend continues (traceparent header)
+tracing.configure(
+    "trippilot-frontend",
+    export_file=os.getenv('TRACE_EXPORT_FILE', os.path.join(project_root, 'logs', 'traces.jsonl'))
+)
+
 # ✅ Logo path configuration
-icon_path = os.path.abspath(os.path.join(current_dir, "..", "images", "logo.jpg"))
-
-# ==================== Import Custom Components ====================
-try:
-    from components.hotel_card import display_hotel_card_v2, display_hotel_list_v2
-    print("✅ Successfully imported hotel_card_v2 component (with date picker)")
-except ImportError as e:
-    print(f"❌ Failed to import hotel component: {e}")
-    display_hotel_list_v2 = None
-    display_hotel_card_v2 = None
-
-try:
-    from components.weather_widget import display_weather_enhanced
-    print("✅ Successfully imported weather component (with date picker)")
-except ImportError as e:
-    print(f"❌ Failed to import weather component: {e}")
-    display_weather_enhanced = None
-
-try:
-    from components.flight_card import display_flight_card_v2, display_flight_list_v2
-    print("✅ Successfully imported flight component (with date picker)")
-except ImportError as e:
-    print(f"❌ Failed to import flight component: {e}")
-    display_flight_card_v2 = None
-    display_flight_list_v2 = None
+icon_path = static_path("logo.jpg")
+
+# Session memory bounds (a Streamlit session can stay open for days)
+MAX_CONVERSATIONS = int(os.getenv('MAX_CONVERSATIONS', '30'))  # Oldest conversations without orders are evicted
+MAX_MESSAGES_PER_CONVERSATION = int(os.getenv('MAX_MESSAGES_PER_CONVERSATION', '200'))
+MAX_MESSAGES_WITH_DATA = int(os.getenv('MAX_MESSAGES_WITH_DATA', '10'))  # Older messages drop their card payload
+HISTORY_SENT_TO_BACKEND = 10
+
+# Render cost of long conversations: only the newest turns are drawn in full
+RENDER_FULL_MESSAGES = int(os.getenv('RENDER_FULL_MESSAGES', '6'))  # Older AI turns show a collapsed summary
+MESSAGE_PAGE_SIZE = int(os.getenv('MESSAGE_PAGE_SIZE', '40'))  # Messages drawn per "Show earlier messages" page
+
+# ==================== Custom Components (imported on first use) ====================
+def load_component(module: str, name: str):
+    """
+    Card renderer from frontend/components, imported when a message first needs it
+
+    Returns:
+        The function, or None if the component can't be imported (fallback display is used)
+    """
+    try:
+        return getattr(importlib.import_module(f"components.{module}"), name)
+    except (ImportError, AttributeError) as e:
+        print(f"❌ Failed to import {module} component: {e}")
+        return None
 
 # ==================== Page Configuration ====================
 st.set_page_config(
@@ -58,16 +75,6 @@ st.set_page_config(
 )
 
 
-# ==================== Helper Functions ====================
-def get_base64_image(image_path):
-    """Convert image to base64 encoding for display in Markdown"""
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except Exception as e:
-        print(f"Image encoding failed: {e}")
-        return ""  # Return empty on failure to avoid errors
-
 # ==================== Initialize Session State ====================
 def init_session_state():
     """Initialize all necessary session states"""
@@ -112,6 +119,9 @@ def init_session_state():
         if "total_spent" not in conv:
             conv["total_spent"] = 0
 
+        # Messages saved before ids existed
+        assign_message_ids(conv["messages"])
+
         # Clean up old fields
         conv.pop("destination", None)
         conv.pop("start_date", None)
@@ -159,12 +169,20 @@ def init_session_state():
     if "booking_data" not in st.session_state:
         st.session_state.booking_data = None
 
+    # Windowed message rendering
+    if "expanded_messages" not in st.session_state:
+        st.session_state.expanded_messages = set()  # Ids of older AI messages expanded by the user
+
+    if "visible_messages" not in st.session_state:
+        st.session_state.visible_messages = {}  # conversation id -> number of messages drawn
+
 
 # ==================== Conversation Management Functions ====================
 
 def create_new_conversation():
     """Create a new conversation"""
     from uuid import uuid4
+    evict_old_conversations(MAX_CONVERSATIONS - 1)
     new_conv_id = str(uuid4())[:8]
     st.session_state.conversations[new_conv_id] = {
         "id": new_conv_id,
@@ -242,10 +260,50 @@ def save_message_to_conversation(role: str, content: str, **kwargs):
     """Save message to current conversation"""
     current_conv = get_current_conversation()
     if current_conv:
-        message = {"role": role, "content": content, **kwargs}
+        message = {"id": new_message_id(), "role": role, "content": content, **kwargs}
         current_conv["messages"].append(message)
-        st.session_state.messages = current_conv["messages"]
         update_conversation_timestamp()
+        enforce_message_bounds(current_conv)
+        st.session_state.messages = current_conv["messages"]
+
+
+def new_message_id() -> str:
+    """Stable message id: keys widgets and memoized HTML, unlike the list index which shifts on trimming"""
+    from uuid import uuid4
+    return uuid4().hex[:12]
+
+
+def assign_message_ids(messages: list):
+    """Give messages without an id one"""
+    for msg in messages:
+        if "id" not in msg:
+            msg["id"] = new_message_id()
+
+
+def enforce_message_bounds(conv: dict):
+    """Trim a conversation to MAX_MESSAGES_PER_CONVERSATION and drop old card payloads"""
+    messages = conv["messages"]
+    excess = len(messages) - MAX_MESSAGES_PER_CONVERSATION
+    if excess > 0:
+        del messages[:excess]  # In place: st.session_state.messages is the same list
+
+    # Only the newest MAX_MESSAGES_WITH_DATA messages keep their hotel/flight/weather data
+    with_data = [msg for msg in messages if msg.get("data")]
+    for msg in with_data[:max(0, len(with_data) - MAX_MESSAGES_WITH_DATA)]:
+        msg["data"] = None
+        msg["data_evicted"] = True
+
+
+def evict_old_conversations(keep: int):
+    """Remove the least recently updated conversations beyond keep (never the current one or any with orders)"""
+    conversations = st.session_state.conversations
+    candidates = sorted(
+        (conv for conv_id, conv in conversations.items()
+         if conv_id != st.session_state.current_conversation_id and not conv.get("orders")),
+        key=lambda conv: conv.get("updated_at", "")
+    )
+    for conv in candidates[:max(0, len(conversations) - keep)]:
+        del conversations[conv["id"]]
 
 
 # ✅ Helper function to calculate remaining budget
@@ -652,274 +710,66 @@ def booking_confirmation_dialog(order_type: str, item: dict, price: float):
 init_session_state()
 
 # ==================== Style Definition - Light Green Theme with Responsive Layout ====================
-st.markdown("""
-<style>
-    /* Overall Background */
-    .stApp {
-        background-color: #f8f9fa;
-    }
-    
-    /* User Message Style - Light Green */
-    .user-message {
-        background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-        color: white;
-        border-radius: 18px;
-        padding: 12px 20px;
-        margin: 10px 0;
-        margin-left: 20%;
-        box-shadow: 0 3px 15px rgba(16, 185, 129, 0.3);
-        animation: fadeIn 0.3s ease-in;
-    }
-    
-    /* AI Message Style */
-    .ai-message {
-        background: white;
-        border: 1px solid #e0e0e0;
-        border-radius: 18px;
-        padding: 15px 20px;
-        margin: 10px 0;
-        margin-right: 20%;
-        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.08);
-        line-height: 1.8;
-        animation: fadeIn 0.3s ease-in;
-    }
-    
-    /* Animation Effect */
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    /* Content Formatting */
-    .ai-message h1 { color: #10b981; font-size: 1.5rem; margin: 1rem 0; }
-    .ai-message h2 { color: #059669; font-size: 1.3rem; margin: 0.8rem 0; }
-    .ai-message h3 { color: #047857; font-size: 1.1rem; margin: 0.6rem 0; }
-    .ai-message strong { color: #047857; font-weight: 600; }
-    .ai-message ul { margin: 0.5rem 0; padding-left: 1.5rem; }
-    .ai-message li { margin: 0.3rem 0; line-height: 1.6; }
-    
-    /* ✅ Improved sidebar style - supports adaptive */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #6ee7b7 0%, #a7f3d0 100%);
-        transition: all 0.3s ease;
-    }
-    
-    /* Sidebar expanded state */
-    [data-testid="stSidebar"][aria-expanded="true"] {
-        min-width: 350px !important;
-        max-width: 500px !important;
-    }
-    
-    [data-testid="stSidebar"][aria-expanded="true"] > div:first-child {
-        width: 350px !important;
-    }
-    
-    /* Sidebar collapsed state */
-    [data-testid="stSidebar"][aria-expanded="false"] {
-        min-width: 0 !important;
-        max-width: 0 !important;
-    }
-    
-    /* ✅✨ Main content area adaptive - key improvement: supports centered layout */
-    .main .block-container {
-        padding-left: 2rem;
-        padding-right: 2rem;
-        transition: all 0.3s ease;
-    }
-    
-    /* When sidebar expanded - limit max width to maintain readability */
-    section[data-testid="stSidebar"][aria-expanded="true"] ~ .main .block-container {
-        max-width: 1200px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    
-    /* ✨ When sidebar collapsed - expand and center */
-    section[data-testid="stSidebar"][aria-expanded="false"] ~ .main .block-container {
-        max-width: 1400px !important;
-        margin-left: auto !important;
-        margin-right: auto !important;
-        padding-left: 3rem;
-        padding-right: 3rem;
-    }
-    
-    /* ✅ Ensure main content container takes full width */
-    .main {
-        width: 100%;
-    }
-    
-    /* ✅ Message container adaptive width */
-    .stChatMessage {
-        max-width: 100%;
-    }
-    
-    /* Sidebar Text Color for Better Readability */
-    [data-testid="stSidebar"] * {
-        color: #065f46 !important;
-    }
-    
-    [data-testid="stSidebar"] .stMarkdown {
-        color: #065f46 !important;
-    }
-    
-    [data-testid="stSidebar"] label {
-        color: #047857 !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Title Area */
-    .main .block-container {
-        padding-top: 2rem;
-    }
-    
-    /* Sidebar Input Style */
-    [data-testid="stSidebar"] input,
-    [data-testid="stSidebar"] textarea,
-    [data-testid="stSidebar"] select {
-        background-color: white !important;
-        border: 1px solid #10b981 !important;
-        color: #111827 !important;
-    }
-    
-    /* Sidebar Button Style */
-    [data-testid="stSidebar"] button {
-        background-color: white !important;
-        color: #047857 !important;
-        border: 1px solid #10b981 !important;
-    }
-    
-    [data-testid="stSidebar"] button:hover {
-        background-color: #10b981 !important;
-        color: white !important;
-    }
-    
-    /* Info Card */
-    .info-card {
-        background: linear-gradient(135deg, #f0fdf4 0%, #d1fae5 100%);
-        border-radius: 15px;
-        padding: 1rem;
-        margin: 1rem 0;
-        border: 1px solid #10b981;
-    }
-    
-    /* Button Style */
-    .stButton>button {
-        border-radius: 8px;
-        transition: all 0.3s;
-        border: 1px solid #10b981;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(16, 185, 129, 0.3);
-        background-color: #10b981;
-        color: white;
-    }
-    
-    /* Budget Warning Box */
-    .budget-warning {
-        background: #fef3c7;
-        border: 2px solid #f59e0b;
-        border-radius: 8px;
-        padding: 12px;
-        margin: 8px 0;
-        color: #92400e;
-        font-weight: 600;
-    }
-    
-    .budget-danger {
-        background: #fee2e2;
-        border: 2px solid #ef4444;
-        border-radius: 8px;
-        padding: 12px;
-        margin: 8px 0;
-        color: #991b1b;
-        font-weight: 600;
-    }
-    
-    .budget-ok {
-        background: #d1fae5;
-        border: 2px solid #10b981;
-        border-radius: 8px;
-        padding: 12px;
-        margin: 8px 0;
-        color: #065f46;
-        font-weight: 600;
-    }
-    
-    /* Sidebar Expander Style */
-    [data-testid="stSidebar"] .streamlit-expanderHeader {
-        background-color: rgba(255, 255, 255, 0.7) !important;
-        border: 1px solid #10b981 !important;
-        border-radius: 8px !important;
-        color: #047857 !important;
-        font-weight: 600 !important;
-    }
-    
-    [data-testid="stSidebar"] .streamlit-expanderHeader:hover {
-        background-color: rgba(255, 255, 255, 0.9) !important;
-    }
-    
-    [data-testid="stSidebar"] .streamlit-expanderContent {
-        background-color: rgba(255, 255, 255, 0.5) !important;
-        border: 1px solid #a7f3d0 !important;
-        border-top: none !important;
-    }
-    
-    /* Primary Button Style */
-    .stButton>button[kind="primary"] {
-        background-color: #10b981;
-        color: white;
-    }
-    
-    .stButton>button[kind="primary"]:hover {
-        background-color: #059669;
-    }
-    
-    /* Sidebar Metric Style */
-    [data-testid="stSidebar"] [data-testid="stMetric"] {
-        background-color: rgba(255, 255, 255, 0.8);
-        padding: 10px;
-        border-radius: 8px;
-        border: 1px solid #10b981;
-    }
-    
-    [data-testid="stSidebar"] [data-testid="stMetricLabel"] {
-        color: #047857 !important;
-    }
-    
-    [data-testid="stSidebar"] [data-testid="stMetricValue"] {
-        color: #065f46 !important;
-        font-weight: 700 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+inject_styles("chat", "hotel_card", "flight_card", "weather_widget")
 
 # ==================== API Interaction Functions ====================
+def list_delta_state() -> dict:
+    """
+    Hotel/flight list last received in this conversation (api_client.apply_list_delta)
+
+    channel identifies the conversation to the backend's delta encoder; unlike
+    the short conversation id it is unique across browser sessions.
+    """
+    from uuid import uuid4
+    return get_current_conversation().setdefault(
+        "list_delta", {"channel": uuid4().hex, "revision": None, "items": {}}
+    )
+
+
+def build_chat_request(message: str) -> dict:
+    """Request body shared by /api/chat and /api/chat/stream"""
+    trip = st.session_state.current_trip
+    delta = list_delta_state()
+    return {
+        "prompt": message,
+        "preferences": {
+            "budget": max(500, trip.get("budget", 5000)),
+            "destination": trip.get("destination", ""),
+            "days": max(1, trip.get("days", 3)),
+            "start_date": str(trip.get("start_date", datetime.now().date())),
+            "end_date": str(trip.get("end_date", "")),
+            # ✅ Add remaining budget info
+            "remaining_budget": get_remaining_budget()
+        },
+        # Role and content only: card payloads are never needed by the backend
+        "conversation_history": [
+            {"role": msg.get("role"), "content": msg.get("content", "")}
+            for msg in st.session_state.messages[-HISTORY_SENT_TO_BACKEND:]
+        ],
+        # Lists come as cards (details are fetched when a card is opened), as a delta when possible
+        "view": "card",
+        "conversation_id": delta["channel"],
+        "delta_base": delta["revision"]
+    }
+
+
 def call_backend_api(message: str) -> dict:
     """Call backend API to get response - Optimized version"""
     try:
-        trip = st.session_state.current_trip
-
-        request_data = {
-            "prompt": message,
-            "preferences": {
-                "budget": max(500, trip.get("budget", 5000)),
-                "destination": trip.get("destination", ""),
-                "days": max(1, trip.get("days", 3)),
-                "start_date": str(trip.get("start_date", datetime.now().date())),
-                "end_date": str(trip.get("end_date", "")),
-                # ✅ Add remaining budget info
-                "remaining_budget": get_remaining_budget()
-            },
-            "conversation_history": st.session_state.messages[-10:] if st.session_state.messages else []
-        }
+        request_data = build_chat_request(message)
 
-        response = requests.post(
-            "http://localhost:5000/api/chat",
-            json=request_data,
-            timeout=90
-        )
+        span_attributes = {
+            "conversation_id": st.session_state.get("current_conversation_id", ""),
+            "destination": request_data["preferences"]["destination"],
+        }
+        with tracing.start_span("chat turn", span_attributes, kind="client") as span:
+            response = get_api_client().post(
+                "/api/chat",
+                json=request_data,
+                headers=tracing.inject({})
+            )
+            if span is not None:
+                span.set_attribute("http.status", response.status_code)
 
         if response.status_code == 200:
             return response.json()
@@ -954,60 +804,350 @@ def call_backend_api(message: str) -> dict:
         }
 
 
+def stream_backend_api(message: str):
+    """
+    Stream the answer from /api/chat/stream
+
+    Yields:
+        (event, data) pairs: card, delta, item, reset, done, error (see backend/agent/streaming.py)
+    Raises:
+        requests.RequestException when the stream can't be opened (caller falls back to call_backend_api)
+    """
+    request_data = build_chat_request(message)
+    span_attributes = {
+        "conversation_id": st.session_state.get("current_conversation_id", ""),
+        "destination": request_data["preferences"]["destination"],
+        "streamed": True,
+    }
+    with tracing.start_span("chat turn", span_attributes, kind="client") as span:
+        with get_api_client().post(
+            "/api/chat/stream",
+            json=request_data,
+            headers=tracing.inject({"Accept": "text/event-stream"}),
+            stream=True  # Read timeout = max silence between events
+        ) as response:
+            if span is not None:
+                span.set_attribute("http.status", response.status_code)
+            response.raise_for_status()
+            yield from iter_sse_events(response)
+
+
+def render_streamed_response(message: str):
+    """
+    Show the answer while it is generated
+
+    Text is written into a placeholder as it arrives and a preview card
+    appears as soon as each hotel/flight item is complete (a weather card as
+    soon as its data is ready, before any LLM text); the full interactive
+    cards are drawn on the rerun after the final response.
+
+    Returns:
+        The final response dict, or None if streaming is unavailable
+    """
+    text_placeholder = st.empty()
+    cards_placeholder = st.empty()
+    text_placeholder.info("🤔 AI is thinking, please wait...")
+    text, items, started = "", {}, False
+    prefix = ""  # Text of a "card" event; deltas continue it
+
+    try:
+        for event, data in stream_backend_api(message):
+            started = True
+            if event == "card":
+                card = data.get("response") or {}
+                prefix = text = (card.get("content") or "") + "\n\n"
+                text_placeholder.markdown(f"""
+                <div class="ai-message">
+                    <strong>🤖 AI Assistant</strong><br>
+                    {text}▌
+                </div>
+                """, unsafe_allow_html=True)
+                if card.get("action") == "weather" and isinstance(card.get("data"), dict):
+                    with cards_placeholder.container():
+                        display_weather(card["data"])
+            elif event == "delta":
+                text += data.get("text", "")
+                text_placeholder.markdown(f"""
+                <div class="ai-message">
+                    <strong>🤖 AI Assistant</strong><br>
+                    {text}▌
+                </div>
+                """, unsafe_allow_html=True)
+            elif event == "item":
+                items.setdefault(data.get("kind"), []).append(data.get("item", {}))
+                with cards_placeholder.container():
+                    display_item_previews(items)
+            elif event == "reset":
+                text, items = prefix, {}
+                if not prefix:
+                    cards_placeholder.empty()
+            elif event == "done":
+                return data.get("response")
+            elif event == "error":
+                return {
+                    "action": "error",
+                    "content": f"Error processing request: {data.get('message', '')}",
+                    "data": None,
+                    "suggestions": ["Retry"]
+                }
+    except requests.exceptions.RequestException:
+        if not started:
+            return None
+    finally:
+        text_placeholder.empty()
+        cards_placeholder.empty()
+
+    return {
+        "action": "error",
+        "content": "Sorry, the response was interrupted. Please try again.",
+        "data": None,
+        "suggestions": ["Resend message"]
+    }
+
+
+def display_item_previews(items: dict):
+    """Compact, non-interactive cards for items received so far (booking buttons come with the final cards)"""
+    for hotel in items.get("hotels", []):
+        st.markdown(
+            f"🏨 **{hotel.get('name', 'Hotel')}** · {'⭐' * int(hotel.get('rating', 0) or 0)} · "
+            f"¥{hotel.get('price', '?')}/night  \n{hotel.get('location', '')}"
+        )
+    for flight in items.get("flights", []):
+        st.markdown(
+            f"✈️ **{flight.get('carrier_name', '')} {flight.get('flight_number', '')}** · "
+            f"{flight.get('origin', '')} {flight.get('departure_time', '')} → "
+            f"{flight.get('destination', '')} {flight.get('arrival_time', '')} · ¥{flight.get('price', '?')}"
+        )
+
+
+# ==================== Result Set Refinements ====================
+RESULT_PAGE_SIZE = 5
+
+# Suggestion chips answered from the stored result set instead of a new model call
+LOCAL_REFINEMENTS = {
+    "View more hotels": "more",
+    "查看更多酒店": "more",
+    "Adjust price range": "filters",
+    "调整价格范围": "filters",
+}
+
+
+@st.cache_data(ttl=300, max_entries=500, show_spinner=False)
+def fetch_result_page(result_set_id: str, params: tuple, cursor: str) -> dict:
+    """One page of GET /api/results/<id> (cached, so reruns don't hit the backend)"""
+    response = get_api_client().get(
+        f"/api/results/{result_set_id}",
+        params=dict(params, limit=RESULT_PAGE_SIZE, cursor=cursor, view="card"),
+        timeout=BACKEND_QUERY_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=300, max_entries=500, show_spinner=False)
+def fetch_item_details(result_set_id: str, item_id: str) -> dict:
+    """All fields of one card-view hotel/flight (cached process-wide, not kept in session state)"""
+    return get_api_client().item_details(result_set_id, item_id)
+
+
+class ResultSetView:
+    """Server-side filtering, sorting and paging of one message's hotel/flight result set"""
+
+    def __init__(self, result_set: dict, message_id: str):
+        self.result_set_id = result_set["id"]
+        self.pages_key = f"result_pages_{message_id}"
+        self.filters_key = f"result_filters_{message_id}"
+
+    @property
+    def filters_open(self) -> bool:
+        return st.session_state.get(self.filters_key, False)
+
+    def open_filters(self):
+        st.session_state[self.filters_key] = True
+
+    def show_more(self):
+        st.session_state[self.pages_key] = st.session_state.get(self.pages_key, 1) + 1
+
+    def query(self, **params):
+        """
+        Items of the pages loaded so far for these filters
+
+        Returns:
+            {"items", "total", "has_more"}, or None when the backend can't answer
+            (set expired, backend down) and the caller filters locally
+        """
+        params = tuple(sorted((key, value) for key, value in params.items() if value not in (None, "")))
+        items, cursor, total = [], "", 0
+        try:
+            for _ in range(st.session_state.get(self.pages_key, 1)):
+                page = fetch_result_page(self.result_set_id, params, cursor)
+                items.extend(page["items"])
+                total = page["total"]
+                cursor = page.get("next_cursor")
+                if not cursor:
+                    break
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+        return {"items": items, "total": total, "has_more": bool(cursor)}
+
+    def details(self, item_id) -> dict:
+        """Full fields of one item, or None when the backend can't answer (the card is shown as is)"""
+        try:
+            return fetch_item_details(self.result_set_id, str(item_id))
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+
+
 # ==================== Message Display Functions ====================
-def display_user_message(content: str):
+def display_user_message(content: str, message_id: str = None):
     """Display user message"""
-    st.markdown(f"""
+    st.markdown(memoize_html(message_id, "content", lambda: f"""
     <div class="user-message">
         <strong>👤 You</strong><br>
         {content}
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
 
 def display_ai_message(message: dict, msg_idx: int = 0):
     """Display AI message"""
+    message_id = message.get("id", msg_idx)  # An index (int) keys widgets but bypasses the shared HTML cache
     content = message.get("content", "")
     action = message.get("action", "")
     data = message.get("data", None)
     suggestions = message.get("suggestions", [])
+    results = ResultSetView(message["result_set"], message_id) if message.get("result_set") else None
 
     # AI message container
-    st.markdown(f"""
+    st.markdown(memoize_html(message_id, "content", lambda: f"""
     <div class="ai-message">
         <strong>🤖 AI Assistant</strong><br>
         {content}
     </div>
-    """, unsafe_allow_html=True)
+    """), unsafe_allow_html=True)
 
     # Display data cards
+    if message.get("data_evicted"):
+        st.caption("Results of older messages are cleared to save memory - ask again to see them.")
     if data:
         if action == "search_hotels" and isinstance(data, list):
-            display_hotels(data, msg_idx)
+            display_hotels(data, message_id, results)
         elif action == "search_flights" and isinstance(data, list):
-            display_flights(data, msg_idx)
+            display_flights(data, message_id, results)
         elif action == "weather" and isinstance(data, dict):
             display_weather(data)
 
     # Display suggestions
     if suggestions:
-        display_suggestions(suggestions, msg_idx)
+        display_suggestions(suggestions, message_id, results if data else None)
+
+
+def summarize_message_data(message: dict) -> str:
+    """One-line summary of a message's cards, e.g. 🏨 5 hotels · ¥320–880/night"""
+    action = message.get("action", "")
+    data = message.get("data")
+    if not data:
+        return ""
+    if action == "search_hotels" and isinstance(data, list):
+        prices = [h.get("price") for h in data if isinstance(h.get("price"), (int, float))]
+        summary = f"🏨 {len(data)} hotel{'s' if len(data) != 1 else ''}"
+        if prices:
+            summary += f" · ¥{min(prices):,.0f}–{max(prices):,.0f}/night"
+        return summary
+    if action == "search_flights" and isinstance(data, list):
+        prices = [f.get("price") for f in data if isinstance(f.get("price"), (int, float))]
+        summary = f"✈️ {len(data)} flight{'s' if len(data) != 1 else ''}"
+        if prices:
+            summary += f" · from ¥{min(prices):,.0f}"
+        return summary
+    if action == "weather" and isinstance(data, dict):
+        location = data.get("city", "")
+        return f"🌤️ Weather {location} · {data.get('temperature', '?')}°C {data.get('weather', '')}".strip()
+    return ""
+
+
+def display_ai_message_summary(message: dict):
+    """Collapsed AI message: truncated text and a card summary, expandable on demand"""
+    message_id = message["id"]
+
+    def build():
+        content = message.get("content", "")
+        preview = html.escape(content[:160].rstrip() + ("…" if len(content) > 160 else ""))
+        summary = summarize_message_data(message)
+        return f"""
+    <div class="ai-message">
+        <strong>🤖 AI Assistant</strong><br>
+        {preview}
+        {f"<div style='margin-top: 6px; color: #6b7280; font-size: 13px;'>{summary}</div>" if summary else ""}
+    </div>
+    """
+
+    # The summary changes when the message's cards are evicted
+    st.markdown(memoize_html(message_id, ("summary", bool(message.get("data"))), build), unsafe_allow_html=True)
+    st.button("Show details", key=f"expand_{message_id}",
+              on_click=toggle_message_expanded, args=(message_id,))
+
+
+def toggle_message_expanded(message_id: str):
+    """Expand a collapsed AI message, or collapse it again"""
+    expanded = st.session_state.expanded_messages
+    if message_id in expanded:
+        expanded.discard(message_id)
+    else:
+        expanded.add(message_id)
+
 
+def show_earlier_messages(conv_id: str, visible: int):
+    """Draw one more page of older messages"""
+    st.session_state.visible_messages[conv_id] = visible + MESSAGE_PAGE_SIZE
 
-def display_hotels(hotels: list, msg_idx: int):
+
+def render_message_history(messages: list):
+    """
+    Draw the conversation, newest turns in full
+
+    Only the last MESSAGE_PAGE_SIZE messages are drawn (more on request); of
+    those, AI messages older than the last RENDER_FULL_MESSAGES show a
+    summary instead of their cards unless the user expanded them.
+    """
+    conv_id = st.session_state.current_conversation_id
+    visible = st.session_state.visible_messages.get(conv_id, MESSAGE_PAGE_SIZE)
+    hidden = max(0, len(messages) - visible)
+    if hidden:
+        st.button(f"⬆️ Show earlier messages ({hidden} hidden)", key=f"show_earlier_{conv_id}",
+                  on_click=show_earlier_messages, args=(conv_id, visible), use_container_width=True)
+
+    full_from = len(messages) - RENDER_FULL_MESSAGES
+    for msg_idx in range(hidden, len(messages)):
+        message = messages[msg_idx]
+        if message["role"] == "user":
+            display_user_message(message["content"], message.get("id"))
+        elif msg_idx >= full_from or "id" not in message:
+            display_ai_message(message, msg_idx)
+        elif message["id"] in st.session_state.expanded_messages:
+            display_ai_message(message, msg_idx)
+            st.button("Collapse", key=f"collapse_{message['id']}",
+                      on_click=toggle_message_expanded, args=(message["id"],))
+        else:
+            display_ai_message_summary(message)
+
+
+def display_hotels(hotels: list, message_id: str, results: ResultSetView = None):
     """Display hotel list with unified budget"""
+    display_hotel_list_v2 = load_component("hotel_card", "display_hotel_list_v2")
     if display_hotel_list_v2:
         # ✅ hotel_card takes 2 parameters (hotel, price), we need to convert to 3 parameters (order_type, item, price)
         display_hotel_list_v2(
             hotels,
-            message_id=msg_idx,
-            on_book_callback=lambda hotel, price: handle_booking("hotel", hotel, price)
+            message_id=message_id,
+            on_book_callback=lambda hotel, price: handle_booking("hotel", hotel, price),
+            results=results
         )
     else:
-        _display_hotels_fallback(hotels, msg_idx)
+        _display_hotels_fallback(hotels, message_id)
 
 
-def _display_hotels_fallback(hotels: list, msg_idx: int):
+def _display_hotels_fallback(hotels: list, message_id: str):
     """Hotel fallback display"""
     st.subheader("🏨 Recommended Hotels")
 
@@ -1030,24 +1170,26 @@ def _display_hotels_fallback(hotels: list, msg_idx: int):
                 if price > remaining:
                     st.error("💰 Insufficient Budget")
                 else:
-                    if st.button(f"Book", key=f"book_hotel_{msg_idx}_{idx}"):
+                    if st.button(f"Book", key=f"book_hotel_{message_id}_{idx}"):
                         handle_booking("hotel", hotel, price)
 
 
-def display_flights(flights: list, msg_idx: int):
+def display_flights(flights: list, message_id: str, results: ResultSetView = None):
     """Display flight list with unified budget"""
+    display_flight_list_v2 = load_component("flight_card", "display_flight_list_v2")
     if display_flight_list_v2:
         # ✅ Pass message ID and booking callback - accepts 3 parameters (order_type, item, price)
         display_flight_list_v2(
             flights,
-            message_id=msg_idx,
-            on_book_callback=handle_booking  # Pass function directly, it accepts 3 parameters
+            message_id=message_id,
+            on_book_callback=handle_booking,  # Pass function directly, it accepts 3 parameters
+            results=results
         )
     else:
-        _display_flights_fallback(flights, msg_idx)
+        _display_flights_fallback(flights, message_id)
 
 
-def _display_flights_fallback(flights: list, msg_idx: int):
+def _display_flights_fallback(flights: list, message_id: str):
     """Flight fallback display"""
     st.subheader("✈️ Recommended Flights")
 
@@ -1075,31 +1217,16 @@ def _display_flights_fallback(flights: list, msg_idx: int):
             if price > remaining:
                 st.error("💰 Insufficient Budget")
             else:
-                if st.button(f"Book", key=f"book_flight_{msg_idx}_{idx}"):
+                if st.button(f"Book", key=f"book_flight_{message_id}_{idx}"):
                     handle_booking("flight", flight, price)
 
 
 def display_weather(weather: dict):
     """Display weather information"""
+    display_weather_enhanced = load_component("weather_widget", "display_weather_enhanced")
     if display_weather_enhanced:
-        formatted_weather = {
-            "location": weather.get("location", weather.get("city", "")),
-            "temperature": weather.get("temperature", 0),
-            "feels_like": weather.get("feels_like", 0),
-            "weather": weather.get("weather", ""),
-            "description": weather.get("description", ""),
-            "humidity": weather.get("humidity", 0),
-            "wind_speed": weather.get("wind_speed", ""),
-            "wind_direction": weather.get("wind_direction", ""),
-            "visibility": weather.get("visibility", ""),
-            "pressure": weather.get("pressure", ""),
-            "uv_index": weather.get("uv_index", 0),
-            "sunrise": weather.get("sunrise", ""),
-            "sunset": weather.get("sunset", ""),
-            "update_time": weather.get("update_time", ""),
-            "forecast": weather.get("forecast", [])
-        }
-        display_weather_enhanced(formatted_weather)
+        # The backend sends one weather shape (backend.models.Weather); no reshaping needed
+        display_weather_enhanced(weather)
     else:
         _display_weather_fallback(weather)
 
@@ -1119,8 +1246,8 @@ def _display_weather_fallback(weather: dict):
 
 
 # ==================== Suggestion Buttons ====================
-def display_suggestions(suggestions: list, msg_idx: int = 0):
-    """Display suggestion buttons"""
+def display_suggestions(suggestions: list, message_id: str = "", results: ResultSetView = None):
+    """Display suggestion buttons (refinements of a result set are answered locally, see LOCAL_REFINEMENTS)"""
     if not suggestions:
         return
 
@@ -1128,8 +1255,12 @@ def display_suggestions(suggestions: list, msg_idx: int = 0):
     cols = st.columns(min(len(suggestions[:3]), 3))
     for idx, (col, suggestion) in enumerate(zip(cols, suggestions[:3])):
         with col:
-            button_key = f"sug_{msg_idx}_{idx}_{suggestion[:20]}"
-            if st.button(f"{suggestion}", key=button_key):
+            button_key = f"sug_{message_id}_{idx}_{suggestion[:20]}"
+            refinement = LOCAL_REFINEMENTS.get(suggestion) if results else None
+            if refinement:
+                st.button(f"{suggestion}", key=button_key,
+                          on_click=results.show_more if refinement == "more" else results.open_filters)
+            elif st.button(f"{suggestion}", key=button_key):
                 st.session_state.pending_message = suggestion
                 st.rerun()
 
@@ -1554,17 +1685,21 @@ def handle_user_input(message: str):
     try:
         save_message_to_conversation("user", message)
 
-        status_placeholder = st.empty()
-        status_placeholder.info("🤔 AI is thinking, please wait...")
-
-        response = call_backend_api(message)
-        status_placeholder.empty()
+        response = render_streamed_response(message)
+        if response is None:
+            # Backend without streaming support: wait for the whole answer
+            status_placeholder = st.empty()
+            status_placeholder.info("🤔 AI is thinking, please wait...")
+            response = call_backend_api(message)
+            status_placeholder.empty()
+        apply_list_delta(response, list_delta_state())
 
         save_message_to_conversation(
             "assistant",
             response.get("content", ""),
             action=response.get("action"),
             data=response.get("data"),
+            result_set=response.get("result_set"),
             suggestions=response.get("suggestions", [])
         )
 
@@ -1579,7 +1714,7 @@ with st.sidebar:
     st.markdown(
         f"""
         <div style="display: flex; align-items: center; gap: 8px;">
-            <img src="data:image/jpg;base64,{get_base64_image(icon_path)}" width="24"/>
+            <img src="{image_src('logo.jpg')}" width="24"/>
             <h3 style="margin: 0;">Conversation Management</h3>
         </div>
         """,
@@ -1878,14 +2013,15 @@ with st.sidebar:
 
     st.divider()
 
-    # Backend status
-    try:
-        response = requests.get("http://localhost:5000/health", timeout=1)
-        if response.status_code == 200:
-            st.success("✅ Backend Connected")
-        else:
-            st.error("❌ Backend Error")
-    except:
+    # Backend status (polled in the background, see api_client.HealthMonitor)
+    backend_state = get_health_monitor().status()["state"]
+    if backend_state == "ok":
+        st.success("✅ Backend Connected")
+    elif backend_state == "warming":
+        st.info("⏳ Backend Warming Up")
+    elif backend_state == "error":
+        st.error("❌ Backend Error")
+    else:
         st.error("❌ Backend Not Started")
         st.caption("Run: `python app.py`")
 
@@ -1903,12 +2039,12 @@ else:
 
     # Title with Logo
     if os.path.exists(icon_path):
-        logo_base64 = get_base64_image(icon_path)
-        if logo_base64:
+        logo_src = image_src("logo.jpg")
+        if logo_src:
             st.markdown(
                 f"""
                 <div style="display: flex; align-items: center; gap: 15px; margin-bottom: 10px;">
-                    <img src="data:image/jpg;base64,{logo_base64}" 
+                    <img src="{logo_src}" 
                          style="width: 50px; height: 50px; border-radius: 10px; 
                                 box-shadow: 0 2px 8px rgba(0,0,0,0.1);"/>
                     <div>
@@ -2003,11 +2139,7 @@ else:
     # Display message history
     message_container = st.container()
     with message_container:
-        for msg_idx, message in enumerate(st.session_state.messages):
-            if message["role"] == "user":
-                display_user_message(message["content"])
-            else:
-                display_ai_message(message, msg_idx)
+        render_message_history(st.session_state.messages)
 
     # ✅ Check if there's pending booking data, if so trigger dialog
     if st.session_state.booking_data:
@@ -11,6 +11,7 @@ Features:
 import streamlit as st
 from datetime import datetime
 from uuid import uuid4
+import importlib.util
 import json
 import os
 import sys
@@ -21,12 +22,8 @@ frontend_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.insert(0, frontend_dir)
 
 # ==================== Check Plotly ====================
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+# Only presence is checked here; the chart functions import plotly when they first draw
+PLOTLY_AVAILABLE = importlib.util.find_spec("plotly") is not None
 
 # ==================== Page Configuration ====================
 st.set_page_config(
@@ -107,6 +104,7 @@ def create_budget_chart(total_budget, total_spent):
     """Create budget usage pie chart"""
     if not PLOTLY_AVAILABLE:
         return None
+    import plotly.graph_objects as go
 
     remaining = max(0, total_budget - total_spent)
 
@@ -132,6 +130,7 @@ def create_order_type_chart(orders):
     """Create order type distribution pie chart"""
     if not PLOTLY_AVAILABLE or not orders:
         return None
+    import plotly.graph_objects as go
 
     type_counts = {}
     type_labels = {"hotel": "🏨 Hotels", "flight": "✈️ Flights"}
@@ -163,6 +162,7 @@ def create_order_amount_chart(orders):
     """Create order amount bar chart"""
     if not PLOTLY_AVAILABLE or not orders:
         return None
+    import plotly.graph_objects as go
 
     hotel_total = sum(o["price"] for o in orders if o.get("type") == "hotel")
     flight_total = sum(o["price"] for o in orders if o.get("type") == "flight")
@@ -192,6 +192,7 @@ def create_spending_trend_chart(orders):
     """Create spending trend line chart"""
     if not PLOTLY_AVAILABLE or not orders or len(orders) < 2:
         return None
+    import plotly.graph_objects as go
 
     sorted_orders = sorted(orders, key=lambda x: x.get("created_at", ""))
 
@@ -10,7 +10,7 @@ from uuid import uuid4
 
 # ==================== 1. Resolve Icon Path Issue (Verify Path in Advance) ====================
 # Define and verify the icon path to avoid errors
-icon_path = os.path.join("frontend", "images", "logo.jpg")
+icon_path = os.path.join("frontend", "static", "logo.jpg")
 
 
 # ==================== 2. Page Configuration (Use Verified Icon Path) ====================
@@ -367,15 +367,17 @@ with st.sidebar:
     # Backend Status Check
     st.markdown("#### 📌 Backend Connection")
 
-    import requests
-
-    try:
-        response = requests.get("http://localhost:5000/health", timeout=2)
-        if response.status_code == 200:
-            st.success("✅ Backend Service Normal")
-        else:
-            st.error("❌ Backend Service Abnormal")
-    except:
+    from api_client import get_health_monitor
+
+    # Polled in the background; reruns only read the last result
+    backend_state = get_health_monitor().status()["state"]
+    if backend_state == "ok":
+        st.success("✅ Backend Service Normal")
+    elif backend_state == "warming":
+        st.info("⏳ Backend Service Warming Up")
+    elif backend_state == "error":
+        st.error("❌ Backend Service Abnormal")
+    else:
         st.error("❌ Backend Service Not Started")
         st.caption("Please run: `python app.py`")
 
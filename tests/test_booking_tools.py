@@ -0,0 +1,31 @@
+"""
+BookingTool convenience lookups over Flight models
+"""
+from backend.models import Flight, Offer
+from backend.tools.booking_tools import BookingTool
+
+
+def _tool(flights):
+    tool = BookingTool()
+    tool.search_flights = lambda *args, **kwargs: {
+        'success': True, 'data': flights, 'count': len(flights), 'message': ''}
+    return tool
+
+
+def test_get_flight_price_reads_offers():
+    flights = [
+        Flight(id='1', offer=Offer(price=620.5, currency='USD')),
+        Flight(id='2'),
+        Flight(id='3', offer=Offer(price=480, currency='USD')),
+    ]
+    result = _tool(flights).get_flight_price('HKG', 'NRT', '2025-12-01')
+    assert result['success']
+    assert result['cheapest_price'] == 480.0
+    assert result['currency'] == 'USD'
+    assert result['message'] == 'Cheapest price: 480.00 USD'
+
+
+def test_get_flight_price_without_prices():
+    result = _tool([Flight(id='1')]).get_flight_price('HKG', 'NRT', '2025-12-01')
+    assert not result['success']
+    assert result['cheapest_price'] is None
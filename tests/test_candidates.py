@@ -0,0 +1,61 @@
+"""
+Candidate table: paging through top_k must walk order() exactly, and the
+amenity index must agree with per-hotel masks
+"""
+import numpy as np
+import pytest
+
+from backend.utils import amenities
+from backend.utils.candidates import CandidateTable
+from backend.utils.result_sets import ResultSetStore
+
+
+def _hotels(count, prices):
+    return [{"id": f"h{i}", "price": prices[i % len(prices)], "rating": 4} for i in range(count)]
+
+
+def test_top_k_is_prefix_of_order():
+    table = CandidateTable(_hotels(200, [300, 300, 450, None, 120]))
+    selected = table.all()
+    for sort in ("price", "-price", "rating"):
+        ordered = table.order(selected, sort)
+        for k in (1, 5, 7, 40, 199, 250):
+            assert np.array_equal(table.top_k(selected, sort, k), ordered[:k])
+
+
+def test_pages_concatenate_to_order():
+    for count, limit in ((15, 5), (200, 7)):
+        hotels = _hotels(count, [300, 300, 450, 120])
+        store = ResultSetStore(max_page=limit)
+        result_set_id = store.put("hotels", hotels)
+        ids, cursor = [], None
+        while True:
+            params = {"sort": "price", "limit": str(limit)}
+            if cursor:
+                params["cursor"] = cursor
+            page = store.query(result_set_id, params)
+            ids.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        table = CandidateTable(hotels)
+        assert ids == [item["id"] for item in table.rows(table.order(table.all(), "price"))]
+
+
+def test_has_amenities_matches_row_masks():
+    lists = [["Free WiFi", "Pool"], ["停车场", "wifi"], [], ["No parking", "Gym"], ["Swimming pool", "Parking"]]
+    hotels = [{"id": f"h{i}", "amenities": lists[i % len(lists)]} for i in range(70)]
+    table = CandidateTable(hotels)
+    for wanted in ([], ["wifi"], ["parking"], ["pool", "停车"], ["gym", "wifi"]):
+        required = amenities.requirement_mask(wanted).mask
+        expected = [amenities.hotel_mask(hotel) & required == required for hotel in hotels]
+        assert table.has_amenities(required).tolist() == expected
+    assert CandidateTable([]).has_amenities(amenities.AMENITY_BITS["wifi"]).tolist() == []
+
+
+def test_non_finite_numbers_are_rejected():
+    store = ResultSetStore()
+    result_set_id = store.put("hotels", _hotels(5, [300]))
+    for params in ({"limit": "1e400"}, {"limit": "inf"}, {"limit": "nan"}, {"max_price": "-inf"}):
+        with pytest.raises(ValueError):
+            store.query(result_set_id, params)
@@ -0,0 +1,28 @@
+"""
+TravelTools hotel search maps every hotel into a Hotel model
+"""
+from backend.models import Hotel
+from backend.tools.travel_tools import TravelTools
+
+
+def _tools():
+    tools = TravelTools()
+    tools.amap_key = None  # Mock hotels only
+    return tools
+
+
+def test_search_hotels_returns_models():
+    hotels = _tools().search_hotels("Beijing", "2025-12-01", "2025-12-03")
+    assert hotels and all(isinstance(hotel, Hotel) for hotel in hotels)
+    for hotel in hotels:
+        assert hotel.nights == 2
+        assert hotel.total_price == hotel.offer.price * 2
+        assert hotel.room_types and hotel.policies
+        wire = hotel.to_dict()
+        assert wire["checkin_date"] == "2025-12-01" and wire["price"] == hotel.offer.price
+        assert wire["room_types"][0]["name"] == hotel.room_types[0].name
+
+
+def test_requirements_filter_models():
+    hotels = _tools().search_hotels("Beijing", "2025-12-01", "2025-12-03", requirements=["停车场"])
+    assert all("Parking" in hotel.amenities for hotel in hotels)